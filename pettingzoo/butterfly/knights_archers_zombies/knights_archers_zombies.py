@@ -132,6 +132,7 @@ knights_archers_zombies_v10.env(
   vector_state=True,
   use_typemasks=False,
   sequence_space=False,
+  obs_scale=1,
 )
 ```
 
@@ -159,6 +160,8 @@ knights_archers_zombies_v10.env(
 
 `sequence_space`: **experimental**, only relevant when `vector_state=True` is set, removes non-existent entities in the vector state.
 
+`obs_scale`: only relevant when `vector_state=False` is set, downscaling factor of the image observations, which keep every `obs_scale`-th row and column of pixels. With `obs_scale=4`, the observations have shape (128, 128, 3).
+
 
 ### Version History
 
@@ -178,7 +181,6 @@ knights_archers_zombies_v10.env(
 
 import os
 import sys
-from itertools import repeat
 
 import gymnasium
 import numpy as np
@@ -190,6 +192,7 @@ from gymnasium.utils import EzPickle, seeding
 from pettingzoo import AECEnv
 from pettingzoo.butterfly.knights_archers_zombies.manual_policy import ManualPolicy
 from pettingzoo.butterfly.knights_archers_zombies.src import constants as const
+from pettingzoo.butterfly.knights_archers_zombies.src.collisions import sprite_hits
 from pettingzoo.butterfly.knights_archers_zombies.src.img import get_image
 from pettingzoo.butterfly.knights_archers_zombies.src.players import Archer, Knight
 from pettingzoo.butterfly.knights_archers_zombies.src.weapons import Arrow, Sword
@@ -237,6 +240,7 @@ class raw_env(AECEnv, EzPickle):
         vector_state=True,
         use_typemasks=False,
         sequence_space=False,
+        obs_scale=1,
         render_mode=None,
     ):
         EzPickle.__init__(
@@ -254,6 +258,7 @@ class raw_env(AECEnv, EzPickle):
             vector_state=vector_state,
             use_typemasks=use_typemasks,
             sequence_space=sequence_space,
+            obs_scale=obs_scale,
             render_mode=render_mode,
         )
         # variable state space
@@ -274,6 +279,29 @@ class raw_env(AECEnv, EzPickle):
         self.use_typemasks = True if sequence_space else use_typemasks
         self.typemask_width = 6
         self.vector_width = 4 + self.typemask_width if use_typemasks else 4
+        # Entity matrix of the current world, rebuilt in place once per update
+        self.vector_state_buffer = np.zeros((self.num_tracked, self.vector_width))
+        self.vector_state_stale = True
+        self.vector_observation_batch = None
+
+        # image observations keep every obs_scale-th row and column of pixels
+        assert (
+            isinstance(obs_scale, int) and obs_scale >= 1
+        ), "obs_scale must be a positive integer"
+        self.obs_scale = obs_scale
+        self.obs_size = len(range(0, 512, obs_scale))
+        # Raw pixels of the screen, padded with black by a full observation on
+        # every side, refreshed in place once per redraw
+        self.padded_screen = (
+            None
+            if self.vector_state
+            else np.zeros(
+                (const.SCREEN_HEIGHT + 1024, const.SCREEN_WIDTH + 1024),
+                dtype=np.uint32,
+            )
+        )
+        self.padded_screen_stale = True
+        self.rgb_bytes = None
 
         # Game Status
         self.frames = 0
@@ -313,7 +341,7 @@ class raw_env(AECEnv, EzPickle):
             a_count += 1
 
         shape = (
-            [512, 512, 3]
+            [self.obs_size, self.obs_size, 3]
             if not self.vector_state
             else [self.num_tracked + 1, self.vector_width + 1]
         )
@@ -437,59 +465,46 @@ class raw_env(AECEnv, EzPickle):
 
     # Zombie Kills the Knight (also remove the sword)
     def zombit_hit_knight(self):
-        for zombie in self.zombie_list:
-            zombie_knight_list = pygame.sprite.spritecollide(
-                zombie, self.knight_list, True
-            )
+        zombies = self.zombie_list.sprites()
+        for _, knight in sprite_hits(zombies, self.knight_list.sprites()):
+            knight.alive = False
+            knight.weapons.empty()
 
-            for knight in zombie_knight_list:
-                knight.alive = False
-                knight.weapons.empty()
+            if knight.agent_name not in self.kill_list:
+                self.kill_list.append(knight.agent_name)
 
-                if knight.agent_name not in self.kill_list:
-                    self.kill_list.append(knight.agent_name)
-
-                self.knight_list.remove(knight)
+            self.knight_list.remove(knight)
 
     # Zombie Kills the Archer
     def zombie_hit_archer(self):
-        for zombie in self.zombie_list:
-            zombie_archer_list = pygame.sprite.spritecollide(
-                zombie, self.archer_list, True
-            )
-
-            for archer in zombie_archer_list:
-                archer.alive = False
-                self.archer_list.remove(archer)
-                if archer.agent_name not in self.kill_list:
-                    self.kill_list.append(archer.agent_name)
+        zombies = self.zombie_list.sprites()
+        for _, archer in sprite_hits(zombies, self.archer_list.sprites()):
+            archer.alive = False
+            self.archer_list.remove(archer)
+            if archer.agent_name not in self.kill_list:
+                self.kill_list.append(archer.agent_name)
 
     # Zombie Kills the Sword
     def sword_hit(self):
-        for knight in self.knight_list:
-            for sword in knight.weapons:
-                zombie_sword_list = pygame.sprite.spritecollide(
-                    sword, self.zombie_list, True
-                )
-
-                for zombie in zombie_sword_list:
-                    self.zombie_list.remove(zombie)
-                    sword.knight.score += 1
+        swords = [sword for knight in self.knight_list for sword in knight.weapons]
+        for sword, zombie in sprite_hits(swords, self.zombie_list.sprites()):
+            self.zombie_list.remove(zombie)
+            sword.knight.score += 1
 
     # Zombie Kills the Arrow
     def arrow_hit(self):
-        for agent in self.agent_list:
-            if agent.is_archer:
-                for arrow in list(agent.weapons):
-                    zombie_arrow_list = pygame.sprite.spritecollide(
-                        arrow, self.zombie_list, True
-                    )
-
-                    # For each zombie hit, remove the arrow, zombie and add to the score
-                    for zombie in zombie_arrow_list:
-                        agent.weapons.remove(arrow)
-                        self.zombie_list.remove(zombie)
-                        arrow.archer.score += 1
+        arrows = [
+            arrow
+            for agent in self.agent_list
+            if agent.is_archer
+            for arrow in agent.weapons
+        ]
+
+        # For each zombie hit, remove the arrow, zombie and add to the score
+        for arrow, zombie in sprite_hits(arrows, self.zombie_list.sprites()):
+            arrow.archer.weapons.remove(arrow)
+            self.zombie_list.remove(zombie)
+            arrow.archer.score += 1
 
     # Zombie reaches the End of the Screen
     def zombie_endscreen(self, run, zombie_list):
@@ -506,172 +521,172 @@ class raw_env(AECEnv, EzPickle):
 
     def observe(self, agent):
         if not self.vector_state:
-            screen = pygame.surfarray.pixels3d(self.screen)
-
-            i = self.agent_name_mapping[agent]
-            agent_obj = self.agent_list[i]
-            agent_position = (agent_obj.rect.x, agent_obj.rect.y)
-
+            agent_obj = self.agent_list[self.agent_name_mapping[agent]]
             if not agent_obj.alive:
-                cropped = np.zeros((512, 512, 3), dtype=np.uint8)
-            else:
-                min_x = agent_position[0] - 256
-                max_x = agent_position[0] + 256
-                min_y = agent_position[1] - 256
-                max_y = agent_position[1] + 256
-                lower_y_bound = max(min_y, 0)
-                upper_y_bound = min(max_y, const.SCREEN_HEIGHT)
-                lower_x_bound = max(min_x, 0)
-                upper_x_bound = min(max_x, const.SCREEN_WIDTH)
-                startx = lower_x_bound - min_x
-                starty = lower_y_bound - min_y
-                endx = 512 + upper_x_bound - max_x
-                endy = 512 + upper_y_bound - max_y
-                cropped = np.zeros_like(self.observation_spaces[agent].low)
-                cropped[startx:endx, starty:endy, :] = screen[
-                    lower_x_bound:upper_x_bound, lower_y_bound:upper_y_bound, :
-                ]
-
-            return np.swapaxes(cropped, 1, 0)
+                return np.zeros(self.observation_spaces[agent].shape, dtype=np.uint8)
 
-        else:
-            # get the agent
-            agent = self.agent_list[self.agent_name_mapping[agent]]
-
-            # get the agent position
-            agent_state = agent.vector_state
-            agent_pos = np.expand_dims(agent_state[0:2], axis=0)
-
-            # get vector state of everything
-            vector_state = self.get_vector_state()
-            state = vector_state[:, -4:]
-            is_dead = np.sum(np.abs(state), axis=1) == 0.0
-            all_ids = vector_state[:, :-4]
-            all_pos = state[:, 0:2]
-            all_ang = state[:, 2:4]
-
-            # get relative positions
-            rel_pos = all_pos - agent_pos
-
-            # get norm of relative distance
-            norm_pos = np.linalg.norm(rel_pos, axis=1, keepdims=True) / np.sqrt(2)
-
-            # kill dead things
-            all_ids[is_dead] *= 0
-            all_ang[is_dead] *= 0
-            rel_pos[is_dead] *= 0
-            norm_pos[is_dead] *= 0
-
-            # combine the typemasks, positions and angles
-            state = np.concatenate([all_ids, norm_pos, rel_pos, all_ang], axis=-1)
-
-            # get the agent state as absolute vector
-            # typemask is one longer to also include norm_pos
-            if self.use_typemasks:
-                typemask = np.zeros(self.typemask_width + 1)
-                typemask[-2] = 1.0
-            else:
-                typemask = np.array([0.0])
-            agent_state = agent.vector_state
-            agent_state = np.concatenate([typemask, agent_state], axis=0)
-            agent_state = np.expand_dims(agent_state, axis=0)
+            # the window spans 256 pixels on every side of the agent position,
+            # which is offset by the 512 pixels of padding
+            x = agent_obj.rect.x + 256
+            y = agent_obj.rect.y + 256
+            window = self.padded_screen_pixels()[
+                y : y + 512 : self.obs_scale, x : x + 512 : self.obs_scale
+            ]
+            return window[..., self.rgb_bytes]
 
-            # prepend agent state to the observation
-            state = np.concatenate([agent_state, state], axis=0)
+        else:
+            state = self.vector_observations()[self.agent_name_mapping[agent]]
             if self.sequence_space:
                 # remove pure zero rows if using sequence space
                 state = state[~np.all(state == 0, axis=-1)]
 
             return state
 
+    def vector_observations(self):
+        """Vector observations of all agents, as one (num_agents, num_tracked + 1, vector_width + 1) array.
+
+        The views of all agents are computed together from the entity matrix,
+        once per world update. A new array is made after each update, so
+        observations already handed out are never overwritten.
+        """
+        if self.vector_observation_batch is not None:
+            return self.vector_observation_batch
+
+        vector_state = self.get_vector_state(copy=False)
+        state = vector_state[:, -4:]
+        # rows without an entity are all 0, and stay 0 in every observation
+        alive = (np.sum(np.abs(state), axis=1) != 0.0)[None, :, None]
+
+        # get the position and heading of every agent, dead or alive
+        agent_states = np.array(
+            [
+                (
+                    agent.rect.x / const.SCREEN_WIDTH,
+                    agent.rect.y / const.SCREEN_HEIGHT,
+                    *agent.direction,
+                )
+                for agent in self.agent_list
+            ]
+        )
+
+        # get relative positions of everything to every agent, and their norm
+        rel_pos = state[None, :, 0:2] - agent_states[:, None, 0:2]
+        norm_pos = np.linalg.norm(rel_pos, axis=-1, keepdims=True) / np.sqrt(2)
+
+        # the first row is the agent state as absolute vector, after a
+        # typemask that is one longer to also include norm_pos
+        batch = np.zeros(
+            (len(self.agent_list), self.num_tracked + 1, self.vector_width + 1)
+        )
+        if self.use_typemasks:
+            batch[:, 0, -6] = 1.0
+        batch[:, 0, -4:] = agent_states
+
+        # combine the typemasks, positions and angles, and kill dead things
+        batch[:, 1:, :-5] = vector_state[:, :-4] * alive
+        batch[:, 1:, -5:-4] = norm_pos * alive
+        batch[:, 1:, -4:-2] = rel_pos * alive
+        batch[:, 1:, -2:] = state[:, 2:4] * alive
+
+        self.vector_observation_batch = batch
+        return batch
+
     def state(self):
         """Returns an observation of the global environment."""
         if not self.vector_state:
-            state = pygame.surfarray.pixels3d(self.screen).copy()
-            state = np.rot90(state, k=3)
-            state = np.fliplr(state)
+            state = self.padded_screen_pixels()[512:-512, 512:-512, self.rgb_bytes]
         else:
             state = self.get_vector_state()
 
         return state
 
-    def get_vector_state(self):
-        state = []
-        typemask = np.array([])
+    def padded_screen_pixels(self):
+        """Returns the padded screen, as an array of the bytes of every pixel indexed by (y, x, byte).
+
+        The raw pixels of the screen are copied in once after each redraw,
+        which is much faster than converting them to RGB. The red, green and
+        blue bytes of every pixel are at the indices in self.rgb_bytes.
+        """
+        if self.padded_screen_stale:
+            # pixels2d only maps 32 bit surfaces, 24 bit ones are copied
+            if self.screen.get_bytesize() == 4:
+                pixels = pygame.surfarray.pixels2d(self.screen)
+            else:
+                pixels = pygame.surfarray.array2d(self.screen)
+            self.padded_screen[512:-512, 512:-512] = pixels.T
+            self.rgb_bytes = [
+                shift // 8 if sys.byteorder == "little" else 3 - shift // 8
+                for shift in self.screen.get_shifts()[:3]
+            ]
+            self.padded_screen_stale = False
+        return self.padded_screen.view(np.uint8).reshape(*self.padded_screen.shape, 4)
+
+    def get_vector_state(self, copy=True):
+        """Returns the entity matrix, rebuilding it only if the world changed since it was last built.
+
+        With copy=False, the vector state buffer itself is returned, which is
+        overwritten by the next rebuild.
+        """
+        if self.vector_state_stale:
+            self.update_vector_state()
+            self.vector_state_stale = False
+        return self.vector_state_buffer.copy() if copy else self.vector_state_buffer
+
+    def update_vector_state(self):
+        """Rebuilds the entity matrix in place in the vector state buffer.
+
+        The rows hold the agents, swords, arrows and zombies in this order, and
+        each kind of entity is followed by empty rows up to its maximum count.
+        """
+        rows = []
+        types = []
+        entities = []
 
         # handle agents
-        for agent_name in self.possible_agents:
+        for row, agent_name in enumerate(self.possible_agents):
             if agent_name not in self.dead_agents:
                 agent = self.agent_list[self.agent_name_mapping[agent_name]]
-
-                if self.use_typemasks:
-                    typemask = np.zeros(self.typemask_width)
-                    if agent.is_archer:
-                        typemask[1] = 1.0
-                    elif agent.is_knight:
-                        typemask[2] = 1.0
-
-                vector = np.concatenate((typemask, agent.vector_state), axis=0)
-                state.append(vector)
-            else:
-                state.append(np.zeros(self.vector_width))
-
-        # handle swords
-        for agent in self.agent_list:
-            if agent.is_knight:
-                for sword in agent.weapons:
-                    if self.use_typemasks:
-                        typemask = np.zeros(self.typemask_width)
-                        typemask[4] = 1.0
-
-                    vector = np.concatenate((typemask, sword.vector_state), axis=0)
-                    state.append(vector)
-
-        # handle empty swords
-        state.extend(
-            repeat(
-                np.zeros(self.vector_width),
-                self.num_knights - self.num_active_swords,
-            )
-        )
-
-        # handle arrows
-        for agent in self.agent_list:
-            if agent.is_archer:
-                for arrow in agent.weapons:
-                    if self.use_typemasks:
-                        typemask = np.zeros(self.typemask_width)
-                        typemask[3] = 1.0
-
-                    vector = np.concatenate((typemask, arrow.vector_state), axis=0)
-                    state.append(vector)
-
-        # handle empty arrows
-        state.extend(
-            repeat(
-                np.zeros(self.vector_width),
-                self.max_arrows - self.num_active_arrows,
-            )
-        )
-
-        # handle zombies
-        for zombie in self.zombie_list:
+                rows.append(row)
+                types.append(1 if agent.is_archer else 2)
+                entities.append(agent)
+
+        # handle swords, arrows and zombies
+        swords = [
+            sword
+            for agent in self.agent_list
+            if agent.is_knight
+            for sword in agent.weapons
+        ]
+        arrows = [
+            arrow
+            for agent in self.agent_list
+            if agent.is_archer
+            for arrow in agent.weapons
+        ]
+        start = len(self.possible_agents)
+        for group, type_index, max_count in [
+            (swords, 4, self.num_knights),
+            (arrows, 3, self.max_arrows),
+            (self.zombie_list, 0, self.max_zombies),
+        ]:
+            for row, entity in enumerate(group, start):
+                rows.append(row)
+                types.append(type_index)
+                entities.append(entity)
+            start += max_count
+
+        self.vector_state_buffer.fill(0.0)
+        if entities:
+            self.vector_state_buffer[rows, -4:] = [
+                (
+                    entity.rect.x / const.SCREEN_WIDTH,
+                    entity.rect.y / const.SCREEN_HEIGHT,
+                    *entity.direction,
+                )
+                for entity in entities
+            ]
             if self.use_typemasks:
-                typemask = np.zeros(self.typemask_width)
-                typemask[0] = 1.0
-
-            vector = np.concatenate((typemask, zombie.vector_state), axis=0)
-            state.append(vector)
-
-        # handle empty zombies
-        state.extend(
-            repeat(
-                np.zeros(self.vector_width),
-                self.max_zombies - len(self.zombie_list),
-            )
-        )
-
-        return np.stack(state, axis=0)
+                self.vector_state_buffer[rows, types] = 1.0
 
     def step(self, action):
         # check if the particular agent is done
@@ -775,6 +790,10 @@ class raw_env(AECEnv, EzPickle):
         self._accumulate_rewards()
         self._deads_step_first()
 
+        # the world changed, so the vector state is rebuilt when next needed
+        self.vector_state_stale = True
+        self.vector_observation_batch = None
+
         if self.render_mode == "human":
             self.render()
 
@@ -794,6 +813,7 @@ class raw_env(AECEnv, EzPickle):
             agent.weapons.draw(self.screen)
         self.archer_list.draw(self.screen)
         self.knight_list.draw(self.screen)
+        self.padded_screen_stale = True
 
     def render(self):
         if self.render_mode is None:
@@ -899,6 +919,9 @@ class raw_env(AECEnv, EzPickle):
         else:
             self.screen = pygame.Surface((const.SCREEN_WIDTH, const.SCREEN_HEIGHT))
         self.frames = 0
+        self.vector_state_stale = True
+        self.vector_observation_batch = None
+        self.padded_screen_stale = True
 
     def reset(self, seed=None, options=None):
         if seed is not None:
@@ -0,0 +1,88 @@
+import numpy as np
+
+EMPTY = np.iinfo(np.int64).min
+
+# below this many hitter and target pairs, checking rect by rect is faster
+LOOP_MAX_PAIRS = 2500
+
+
+def _corners(rect):
+    # rects of zero width or height never collide in pygame, so their right
+    # and bottom are moved below any left and top
+    if rect.width == 0 or rect.height == 0:
+        return rect.left, rect.top, EMPTY, EMPTY
+    return rect.left, rect.top, rect.right, rect.bottom
+
+
+def rect_array(sprites):
+    """Stacks the rects of sprites into a (4, n) int array of their left, top, right and bottom edges."""
+    corners = [_corners(sprite.rect) for sprite in sprites]
+    return np.array(corners, dtype=np.int64).reshape(-1, 4).T.copy()
+
+
+def collide_matrix(rects, others):
+    """Overlaps of every rect in rects with every rect in others, as an (n, m) bool array.
+
+    This follows pygame.Rect.colliderect, so rects that only share an edge do
+    not collide.
+    """
+    left, top, right, bottom = rects[:, :, None]
+    other_left, other_top, other_right, other_bottom = others[:, None, :]
+    overlaps = left < other_right
+    overlaps &= other_left < right
+    overlaps &= top < other_bottom
+    overlaps &= other_top < bottom
+    return overlaps
+
+
+def first_hits(hitters, targets):
+    """Resolves which hitter takes each target.
+
+    The result matches going through the hitters in order, each one taking
+    every target it overlaps that no earlier hitter took, as repeated calls of
+    pygame.sprite.spritecollide with dokill=True do.
+
+    Args:
+        hitters: rect array of the hitters, from rect_array
+        targets: rect array of the targets, from rect_array
+
+    Returns:
+        hitter and target indices of every hit, in the order that loop finds them
+    """
+    if hitters.shape[1] == 0 or targets.shape[1] == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    overlaps = collide_matrix(hitters, targets)
+    taken = np.flatnonzero(overlaps.any(axis=0))
+    first = overlaps[:, taken].argmax(axis=0)
+    order = np.lexsort((taken, first))
+    return first[order], taken[order]
+
+
+def sprite_hits(hitters, targets):
+    """Resolves which hitter takes each target, like first_hits, for lists of sprites.
+
+    Returns:
+        (hitter, target) sprite pairs, in the order that first_hits finds them
+    """
+    if not hitters or not targets:
+        return []
+
+    if len(hitters) * len(targets) < LOOP_MAX_PAIRS:
+        hits = []
+        remaining = list(targets)
+        for hitter in hitters:
+            collides = hitter.rect.colliderect
+            taken = [target for target in remaining if collides(target.rect)]
+            if taken:
+                hits.extend((hitter, target) for target in taken)
+                remaining = [target for target in remaining if target not in taken]
+        return hits
+
+    hitter_indices, target_indices = first_hits(
+        rect_array(hitters), rect_array(targets)
+    )
+    return [
+        (hitters[h], targets[t])
+        for h, t in zip(hitter_indices.tolist(), target_indices.tolist())
+    ]
@@ -44,7 +44,8 @@ Keys *a* and *d* control which piston is selected to move (initially the rightmo
 ``` python
 pistonball_v6.env(n_pistons=20, time_penalty=-0.1, continuous=True,
 random_drop=True, random_rotate=True, ball_mass=0.75, ball_friction=0.3,
-ball_elasticity=1.5, max_cycles=125)
+ball_elasticity=1.5, max_cycles=125, obs_type="rgb_image", obs_scale=1,
+physics_steps_per_cycle=None, fast_reset=False)
 ```
 
 `n_pistons`: The number of pistons (agents) in the environment.
@@ -65,6 +66,31 @@ ball_elasticity=1.5, max_cycles=125)
 
 `max_cycles`:  after max_cycles steps all agents will return done
 
+`obs_type`:  `"rgb_image"` for the image observations described above, or `"vector"` for observations read directly from the physics bodies, without drawing the screen. See the table below
+
+`obs_scale`:  downscaling factor of the image observations, which keep every `obs_scale`-th row and column of pixels. With `obs_scale=4`, the observations have shape (115, 30, 3)
+
+`physics_steps_per_cycle`:  if None, the physics advance after each piston moves, so the dynamics depend on the piston order. If set, all pistons move first and the physics then advance by this many steps per cycle. `parallel_env` then moves all pistons in one call, which is much faster
+
+`fast_reset`:  whether resets keep the physics space, pistons and ball and only re-randomize them instead of rebuilding everything. The first episode is unchanged, but later episodes may resolve simultaneous contacts in a different order than a freshly built environment
+
+
+### Vector Observations
+
+With `obs_type="vector"`, each piston observes a vector of 9 values, and the state is a vector with the heights and velocities of all pistons followed by the position of the ball (relative to the screen size) and the last 3 ball values below.
+
+| Index | Description                                                                  |
+|:-----:|------------------------------------------------------------------------------|
+|   0   | Piston height above its lowest position, from 0 to 1                         |
+|   1   | Piston height change during its last move, from -1 to 1                      |
+|   2   | Left neighbor height (-1 for the left wall)                                  |
+|   3   | Right neighbor height (-1 for the right wall)                                |
+|   4   | Ball horizontal position relative to the piston center, over the screen width |
+|   5   | Ball height above the piston head, over the screen height                    |
+|   6   | Ball horizontal velocity, in piston widths per step                          |
+|   7   | Ball vertical velocity, in piston widths per step                            |
+|   8   | Ball angular velocity, relative to the largest initial spin (6 pi)           |
+
 
 ### Version History
 
@@ -86,8 +112,9 @@ import pygame
 import pymunk
 import pymunk.pygame_util
 from gymnasium.utils import EzPickle, seeding
+from numpy.lib.stride_tricks import sliding_window_view
 
-from pettingzoo import AECEnv
+from pettingzoo import AECEnv, ParallelEnv
 from pettingzoo.butterfly.pistonball.manual_policy import ManualPolicy
 from pettingzoo.utils import AgentSelector, wrappers
 from pettingzoo.utils.conversions import parallel_wrapper_fn
@@ -119,7 +146,13 @@ def env(**kwargs):
     return env
 
 
-parallel_env = parallel_wrapper_fn(env)
+_parallel_env = parallel_wrapper_fn(env)
+
+
+def parallel_env(**kwargs):
+    if kwargs.get("physics_steps_per_cycle") is not None:
+        return ParallelPistonballEnv(**kwargs)
+    return _parallel_env(**kwargs)
 
 
 class raw_env(AECEnv, EzPickle):
@@ -142,6 +175,10 @@ class raw_env(AECEnv, EzPickle):
         ball_friction=0.3,
         ball_elasticity=1.5,
         max_cycles=125,
+        obs_type="rgb_image",
+        obs_scale=1,
+        physics_steps_per_cycle=None,
+        fast_reset=False,
         render_mode=None,
     ):
         EzPickle.__init__(
@@ -155,6 +192,10 @@ class raw_env(AECEnv, EzPickle):
             ball_friction=ball_friction,
             ball_elasticity=ball_elasticity,
             max_cycles=max_cycles,
+            obs_type=obs_type,
+            obs_scale=obs_scale,
+            physics_steps_per_cycle=physics_steps_per_cycle,
+            fast_reset=fast_reset,
             render_mode=render_mode,
         )
         self.dt = 1.0 / FPS
@@ -168,33 +209,52 @@ class raw_env(AECEnv, EzPickle):
         self.ball_radius = 40
         self.screen_width = (2 * self.wall_width) + (self.piston_width * self.n_pistons)
         self.screen_height = 560
-        y_high = self.screen_height - self.wall_width - self.piston_body_height
-        y_low = self.wall_width
-        obs_height = y_high - y_low
+        self.obs_y_high = self.screen_height - self.wall_width - self.piston_body_height
+        self.obs_y_low = self.wall_width
 
         assert (
             self.piston_width == self.wall_width
         ), "Wall width and piston width must be equal for observation calculation"
         assert self.n_pistons > 1, "n_pistons must be greater than 1"
+        assert obs_type in (
+            "rgb_image",
+            "vector",
+        ), "obs_type must be 'rgb_image' or 'vector'"
+        self.obs_type = obs_type
+        assert (
+            isinstance(obs_scale, int) and obs_scale >= 1
+        ), "obs_scale must be a positive integer"
+        self.obs_scale = obs_scale
+        assert (
+            physics_steps_per_cycle is None or physics_steps_per_cycle >= 1
+        ), "physics_steps_per_cycle must be None or at least 1"
+        self.physics_steps_per_cycle = physics_steps_per_cycle
+        self.fast_reset = fast_reset
+        obs_height = len(range(self.obs_y_low, self.obs_y_high, obs_scale))
+        obs_width = len(range(0, self.piston_width * 3, obs_scale))
 
         self.agents = ["piston_" + str(r) for r in range(self.n_pistons)]
         self.possible_agents = self.agents[:]
         self.agent_name_mapping = dict(zip(self.agents, list(range(self.n_pistons))))
         self._agent_selector = AgentSelector(self.agents)
 
-        self.observation_spaces = dict(
-            zip(
-                self.agents,
-                [
-                    gymnasium.spaces.Box(
-                        low=0,
-                        high=255,
-                        shape=(obs_height, self.piston_width * 3, 3),
-                        dtype=np.uint8,
-                    )
-                ]
-                * self.n_pistons,
+        if self.obs_type == "vector":
+            # Ranges of the features in the table of the module docs, the
+            # ball velocities and spin are unbounded
+            observation_space = gymnasium.spaces.Box(
+                low=np.array([0, -1, -1, -1, -1, -1] + [-np.inf] * 3, np.float32),
+                high=np.array([1, 1, 1, 1, 1, 1] + [np.inf] * 3, np.float32),
+                dtype=np.float32,
             )
+        else:
+            observation_space = gymnasium.spaces.Box(
+                low=0,
+                high=255,
+                shape=(obs_height, obs_width, 3),
+                dtype=np.uint8,
+            )
+        self.observation_spaces = dict(
+            zip(self.agents, [observation_space] * self.n_pistons)
         )
         self.continuous = continuous
         if self.continuous:
@@ -208,12 +268,23 @@ class raw_env(AECEnv, EzPickle):
             self.action_spaces = dict(
                 zip(self.agents, [gymnasium.spaces.Discrete(3)] * self.n_pistons)
             )
-        self.state_space = gymnasium.spaces.Box(
-            low=0,
-            high=255,
-            shape=(self.screen_height, self.screen_width, 3),
-            dtype=np.uint8,
-        )
+        if self.obs_type == "vector":
+            # Piston heights and velocities are bounded like in the observations
+            self.state_space = gymnasium.spaces.Box(
+                low=np.array(
+                    [0] * self.n_pistons + [-1] * self.n_pistons + [-np.inf] * 5,
+                    np.float32,
+                ),
+                high=np.array([1] * 2 * self.n_pistons + [np.inf] * 5, np.float32),
+                dtype=np.float32,
+            )
+        else:
+            self.state_space = gymnasium.spaces.Box(
+                low=0,
+                high=255,
+                shape=(self.screen_height, self.screen_width, 3),
+                dtype=np.uint8,
+            )
 
         pygame.init()
         pymunk.pygame_util.positive_y_is_up = False
@@ -222,6 +293,7 @@ class raw_env(AECEnv, EzPickle):
         self.renderOn = False
         self.screen = pygame.Surface((self.screen_width, self.screen_height))
         self.max_cycles = max_cycles
+        self.space = None
 
         self.piston_sprite = get_image("piston.png")
         self.piston_body_sprite = get_image("piston_body.png")
@@ -247,6 +319,39 @@ class raw_env(AECEnv, EzPickle):
 
         self.pixels_per_position = 4
         self.n_piston_positions = 16
+        self.maximum_piston_y = (
+            self.screen_height
+            - self.wall_width
+            - (self.piston_height - self.piston_head_height)
+        )
+        # Height change of each piston during its last move, in pixels_per_position
+        self.piston_velocities = np.zeros(self.n_pistons)
+        # Transposed copy of the screen, and the image observations cut out of it
+        self.screen_buffer = np.zeros(
+            (self.screen_height, self.screen_width, 3), dtype=np.uint8
+        )
+        self.observations = None
+
+        # The walls only need to be drawn once, draw_background copies them
+        self.background_surface = pygame.Surface(
+            (self.screen_width, self.screen_height)
+        )
+        outer_walls = pygame.Rect(
+            0,  # Left
+            0,  # Top
+            self.screen_width,  # Width
+            self.screen_height,  # Height
+        )
+        outer_wall_color = (58, 64, 65)
+        pygame.draw.rect(self.background_surface, outer_wall_color, outer_walls)
+        inner_walls = pygame.Rect(
+            self.wall_width / 2,  # Left
+            self.wall_width / 2,  # Top
+            self.screen_width - self.wall_width,  # Width
+            self.screen_height - self.wall_width,  # Height
+        )
+        inner_wall_color = (68, 76, 77)
+        pygame.draw.rect(self.background_surface, inner_wall_color, inner_walls)
 
         self.screen.fill((0, 0, 0))
         self.draw_background()
@@ -283,24 +388,116 @@ class raw_env(AECEnv, EzPickle):
         self.np_random, seed = seeding.np_random(seed)
 
     def observe(self, agent):
-        observation = pygame.surfarray.pixels3d(self.screen)
         i = self.agent_name_mapping[agent]
-        # Set x bounds to include 40px left and 40px right of piston
-        x_high = self.wall_width + self.piston_width * (i + 2)
-        x_low = self.wall_width + self.piston_width * (i - 1)
-        y_high = self.screen_height - self.wall_width - self.piston_body_height
-        y_low = self.wall_width
-        cropped = np.array(observation[x_low:x_high, y_low:y_high, :])
-        observation = np.rot90(cropped, k=3)
-        observation = np.fliplr(observation)
-        return observation
+        if self.obs_type == "vector":
+            return self.vector_observation(i)
+        return self.observe_all()[i]
+
+    def observe_all(self):
+        """Observations of all pistons, stacked into one array.
+
+        Image observations span 40px left and 40px right of each piston. The
+        screen is copied into the screen buffer once after each redraw, and the
+        overlapping windows of all pistons are then copied out of it at once.
+        A new array is made after each redraw, so earlier observations are
+        never overwritten.
+        """
+        if self.obs_type == "vector":
+            return self.vector_observations()
+        if self.observations is None:
+            windows = sliding_window_view(
+                self.transposed_screen()[
+                    self.obs_y_low : self.obs_y_high : self.obs_scale
+                ],
+                self.piston_width * 3,
+                axis=1,
+            )[:, :: self.piston_width, :, :: self.obs_scale]
+            self.observations = np.ascontiguousarray(windows.transpose(1, 0, 3, 2))
+        return self.observations
+
+    def transposed_screen(self):
+        """Copies the screen into the screen buffer, indexed by (y, x, channel)."""
+        # pygame writes the rows of an RGB image about twice as fast as numpy transposes pixels3d
+        pixels = pygame.image.tobytes(self.screen, "RGB")
+        self.screen_buffer.reshape(-1)[:] = np.frombuffer(pixels, dtype=np.uint8)
+        return self.screen_buffer
+
+    def piston_level(self, i):
+        """Height of piston i above its lowest position, from 0 to 1."""
+        return (self.maximum_piston_y - self.pistonList[i].position[1]) / (
+            self.n_piston_positions * self.pixels_per_position
+        )
+
+    def vector_observation(self, i):
+        """Observation of piston i read from the pymunk bodies, without drawing anything.
+
+        The features are the height and velocity of the piston, the heights of
+        its neighbors (-1 for the walls at the edges), the position of the ball
+        relative to the piston head, the velocity of the ball and its angular
+        velocity.
+        """
+        piston = self.pistonList[i]
+        neighbor_heights = [
+            self.piston_level(j) if 0 <= j < self.n_pistons else -1.0
+            for j in (i - 1, i + 1)
+        ]
+        piston_center = piston.position[0] + self.piston_width / 2 - self.piston_radius
+        return np.array(
+            [
+                self.piston_level(i),
+                self.piston_velocities[i],
+                *neighbor_heights,
+                (self.ball.position[0] - piston_center) / self.screen_width,
+                (piston.position[1] - self.ball.position[1]) / self.screen_height,
+                *self._ball_motion(),
+            ],
+            dtype=np.float32,
+        )
+
+    def vector_observations(self):
+        """Vector observations of all pistons as one (n_pistons, 9) array, see vector_observation."""
+        positions = np.array([piston.position for piston in self.pistonList])
+        heights = (self.maximum_piston_y - positions[:, 1]) / (
+            self.n_piston_positions * self.pixels_per_position
+        )
+        padded_heights = np.concatenate([[-1.0], heights, [-1.0]])
+        piston_centers = positions[:, 0] + self.piston_width / 2 - self.piston_radius
+        observations = np.empty((self.n_pistons, 9), dtype=np.float32)
+        observations[:, 0] = heights
+        observations[:, 1] = self.piston_velocities
+        observations[:, 2] = padded_heights[:-2]
+        observations[:, 3] = padded_heights[2:]
+        observations[:, 4] = (
+            self.ball.position[0] - piston_centers
+        ) / self.screen_width
+        observations[:, 5] = (
+            positions[:, 1] - self.ball.position[1]
+        ) / self.screen_height
+        observations[:, 6:] = self._ball_motion()
+        return observations
+
+    def _ball_motion(self):
+        """Velocity of the ball in piston widths per step, and its angular velocity relative to the largest initial spin."""
+        return (
+            self.ball.velocity[0] * self.dt / self.piston_width,
+            self.ball.velocity[1] * self.dt / self.piston_width,
+            self.ball.angular_velocity / (6 * math.pi),
+        )
 
     def state(self):
         """Returns an observation of the global environment."""
-        state = pygame.surfarray.pixels3d(self.screen).copy()
-        state = np.rot90(state, k=3)
-        state = np.fliplr(state)
-        return state
+        if self.obs_type == "vector":
+            return np.array(
+                [self.piston_level(i) for i in range(self.n_pistons)]
+                + list(self.piston_velocities)
+                + [
+                    self.ball.position[0] / self.screen_width,
+                    self.ball.position[1] / self.screen_height,
+                    *self._ball_motion(),
+                ],
+                dtype=np.float32,
+            )
+        return self.transposed_screen().copy()
 
     def enable_render(self):
         self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
@@ -316,6 +513,14 @@ class raw_env(AECEnv, EzPickle):
             pygame.quit()
             self.screen = None
 
+    def space_objects(self):
+        """Bodies and shapes of the pistons and the ball, in the order they are added to the space."""
+        return [
+            part
+            for body in self.pistonList + [self.ball]
+            for part in (body, *body.shapes)
+        ]
+
     def add_walls(self):
         top_left = (self.wall_width, self.wall_width)
         top_right = (self.screen_width - self.wall_width, self.wall_width)
@@ -390,19 +595,21 @@ class raw_env(AECEnv, EzPickle):
     def reset(self, seed=None, options=None):
         if seed is not None:
             self._seed(seed)
-        self.space = pymunk.Space(threaded=False)
-        self.add_walls()
-        # self.space.threads = 2
-        self.space.gravity = (0.0, 750.0)
-        self.space.collision_bias = 0.0001
-        self.space.iterations = 10  # 10 is default in PyMunk
-
-        self.pistonList = []
-        maximum_piston_y = (
-            self.screen_height
-            - self.wall_width
-            - (self.piston_height - self.piston_head_height)
-        )
+        reuse = self.fast_reset and self.space is not None
+        if reuse:
+            # Removing the bodies discards their cached contacts
+            self.space.remove(*self.space_objects())
+        else:
+            self.space = pymunk.Space(threaded=False)
+            self.add_walls()
+            # self.space.threads = 2
+            self.space.gravity = (0.0, 750.0)
+            self.space.collision_bias = 0.0001
+            self.space.iterations = 10  # 10 is default in PyMunk
+            self.pistonList = []
+
+        self.piston_velocities = np.zeros(self.n_pistons)
+        maximum_piston_y = self.maximum_piston_y
         for i in range(self.n_pistons):
             # Multiply by 0.5 to use only the lower half of possible positions
             possible_y_displacements = np.arange(
@@ -410,17 +617,14 @@ class raw_env(AECEnv, EzPickle):
                 0.5 * self.pixels_per_position * self.n_piston_positions,
                 self.pixels_per_position,
             )
-            piston = self.add_piston(
-                self.space,
-                self.wall_width
-                + self.piston_radius
-                + self.piston_width * i,  # x position
-                maximum_piston_y
-                # y position
-                - self.np_random.choice(possible_y_displacements),
-            )
-            piston.velociy = 0
-            self.pistonList.append(piston)
+            x = self.wall_width + self.piston_radius + self.piston_width * i
+            y = maximum_piston_y - self.np_random.choice(possible_y_displacements)
+            if reuse:
+                self.pistonList[i].position = x, y
+            else:
+                piston = self.add_piston(self.space, x, y)
+                piston.velociy = 0
+                self.pistonList.append(piston)
 
         self.horizontal_offset = 0
         self.vertical_offset = 0
@@ -453,9 +657,20 @@ class raw_env(AECEnv, EzPickle):
         # Ensure ball starts somewhere right of the left wall
         ball_x = max(ball_x, self.wall_width + self.ball_radius + 1)
 
-        self.ball = self.add_ball(
-            ball_x, ball_y, self.ball_mass, self.ball_friction, self.ball_elasticity
-        )
+        if reuse:
+            if self.random_rotate:
+                # Draws the spin add_ball draws, which is then drawn again below
+                self.np_random.uniform(-6 * math.pi, 6 * math.pi)
+            self.ball.position = ball_x, ball_y
+            self.ball.angular_velocity = 0
+            # Integrating over no time clears the bias velocity left on the ball
+            # by the contact solver
+            pymunk.Body.update_position(self.ball, 0.0)
+            self.space.add(*self.space_objects())
+        else:
+            self.ball = self.add_ball(
+                ball_x, ball_y, self.ball_mass, self.ball_friction, self.ball_elasticity
+            )
         self.ball.angle = 0
         self.ball.velocity = (0, 0)
         if self.random_rotate:
@@ -466,8 +681,10 @@ class raw_env(AECEnv, EzPickle):
         self.lastX = int(self.ball.position[0] - self.ball_radius)
         self.distance = self.lastX - self.wall_width
 
-        self.draw_background()
-        self.draw()
+        # Vector observations do not read the screen, render() draws it itself
+        if self.obs_type == "rgb_image":
+            self.draw_background()
+            self.draw()
 
         self.agents = self.possible_agents[:]
 
@@ -485,22 +702,8 @@ class raw_env(AECEnv, EzPickle):
         self.frames = 0
 
     def draw_background(self):
-        outer_walls = pygame.Rect(
-            0,  # Left
-            0,  # Top
-            self.screen_width,  # Width
-            self.screen_height,  # Height
-        )
-        outer_wall_color = (58, 64, 65)
-        pygame.draw.rect(self.screen, outer_wall_color, outer_walls)
-        inner_walls = pygame.Rect(
-            self.wall_width / 2,  # Left
-            self.wall_width / 2,  # Top
-            self.screen_width - self.wall_width,  # Width
-            self.screen_height - self.wall_width,  # Height
-        )
-        inner_wall_color = (68, 76, 77)
-        pygame.draw.rect(self.screen, inner_wall_color, inner_walls)
+        self.observations = None
+        self.screen.blit(self.background_surface, (0, 0))
         self.draw_pistons()
 
     def draw_pistons(self):
@@ -533,6 +736,7 @@ class raw_env(AECEnv, EzPickle):
     def draw(self):
         if self.render_mode is None:
             return
+        self.observations = None
         # redraw the background image if ball goes outside valid position
         if not self.valid_ball_position_rect.collidepoint(self.ball.position):
             # self.screen.blit(self.background, (0, 0))
@@ -618,64 +822,153 @@ class raw_env(AECEnv, EzPickle):
             self._was_dead_step(action)
             return
 
-        action = np.asarray(action)
         agent = self.agent_selection
+        self._act(agent, action)
+        if self.physics_steps_per_cycle is None:
+            self.space.step(self.dt)
+        if self._agent_selector.is_last():
+            self._end_cycle()
+        else:
+            self._clear_rewards()
+
+        self.agent_selection = self._agent_selector.next()
+        self._cumulative_rewards[agent] = 0
+        self._accumulate_rewards()
+
+        if self.render_mode == "human":
+            self.render()
+
+    def step_cycle(self, actions):
+        """Moves every piston by its action in the actions dict, then ends the cycle.
+
+        This has the same effect as stepping every agent in turn, without the
+        overhead of one call per agent. It requires physics_steps_per_cycle to
+        be set, since otherwise the physics advance between pistons.
+        """
+        assert (
+            self.physics_steps_per_cycle is not None
+        ), "step_cycle requires physics_steps_per_cycle to be set"
+        for agent in self.agents:
+            self._act(agent, actions[agent])
+        self._end_cycle()
+        self._cumulative_rewards = dict(self.rewards)
+
+        if self.render_mode == "human":
+            self.render()
+
+    def _act(self, agent, action):
+        action = np.asarray(action)
+        piston = self.pistonList[self.agent_name_mapping[agent]]
+        piston_y = piston.position[1]
         if self.continuous:
             # action is a 1 item numpy array, move_piston expects a scalar
-            self.move_piston(self.pistonList[self.agent_name_mapping[agent]], action[0])
+            self.move_piston(piston, action[0])
         else:
-            self.move_piston(
-                self.pistonList[self.agent_name_mapping[agent]], action - 1
-            )
-
-        self.space.step(self.dt)
-        if self._agent_selector.is_last():
-            ball_min_x = int(self.ball.position[0] - self.ball_radius)
-            ball_next_x = (
-                self.ball.position[0]
-                - self.ball_radius
-                + self.ball.velocity[0] * self.dt
-            )
-            if ball_next_x <= self.wall_width + 1:
-                self.terminate = True
-            # ensures that the ball can't pass through the wall
-            ball_min_x = max(self.wall_width, ball_min_x)
+            self.move_piston(piston, action - 1)
+        self.piston_velocities[self.agent_name_mapping[agent]] = (
+            piston_y - piston.position[1]
+        ) / self.pixels_per_position
+
+    def _end_cycle(self):
+        for _ in range(self.physics_steps_per_cycle or 0):
+            self.space.step(self.dt)
+
+        ball_min_x = int(self.ball.position[0] - self.ball_radius)
+        ball_next_x = (
+            self.ball.position[0] - self.ball_radius + self.ball.velocity[0] * self.dt
+        )
+        if ball_next_x <= self.wall_width + 1:
+            self.terminate = True
+        # ensures that the ball can't pass through the wall
+        ball_min_x = max(self.wall_width, ball_min_x)
+        if self.obs_type == "rgb_image":
             self.draw()
-            local_reward = self.get_local_reward(self.lastX, ball_min_x)
-            # Opposite order due to moving right to left
-            global_reward = (100 / self.distance) * (self.lastX - ball_min_x)
-            if not self.terminate:
-                global_reward += self.time_penalty
-            total_reward = [
-                global_reward * (1 - self.local_ratio)
-            ] * self.n_pistons  # start with global reward
-            local_pistons_to_reward = self.get_nearby_pistons()
-            for index in local_pistons_to_reward:
-                total_reward[index] += local_reward * self.local_ratio
-            self.rewards = dict(zip(self.agents, total_reward))
-            self.lastX = ball_min_x
-            self.frames += 1
-        else:
-            self._clear_rewards()
+        local_reward = self.get_local_reward(self.lastX, ball_min_x)
+        # Opposite order due to moving right to left
+        global_reward = (100 / self.distance) * (self.lastX - ball_min_x)
+        if not self.terminate:
+            global_reward += self.time_penalty
+        total_reward = [
+            global_reward * (1 - self.local_ratio)
+        ] * self.n_pistons  # start with global reward
+        local_pistons_to_reward = self.get_nearby_pistons()
+        for index in local_pistons_to_reward:
+            total_reward[index] += local_reward * self.local_ratio
+        self.rewards = dict(zip(self.agents, total_reward))
+        self.lastX = ball_min_x
+        self.frames += 1
 
         self.truncate = self.frames >= self.max_cycles
         # Clear the list of recent pistons for the next reward cycle
         if self.frames % self.recentFrameLimit == 0:
             self.recentPistons = set()
-        if self._agent_selector.is_last():
-            self.terminations = dict(
-                zip(self.agents, [self.terminate for _ in self.agents])
-            )
-            self.truncations = dict(
-                zip(self.agents, [self.truncate for _ in self.agents])
-            )
+        self.terminations = dict(
+            zip(self.agents, [self.terminate for _ in self.agents])
+        )
+        self.truncations = dict(zip(self.agents, [self.truncate for _ in self.agents]))
 
-        self.agent_selection = self._agent_selector.next()
-        self._cumulative_rewards[agent] = 0
-        self._accumulate_rewards()
 
-        if self.render_mode == "human":
-            self.render()
+class ParallelPistonballEnv(ParallelEnv):
+    """Parallel API of pistonball that moves all pistons with one call to step_cycle.
+
+    parallel_env returns this class when physics_steps_per_cycle is set. The
+    AEC to parallel conversion would otherwise step and observe every agent
+    separately.
+    """
+
+    def __init__(self, **kwargs):
+        self.aec_env = raw_env(**kwargs)
+        self.possible_agents = self.aec_env.possible_agents
+        self.metadata = self.aec_env.metadata
+        self.render_mode = self.aec_env.render_mode
+        self.state_space = self.aec_env.state_space
+
+    def observation_space(self, agent):
+        return self.aec_env.observation_space(agent)
+
+    def action_space(self, agent):
+        return self.aec_env.action_space(agent)
+
+    @property
+    def unwrapped(self):
+        return self.aec_env
+
+    def reset(self, seed=None, options=None):
+        self.aec_env.reset(seed=seed, options=options)
+        self.agents = self.aec_env.agents[:]
+        observations = dict(zip(self.agents, self.aec_env.observe_all()))
+        return observations, dict(**self.aec_env.infos)
+
+    def step(self, actions):
+        env = self.aec_env
+        if env.continuous:
+            actions = {
+                agent: np.clip(action, -1, 1) for agent, action in actions.items()
+            }
+        else:
+            assert all(
+                0 <= action < 3 for action in actions.values()
+            ), "actions must be 0, 1 or 2"
+        env.step_cycle(actions)
+
+        rewards = dict(env.rewards)
+        terminations = dict(env.terminations)
+        truncations = dict(env.truncations)
+        infos = dict(**env.infos)
+        observations = dict(zip(env.agents, env.observe_all()))
+        if env.terminate or env.truncate:
+            env.agents = []
+        self.agents = env.agents[:]
+        return observations, rewards, terminations, truncations, infos
+
+    def render(self):
+        return self.aec_env.render()
+
+    def state(self):
+        return self.aec_env.state()
+
+    def close(self):
+        self.aec_env.close()
 
 
 # Game art created by J K Terry
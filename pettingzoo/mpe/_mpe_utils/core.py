@@ -99,6 +99,12 @@ class World:  # multi-agent world
         # contact response parameters
         self.contact_force = 1e2
         self.contact_margin = 1e-3
+        # floating point type of the entity states, forces and integration
+        self.dtype = np.float64
+        # packed communication state of all agents, (num_agents, dim_c)
+        self.comm = None
+        # packed communication actions of all agents, set by the env
+        self.comm_actions = None
 
     # return all entities in the world
     @property
@@ -115,10 +121,55 @@ class World:  # multi-agent world
     def scripted_agents(self):
         return [agent for agent in self.agents if agent.action_callback is not None]
 
+    # cast the state of all entities to the world's dtype (after scenario resets)
+    def cast_state(self):
+        for entity in self.entities:
+            if entity.state.p_pos is not None:
+                entity.state.p_pos = np.asarray(entity.state.p_pos, dtype=self.dtype)
+            if entity.state.p_vel is not None:
+                entity.state.p_vel = np.asarray(entity.state.p_vel, dtype=self.dtype)
+        for agent in self.agents:
+            if agent.state.c is not None:
+                agent.state.c = np.asarray(agent.state.c, dtype=self.dtype)
+
+    # pack the communication state of all agents into one array (after scenario resets)
+    def pack_communication(self):
+        self.comm = np.zeros((len(self.agents), self.dim_c), dtype=self.dtype)
+        for i, agent in enumerate(self.agents):
+            if agent.state.c is not None:
+                self.comm[i] = agent.state.c
+            # agents read and write their own row of the packed array
+            agent.state.c = self.comm[i]
+        self._comm_index = {agent.name: i for i, agent in enumerate(self.agents)}
+        self._others_index = {
+            agent.name: np.array([j for j in range(len(self.agents)) if j != i])
+            for i, agent in enumerate(self.agents)
+        }
+        self._speaking = np.array([[not agent.silent] for agent in self.agents])
+        # rows of the speaking agents with communication noise, and its amount
+        self._noisy = np.array(
+            [
+                i
+                for i, agent in enumerate(self.agents)
+                if agent.c_noise and not agent.silent
+            ],
+            dtype=int,
+        )
+        self._c_noise = np.array([[self.agents[i].c_noise] for i in self._noisy])
+
+    # communication state of the given agent, read from the packed array
+    def agent_comm(self, agent):
+        return self.comm[self._comm_index[agent.name]]
+
+    # communication states of all agents but the given one, read from the packed array
+    def others_comm(self, agent):
+        return self.comm[self._others_index[agent.name]]
+
     # update state of the world
     def step(self):
         # set actions for scripted agents
-        for agent in self.scripted_agents:
+        scripted_agents = self.scripted_agents
+        for agent in scripted_agents:
             agent.action = agent.action_callback(agent, self)
         # gather forces applied to entities
         p_force = [None] * len(self.entities)
@@ -129,8 +180,15 @@ class World:  # multi-agent world
         # integrate physical state
         self.integrate_state(p_force)
         # update agent state
-        for agent in self.agents:
-            self.update_agent_state(agent)
+        if (
+            self.comm is not None
+            and self.comm_actions is not None
+            and not scripted_agents
+        ):
+            self.update_communication()
+        else:
+            for agent in self.agents:
+                self.update_agent_state(agent)
 
     # gather agent action forces
     def apply_action_force(self, p_force):
@@ -189,14 +247,29 @@ class World:  # multi-agent world
     def update_agent_state(self, agent):
         # set communication state (directly for now)
         if agent.silent:
-            agent.state.c = np.zeros(self.dim_c)
+            c = np.zeros(self.dim_c, dtype=self.dtype)
         else:
             noise = (
                 np.random.randn(*agent.action.c.shape) * agent.c_noise
                 if agent.c_noise
                 else 0.0
             )
-            agent.state.c = agent.action.c + noise
+            c = agent.action.c + noise
+        if self.comm is None:
+            agent.state.c = c
+        else:
+            # write in place so that the row of the packed array stays in sync
+            agent.state.c[:] = c
+
+    # set the communication state of all agents at once from the packed actions
+    def update_communication(self):
+        # silent agents always have a zero communication state
+        np.multiply(self.comm_actions, self._speaking, out=self.comm)
+        # noise is only drawn for the noisy rows, in agent order, as update_agent_state does
+        if len(self._noisy):
+            self.comm[self._noisy] += (
+                np.random.randn(len(self._noisy), self.dim_c) * self._c_noise
+            )
 
     # get collision forces for any contact between two entities
     def get_collision_force(self, entity_a, entity_b):
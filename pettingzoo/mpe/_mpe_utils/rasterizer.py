@@ -0,0 +1,49 @@
+import numpy as np
+
+
+def draw_circles(frame, centers, radii, colors, border=1.0):
+    """Draws filled circles with a black border into an ``(height, width, 3)`` uint8 frame.
+
+    Circles are drawn in order, so later circles cover earlier ones. The pixel
+    distances of every circle are computed once along each axis, and each circle
+    only touches the pixels of its own bounding box.
+
+    Args:
+        frame: preallocated ``(height, width, 3)`` uint8 array, modified in place
+        centers: ``(n, 2)`` array of ``(x, y)`` pixel coordinates
+        radii: ``(n,)`` array of radii in pixels
+        colors: ``(n, 3)`` uint8 array of fill colors
+        border: width of the black border in pixels
+    """
+    height, width = frame.shape[:2]
+    centers = np.asarray(centers, dtype=np.float64)
+    radii = np.asarray(radii, dtype=np.float64)
+
+    # pixel centers relative to every circle center, squared, along each axis
+    dx2 = np.square(np.arange(width) + 0.5 - centers[:, 0:1])
+    dy2 = np.square(np.arange(height) + 0.5 - centers[:, 1:2])
+    x_low = np.clip(np.floor(centers[:, 0] - radii), 0, width).astype(np.int64)
+    x_high = np.clip(np.ceil(centers[:, 0] + radii) + 1, 0, width).astype(np.int64)
+    y_low = np.clip(np.floor(centers[:, 1] - radii), 0, height).astype(np.int64)
+    y_high = np.clip(np.ceil(centers[:, 1] + radii) + 1, 0, height).astype(np.int64)
+    outer = np.square(radii)
+    inner = np.square(np.maximum(radii - border, 0.0))
+
+    for i in range(len(radii)):
+        dist2 = dy2[i, y_low[i] : y_high[i], None] + dx2[i, None, x_low[i] : x_high[i]]
+        window = frame[y_low[i] : y_high[i], x_low[i] : x_high[i]]
+        window[dist2 <= outer[i]] = colors[i]
+        window[(dist2 <= outer[i]) & (dist2 > inner[i])] = 0
+
+
+def draw_text(frame, coverage, x, y):
+    """Darkens the pixels of a frame by a grayscale text coverage mask (0 to 255) placed at ``(x, y)``."""
+    height, width = frame.shape[:2]
+    x, y = int(x), int(y)
+    mask_height, mask_width = coverage.shape
+    x_high, y_high = min(x + mask_width, width), min(y + mask_height, height)
+    if x >= x_high or y >= y_high:
+        return
+    alpha = coverage[: y_high - y, : x_high - x, None] / 255.0
+    window = frame[y:y_high, x:x_high]
+    window[:] = window * (1.0 - alpha)
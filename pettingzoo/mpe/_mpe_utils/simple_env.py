@@ -7,7 +7,7 @@ from gymnasium import spaces
 from gymnasium.utils import seeding
 
 from pettingzoo import AECEnv
-from pettingzoo.mpe._mpe_utils.core import Agent
+from pettingzoo.mpe._mpe_utils.rasterizer import draw_circles, draw_text
 from pettingzoo.utils import wrappers
 from pettingzoo.utils.agent_selector import AgentSelector
 
@@ -43,19 +43,34 @@ class SimpleEnv(AECEnv):
         continuous_actions=False,
         local_ratio=None,
         dynamic_rescaling=False,
+        dtype=np.float64,
+        render_backend="pygame",
+        render_resolution=700,
+        render_text=True,
     ):
         super().__init__()
 
+        assert render_backend in (
+            "pygame",
+            "numpy",
+        ), "render_backend must be 'pygame' or 'numpy'."
         self.render_mode = render_mode
+        self.render_backend = render_backend
+        self.render_text = render_text
         pygame.init()
         self.viewer = None
-        self.width = 700
-        self.height = 700
+        self.width = render_resolution
+        self.height = render_resolution
+        # sizes below are tuned for the original 700x700 screen
+        self.render_scale = render_resolution / 700
         self.screen = pygame.Surface([self.width, self.height])
         self.max_size = 1
         self.game_font = pygame.freetype.Font(
-            os.path.join(os.path.dirname(__file__), "secrcode.ttf"), 24
+            os.path.join(os.path.dirname(__file__), "secrcode.ttf"),
+            24 * self.render_scale,
         )
+        # frame buffer reused by the numpy rasterizer
+        self._frame = np.empty((self.height, self.width, 3), dtype=np.uint8)
 
         # Set up the drawing window
 
@@ -68,8 +83,15 @@ class SimpleEnv(AECEnv):
         self.continuous_actions = continuous_actions
         self.local_ratio = local_ratio
         self.dynamic_rescaling = dynamic_rescaling
+        assert np.dtype(dtype) in (
+            np.float32,
+            np.float64,
+        ), "dtype must be np.float32 or np.float64."
+        self.world.dtype = np.dtype(dtype)
 
         self.scenario.reset_world(self.world, self.np_random)
+        self.world.cast_state()
+        self.world.pack_communication()
 
         self.agents = [agent.name for agent in self.world.agents]
         self.possible_agents = self.agents[:]
@@ -118,10 +140,12 @@ class SimpleEnv(AECEnv):
             dtype=np.float32,
         )
 
+        self._build_action_tables()
+
         # Get the original cam_range
         # This will be used to scale the rendering
         all_poses = [entity.state.p_pos for entity in self.world.entities]
-        self.original_cam_range = np.max(np.abs(np.array(all_poses)))
+        self.original_cam_range = float(np.max(np.abs(np.array(all_poses))))
 
         self.steps = 0
 
@@ -137,23 +161,26 @@ class SimpleEnv(AECEnv):
         self.np_random, seed = seeding.np_random(seed)
 
     def observe(self, agent):
+        # no conversion copy when the world is already simulated in float32
         return self.scenario.observation(
             self.world.agents[self._index_map[agent]], self.world
-        ).astype(np.float32)
+        ).astype(np.float32, copy=False)
 
     def state(self):
         states = tuple(
             self.scenario.observation(
                 self.world.agents[self._index_map[agent]], self.world
-            ).astype(np.float32)
+            )
             for agent in self.possible_agents
         )
-        return np.concatenate(states, axis=None)
+        return np.concatenate(states, axis=None, dtype=np.float32)
 
     def reset(self, seed=None, options=None):
         if seed is not None:
             self._seed(seed=seed)
         self.scenario.reset_world(self.world, self.np_random)
+        self.world.cast_state()
+        self.world.pack_communication()
 
         self.agents = self.possible_agents[:]
         self.rewards = {name: 0.0 for name in self.agents}
@@ -168,24 +195,39 @@ class SimpleEnv(AECEnv):
         self.current_actions = [None] * self.num_agents
 
     def _execute_world_step(self):
-        # set action for each agent
-        for i, agent in enumerate(self.world.agents):
-            action = self.current_actions[i]
-            scenario_action = []
-            if agent.movable:
-                mdim = self.world.dim_p * 2 + 1
-                if self.continuous_actions:
-                    scenario_action.append(action[0:mdim])
+        self._set_actions()
+        self.world.step()
+        self._update_rewards()
+
+    def _set_actions(self):
+        # set action for each agent, writing into the preallocated action buffers
+        if self.continuous_actions:
+            mdim = self.world.dim_p * 2 + 1
+            for i, agent in enumerate(self.world.agents):
+                action = self.current_actions[i]
+                if agent.movable:
+                    self._movement_actions[i] = action[0:mdim]
                     action = action[mdim:]
+                if not agent.silent:
+                    agent.action.c[:] = action
                 else:
-                    scenario_action.append(action % mdim)
-                    action //= mdim
-            if not agent.silent:
-                scenario_action.append(action)
-            self._set_action(scenario_action, agent, self.action_spaces[agent.name])
-
-        self.world.step()
+                    # make sure we used all elements of action
+                    assert len(action) == 0
+            # Process continuous action as in OpenAI MPE
+            # Note: this ordering preserves the same movement direction as in the discrete case
+            np.subtract(
+                self._movement_actions[:, 2::2],
+                self._movement_actions[:, 1::2],
+                out=self._action_u,
+            )
+            self._action_u *= self._sensitivity
+        else:
+            # one lookup for all agents into the stacked action tables
+            rows = self._action_offsets + np.asarray(self.current_actions)
+            np.take(self._action_u_table, rows, axis=0, out=self._action_u)
+            np.take(self._action_c_table, rows, axis=0, out=self._action_c)
 
+    def _update_rewards(self):
         global_reward = 0.0
         if self.local_ratio is not None:
             global_reward = float(self.scenario.global_reward(self.world))
@@ -202,44 +244,57 @@ class SimpleEnv(AECEnv):
 
             self.rewards[agent.name] = reward
 
-    # set env action for a particular agent
-    def _set_action(self, action, agent, action_space, time=None):
-        agent.action.u = np.zeros(self.world.dim_p)
-        agent.action.c = np.zeros(self.world.dim_c)
+    def _build_action_tables(self):
+        """Precompute the decoding of actions into physical and communication actions.
 
-        if agent.movable:
-            # physical action
-            agent.action.u = np.zeros(self.world.dim_p)
-            if self.continuous_actions:
-                # Process continuous action as in OpenAI MPE
-                # Note: this ordering preserves the same movement direction as in the discrete case
-                agent.action.u[0] += action[0][2] - action[0][1]
-                agent.action.u[1] += action[0][4] - action[0][3]
-            else:
-                # process discrete action
-                if action[0] == 1:
-                    agent.action.u[0] = -1.0
-                if action[0] == 2:
-                    agent.action.u[0] = +1.0
-                if action[0] == 3:
-                    agent.action.u[1] = -1.0
-                if action[0] == 4:
-                    agent.action.u[1] = +1.0
-            sensitivity = 5.0
-            if agent.accel is not None:
-                sensitivity = agent.accel
-            agent.action.u *= sensitivity
-            action = action[1:]
-        if not agent.silent:
-            # communication action
-            if self.continuous_actions:
-                agent.action.c = action[0]
-            else:
-                agent.action.c = np.zeros(self.world.dim_c)
-                agent.action.c[action[0]] = 1.0
-            action = action[1:]
-        # make sure we used all elements of action
-        assert len(action) == 0
+        Each agent's ``action.u`` and ``action.c`` are views into shared
+        ``(num_agents, dim)`` buffers that ``_set_actions`` overwrites in place.
+        Discrete actions are decoded with one lookup into stacked per-agent
+        tables holding the ready ``(u, c)`` pair of every action index.
+        """
+        dim_p, dim_c = self.world.dim_p, self.world.dim_c
+        mdim = dim_p * 2 + 1
+        num_agents = len(self.world.agents)
+
+        self._action_u = np.zeros((num_agents, dim_p), dtype=self.world.dtype)
+        self._action_c = np.zeros((num_agents, dim_c), dtype=self.world.dtype)
+        for i, agent in enumerate(self.world.agents):
+            agent.action.u = self._action_u[i]
+            agent.action.c = self._action_c[i]
+        # lets the world update all communication states in one operation
+        self.world.comm_actions = self._action_c
+
+        sensitivity = np.array(
+            [5.0 if agent.accel is None else agent.accel for agent in self.world.agents]
+        )
+        if self.continuous_actions:
+            self._movement_actions = np.zeros((num_agents, mdim), dtype=np.float32)
+            self._sensitivity = sensitivity[:, None]
+            return
+
+        # movement index [no_action, move_left, move_right, move_down, move_up] -> u
+        movement = np.zeros((mdim, dim_p))
+        for d in range(dim_p):
+            movement[2 * d + 1, d] = -1.0
+            movement[2 * d + 2, d] = +1.0
+
+        u_tables, c_tables, offsets = [], [], []
+        for i, agent in enumerate(self.world.agents):
+            n = self.action_spaces[agent.name].n
+            index = np.arange(n)
+            u_table = np.zeros((n, dim_p))
+            if agent.movable:
+                u_table[:] = movement[index % mdim] * sensitivity[i]
+                index = index // mdim
+            c_table = np.zeros((n, dim_c))
+            if not agent.silent:
+                c_table[np.arange(n), index] = 1.0
+            offsets.append(sum(len(table) for table in u_tables))
+            u_tables.append(u_table)
+            c_tables.append(c_table)
+        self._action_u_table = np.concatenate(u_tables).astype(self.world.dtype)
+        self._action_c_table = np.concatenate(c_tables).astype(self.world.dtype)
+        self._action_offsets = np.array(offsets)
 
     def step(self, action):
         if (
@@ -285,32 +340,95 @@ class SimpleEnv(AECEnv):
 
         self.enable_render(self.render_mode)
 
-        self.draw()
-        if self.render_mode == "rgb_array":
-            observation = np.array(pygame.surfarray.pixels3d(self.screen))
-            return np.transpose(observation, axes=(1, 0, 2))
-        elif self.render_mode == "human":
+        if self.render_backend == "numpy":
+            self.rasterize(self._frame)
+            if self.render_mode == "rgb_array":
+                return self._frame.copy()
+            pygame.surfarray.blit_array(self.screen, self._frame.swapaxes(0, 1))
+        else:
+            self.draw()
+            if self.render_mode == "rgb_array":
+                observation = np.array(pygame.surfarray.pixels3d(self.screen))
+                return np.transpose(observation, axes=(1, 0, 2))
+
+        if self.render_mode == "human":
             pygame.display.flip()
             self.clock.tick(self.metadata["render_fps"])
             return
 
+    def _messages(self):
+        # communication of every speaking agent, as rendered at the bottom of the scene
+        for entity in self.world.agents:
+            if entity.silent:
+                continue
+            if np.all(entity.state.c == 0):
+                word = "_"
+            elif self.continuous_actions:
+                word = "[" + ",".join([f"{comm:.2f}" for comm in entity.state.c]) + "]"
+            else:
+                word = alphabet[np.argmax(entity.state.c)]
+
+            yield entity.name + " sends " + word + "   "
+
+    def rasterize(self, frame):
+        """Draws the scene into a ``(height, width, 3)`` uint8 array with numpy instead of pygame.
+
+        The frame is overwritten in place, so the same buffer can be reused
+        across calls (see ``render_batch`` to draw many environments at once).
+        """
+        frame.fill(255)
+
+        entities = self.world.entities
+        poses = np.array([entity.state.p_pos for entity in entities], dtype=np.float64)
+        sizes = np.array([entity.size for entity in entities])
+        # colors may carry an alpha channel, which pygame ignores on this surface too
+        colors = np.array([entity.color[:3] * 200 for entity in entities]).astype(
+            np.uint8
+        )
+
+        # same camera as draw(): centered, flipped vertically and fit to the 0.9 of the screen
+        cam_range = np.max(np.abs(poses))
+        centers = np.empty_like(poses)
+        centers[:, 0] = (poses[:, 0] / cam_range) * self.width // 2 * 0.9
+        centers[:, 1] = (-poses[:, 1] / cam_range) * self.height // 2 * 0.9
+        centers += (self.width // 2, self.height // 2)
+
+        radii = sizes * 350 * self.render_scale
+        if self.dynamic_rescaling:
+            radii *= 0.9 * self.original_cam_range / cam_range
+
+        draw_circles(frame, centers, radii, colors)
+
+        if self.render_text:
+            for text_line, message in enumerate(self._messages()):
+                coverage, (text_width, text_height) = self.game_font.render_raw(message)
+                coverage = np.frombuffer(coverage, dtype=np.uint8).reshape(
+                    text_height, text_width
+                )
+                draw_text(
+                    frame,
+                    coverage,
+                    self.width * 0.05,
+                    self.height * 0.95 - (self.height * 0.05 * text_line),
+                )
+        return frame
+
     def draw(self):
         # clear screen
         self.screen.fill((255, 255, 255))
 
         # update bounds to center around agent
         all_poses = [entity.state.p_pos for entity in self.world.entities]
-        cam_range = np.max(np.abs(np.array(all_poses)))
+        cam_range = float(np.max(np.abs(np.array(all_poses))))
 
         # The scaling factor is used for dynamic rescaling of the rendering - a.k.a Zoom In/Zoom Out effect
         # The 0.9 is a factor to keep the entities from appearing "too" out-of-bounds
         scaling_factor = 0.9 * self.original_cam_range / cam_range
 
-        # update geometry and text positions
-        text_line = 0
+        # update geometry
         for e, entity in enumerate(self.world.entities):
             # geometry
-            x, y = entity.state.p_pos
+            x, y = map(float, entity.state.p_pos)
             y *= (
                 -1
             )  # this makes the display mimic the old pyglet setup (ie. flips image)
@@ -323,9 +441,9 @@ class SimpleEnv(AECEnv):
 
             # 350 is an arbitrary scale factor to get pygame to render similar sizes as pyglet
             if self.dynamic_rescaling:
-                radius = entity.size * 350 * scaling_factor
+                radius = entity.size * 350 * self.render_scale * scaling_factor
             else:
-                radius = entity.size * 350
+                radius = entity.size * 350 * self.render_scale
 
             pygame.draw.circle(self.screen, entity.color * 200, (x, y), radius)
             pygame.draw.circle(self.screen, (0, 0, 0), (x, y), radius, 1)  # borders
@@ -333,28 +451,31 @@ class SimpleEnv(AECEnv):
                 0 < x < self.width and 0 < y < self.height
             ), f"Coordinates {(x, y)} are out of bounds."
 
-            # text
-            if isinstance(entity, Agent):
-                if entity.silent:
-                    continue
-                if np.all(entity.state.c == 0):
-                    word = "_"
-                elif self.continuous_actions:
-                    word = (
-                        "[" + ",".join([f"{comm:.2f}" for comm in entity.state.c]) + "]"
-                    )
-                else:
-                    word = alphabet[np.argmax(entity.state.c)]
-
-                message = entity.name + " sends " + word + "   "
+        # text
+        if self.render_text:
+            for text_line, message in enumerate(self._messages()):
                 message_x_pos = self.width * 0.05
                 message_y_pos = self.height * 0.95 - (self.height * 0.05 * text_line)
                 self.game_font.render_to(
                     self.screen, (message_x_pos, message_y_pos), message, (0, 0, 0)
                 )
-                text_line += 1
 
     def close(self):
         if self.screen is not None:
             pygame.quit()
             self.screen = None
+
+
+def render_batch(envs, out=None):
+    """Renders many MPE environments into one ``(len(envs), height, width, 3)`` uint8 array.
+
+    The environments are drawn with the numpy rasterizer regardless of their
+    render backend, and must share the same render resolution. Passing a
+    preallocated ``out`` array avoids allocating a new batch on every call.
+    """
+    envs = [env.unwrapped for env in envs]
+    if out is None:
+        out = np.empty((len(envs), envs[0].height, envs[0].width, 3), dtype=np.uint8)
+    for env, frame in zip(envs, out):
+        env.rasterize(frame)
+    return out
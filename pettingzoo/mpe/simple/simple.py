@@ -31,7 +31,7 @@ Observation space: `[self_vel, landmark_rel_position]`
 ### Arguments
 
 ``` python
-simple_v3.env(max_cycles=25, continuous_actions=False, dynamic_rescaling=False)
+simple_v3.env(max_cycles=25, continuous_actions=False, dynamic_rescaling=False, dtype=np.float64, render_backend="pygame", render_resolution=700, render_text=True)
 ```
 
 
@@ -42,6 +42,14 @@ simple_v3.env(max_cycles=25, continuous_actions=False, dynamic_rescaling=False)
 
 `dynamic_rescaling`: Whether to rescale the size of agents and landmarks based on the screen size
 
+`dtype`: Floating point type of the world simulation, either `np.float64` (default) or `np.float32`. With `np.float32`, observations are built without a conversion copy, and they stay within `1e-4` of the float64 values over a default length episode
+
+`render_backend`: Either `"pygame"` (default) or `"numpy"`, which draws the scene with a vectorized numpy rasterizer into a reused frame buffer
+
+`render_resolution`: Width and height in pixels of the rendered frames
+
+`render_text`: Whether to draw the communication text overlay at the bottom of the rendered frames
+
 """
 
 import numpy as np
@@ -60,12 +68,20 @@ class raw_env(SimpleEnv, EzPickle):
         continuous_actions=False,
         render_mode=None,
         dynamic_rescaling=False,
+        dtype=np.float64,
+        render_backend="pygame",
+        render_resolution=700,
+        render_text=True,
     ):
         EzPickle.__init__(
             self,
             max_cycles=max_cycles,
             continuous_actions=continuous_actions,
             render_mode=render_mode,
+            dtype=dtype,
+            render_backend=render_backend,
+            render_resolution=render_resolution,
+            render_text=render_text,
         )
         scenario = Scenario()
         world = scenario.make_world()
@@ -77,6 +93,10 @@ class raw_env(SimpleEnv, EzPickle):
             max_cycles=max_cycles,
             continuous_actions=continuous_actions,
             dynamic_rescaling=dynamic_rescaling,
+            dtype=dtype,
+            render_backend=render_backend,
+            render_resolution=render_resolution,
+            render_text=render_text,
         )
         self.metadata["name"] = "simple_v3"
 
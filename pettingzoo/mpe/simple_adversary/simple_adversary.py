@@ -39,7 +39,7 @@ Adversary action space: `[no_action, move_left, move_right, move_down, move_up]`
 ### Arguments
 
 ``` python
-simple_adversary_v3.env(N=2, max_cycles=25, continuous_actions=False, dynamic_rescaling=False)
+simple_adversary_v3.env(N=2, max_cycles=25, continuous_actions=False, dynamic_rescaling=False, dtype=np.float64, render_backend="pygame", render_resolution=700, render_text=True)
 ```
 
 
@@ -52,6 +52,14 @@ simple_adversary_v3.env(N=2, max_cycles=25, continuous_actions=False, dynamic_re
 
 `dynamic_rescaling`: Whether to rescale the size of agents and landmarks based on the screen size
 
+`dtype`: Floating point type of the world simulation, either `np.float64` (default) or `np.float32`. With `np.float32`, observations are built without a conversion copy, and they stay within `1e-4` of the float64 values over a default length episode
+
+`render_backend`: Either `"pygame"` (default) or `"numpy"`, which draws the scene with a vectorized numpy rasterizer into a reused frame buffer
+
+`render_resolution`: Width and height in pixels of the rendered frames
+
+`render_text`: Whether to draw the communication text overlay at the bottom of the rendered frames
+
 """
 
 import numpy as np
@@ -71,6 +79,10 @@ class raw_env(SimpleEnv, EzPickle):
         continuous_actions=False,
         render_mode=None,
         dynamic_rescaling=False,
+        dtype=np.float64,
+        render_backend="pygame",
+        render_resolution=700,
+        render_text=True,
     ):
         EzPickle.__init__(
             self,
@@ -78,6 +90,10 @@ class raw_env(SimpleEnv, EzPickle):
             max_cycles=max_cycles,
             continuous_actions=continuous_actions,
             render_mode=render_mode,
+            dtype=dtype,
+            render_backend=render_backend,
+            render_resolution=render_resolution,
+            render_text=render_text,
         )
         scenario = Scenario()
         world = scenario.make_world(N)
@@ -89,6 +105,10 @@ class raw_env(SimpleEnv, EzPickle):
             max_cycles=max_cycles,
             continuous_actions=continuous_actions,
             dynamic_rescaling=dynamic_rescaling,
+            dtype=dtype,
+            render_backend=render_backend,
+            render_resolution=render_resolution,
+            render_text=render_text,
         )
         self.metadata["name"] = "simple_adversary_v3"
 
@@ -40,7 +40,7 @@ Agent continuous action space: `[no_action, move_left, move_right, move_down, mo
 
 
 ``` python
-simple_reference_v3.env(local_ratio=0.5, max_cycles=25, continuous_actions=False, dynamic_rescaling=False)
+simple_reference_v3.env(local_ratio=0.5, max_cycles=25, continuous_actions=False, dynamic_rescaling=False, dtype=np.float64, render_backend="pygame", render_resolution=700, render_text=True)
 ```
 
 
@@ -53,6 +53,14 @@ simple_reference_v3.env(local_ratio=0.5, max_cycles=25, continuous_actions=False
 
 `dynamic_rescaling`: Whether to rescale the size of agents and landmarks based on the screen size
 
+`dtype`: Floating point type of the world simulation, either `np.float64` (default) or `np.float32`. With `np.float32`, observations are built without a conversion copy, and they stay within `1e-4` of the float64 values over a default length episode
+
+`render_backend`: Either `"pygame"` (default) or `"numpy"`, which draws the scene with a vectorized numpy rasterizer into a reused frame buffer
+
+`render_resolution`: Width and height in pixels of the rendered frames
+
+`render_text`: Whether to draw the communication text overlay at the bottom of the rendered frames
+
 """
 
 import numpy as np
@@ -72,6 +80,10 @@ class raw_env(SimpleEnv, EzPickle):
         continuous_actions=False,
         render_mode=None,
         dynamic_rescaling=False,
+        dtype=np.float64,
+        render_backend="pygame",
+        render_resolution=700,
+        render_text=True,
     ):
         EzPickle.__init__(
             self,
@@ -79,6 +91,10 @@ class raw_env(SimpleEnv, EzPickle):
             max_cycles=max_cycles,
             continuous_actions=continuous_actions,
             render_mode=render_mode,
+            dtype=dtype,
+            render_backend=render_backend,
+            render_resolution=render_resolution,
+            render_text=render_text,
         )
         assert (
             0.0 <= local_ratio <= 1.0
@@ -94,6 +110,10 @@ class raw_env(SimpleEnv, EzPickle):
             continuous_actions=continuous_actions,
             local_ratio=local_ratio,
             dynamic_rescaling=dynamic_rescaling,
+            dtype=dtype,
+            render_backend=render_backend,
+            render_resolution=render_resolution,
+            render_text=render_text,
         )
         self.metadata["name"] = "simple_reference_v3"
 
@@ -178,9 +198,5 @@ class Scenario(BaseScenario):
         for entity in world.landmarks:
             entity_color.append(entity.color)
         # communication of all other agents
-        comm = []
-        for other in world.agents:
-            if other is agent:
-                continue
-            comm.append(other.state.c)
-        return np.concatenate([agent.state.p_vel] + entity_pos + [goal_color[1]] + comm)
+        comm = world.others_comm(agent).ravel()
+        return np.concatenate([agent.state.p_vel] + entity_pos + [goal_color[1], comm])
@@ -37,7 +37,7 @@ Listener action space: `[no_action, move_left, move_right, move_down, move_up]`
 ### Arguments
 
 ``` python
-simple_speaker_listener_v4.env(max_cycles=25, continuous_actions=False, dynamic_rescaling=False)
+simple_speaker_listener_v4.env(max_cycles=25, continuous_actions=False, dynamic_rescaling=False, dtype=np.float64, render_backend="pygame", render_resolution=700, render_text=True)
 ```
 
 
@@ -48,6 +48,14 @@ simple_speaker_listener_v4.env(max_cycles=25, continuous_actions=False, dynamic_
 
 `dynamic_rescaling`: Whether to rescale the size of agents and landmarks based on the screen size
 
+`dtype`: Floating point type of the world simulation, either `np.float64` (default) or `np.float32`. With `np.float32`, observations are built without a conversion copy, and they stay within `1e-4` of the float64 values over a default length episode
+
+`render_backend`: Either `"pygame"` (default) or `"numpy"`, which draws the scene with a vectorized numpy rasterizer into a reused frame buffer
+
+`render_resolution`: Width and height in pixels of the rendered frames
+
+`render_text`: Whether to draw the communication text overlay at the bottom of the rendered frames
+
 """
 
 import numpy as np
@@ -66,12 +74,20 @@ class raw_env(SimpleEnv, EzPickle):
         continuous_actions=False,
         render_mode=None,
         dynamic_rescaling=False,
+        dtype=np.float64,
+        render_backend="pygame",
+        render_resolution=700,
+        render_text=True,
     ):
         EzPickle.__init__(
             self,
             max_cycles=max_cycles,
             continuous_actions=continuous_actions,
             render_mode=render_mode,
+            dtype=dtype,
+            render_backend=render_backend,
+            render_resolution=render_resolution,
+            render_text=render_text,
         )
         scenario = Scenario()
         world = scenario.make_world()
@@ -83,6 +99,10 @@ class raw_env(SimpleEnv, EzPickle):
             max_cycles=max_cycles,
             continuous_actions=continuous_actions,
             dynamic_rescaling=dynamic_rescaling,
+            dtype=dtype,
+            render_backend=render_backend,
+            render_resolution=render_resolution,
+            render_text=render_text,
         )
         self.metadata["name"] = "simple_speaker_listener_v4"
 
@@ -166,16 +186,11 @@ class Scenario(BaseScenario):
         for entity in world.landmarks:
             entity_pos.append(entity.state.p_pos - agent.state.p_pos)
 
-        # communication of all other agents
-        comm = []
-        for other in world.agents:
-            if other is agent or (other.state.c is None):
-                continue
-            comm.append(other.state.c)
-
         # speaker
         if not agent.movable:
             return np.concatenate([goal_color])
         # listener
         if agent.silent:
-            return np.concatenate([agent.state.p_vel] + entity_pos + comm)
+            # communication of all other agents
+            comm = world.others_comm(agent).ravel()
+            return np.concatenate([agent.state.p_vel] + entity_pos + [comm])
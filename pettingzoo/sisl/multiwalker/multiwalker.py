@@ -78,7 +78,7 @@ This table enumerates the observation space:
 
 ``` python
 multiwalker_v9.env(n_walkers=3, position_noise=1e-3, angle_noise=1e-3, forward_reward=1.0, terminate_reward=-100.0, fall_reward=-10.0, shared_reward=True,
-terminate_on_fall=True, remove_on_fall=True, terrain_length=200, max_cycles=500)
+terminate_on_fall=True, remove_on_fall=True, terrain_length=200, max_cycles=500, fast_reset=False, terrain_bank_size=16, terrain_seed=0, frame_skip=1, lidar_interval=1)
 ```
 
 
@@ -105,6 +105,16 @@ terminate_on_fall=True, remove_on_fall=True, terrain_length=200, max_cycles=500)
 
 `max_cycles`:  after max_cycles steps all agents will return done
 
+`fast_reset`:  If `True`, resets keep the Box2D world, the package and the walkers and move them back to their initial state instead of building everything again. Trajectories may differ slightly from a freshly built environment, since Box2D can process contacts in a different order
+
+`terrain_bank_size`:  number of terrains generated once from `terrain_seed` that fast resets draw from, which avoids generating a terrain at every reset. With `0`, fast resets generate a new terrain every time
+
+`terrain_seed`:  seed of the terrain bank
+
+`frame_skip`:  number of physics steps each action is repeated for. Rewards are summed over these steps, agents are done if they are done on any of them and get no rewards from the steps after, and observations are only computed for the last one. `max_cycles` still counts actions
+
+`lidar_interval`:  number of observations between two lidar scans. The readings of the last scan are held in between, trading observation freshness for throughput
+
 
 ### Version History
 * v8: Replaced local_ratio, fixed rewards, terrain length as an argument and documentation (1.15.0)
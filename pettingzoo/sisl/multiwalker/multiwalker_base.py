@@ -27,6 +27,15 @@ MOTORS_TORQUE = 80
 SPEED_HIP = 4
 SPEED_KNEE = 6
 LIDAR_RANGE = 160 / SCALE
+LIDAR_RAYS = 10
+# End points of the lidar rays relative to the hull position
+LIDAR_OFFSETS = tuple(
+    (
+        math.sin(1.5 * i / LIDAR_RAYS) * LIDAR_RANGE,
+        -math.cos(1.5 * i / LIDAR_RAYS) * LIDAR_RANGE,
+    )
+    for i in range(LIDAR_RAYS)
+)
 
 INITIAL_RANDOM = 5
 
@@ -51,6 +60,16 @@ FRICTION = 2.5
 WALKER_SEPERATION = 10  # in steps
 
 
+def _reset_body(body, position, angle):
+    """Move a body to a pose at rest, dropping its contacts."""
+    body.active = False
+    body.transform = (position, angle)
+    body.linearVelocity = (0, 0)
+    body.angularVelocity = 0
+    body.active = True
+    body.awake = True
+
+
 class ContactDetector(contactListener):
     def __init__(self, env):
         contactListener.__init__(self)
@@ -144,7 +163,6 @@ class BipedalWalker(Agent):
         )
 
         self.legs = []
-        self.joints = []
         for i in [-1, +1]:
             leg = self.world.CreateDynamicBody(
                 position=(init_x, init_y - LEG_H / 2 - LEG_DOWN),
@@ -158,20 +176,7 @@ class BipedalWalker(Agent):
             )
             leg.color1 = (153 - i * 25, 76 - i * 25, 127 - i * 25)
             leg.color2 = (102 - i * 25, 51 - i * 25, 76 - i * 25)
-            rjd = revoluteJointDef(
-                bodyA=self.hull,
-                bodyB=leg,
-                localAnchorA=(0, LEG_DOWN),
-                localAnchorB=(0, LEG_H / 2),
-                enableMotor=True,
-                enableLimit=True,
-                maxMotorTorque=MOTORS_TORQUE,
-                motorSpeed=i,
-                lowerAngle=-0.8,
-                upperAngle=1.1,
-            )
             self.legs.append(leg)
-            self.joints.append(self.world.CreateJoint(rjd))
 
             lower = self.world.CreateDynamicBody(
                 position=(init_x, init_y - LEG_H * 3 / 2 - LEG_DOWN),
@@ -185,6 +190,40 @@ class BipedalWalker(Agent):
             )
             lower.color1 = (153 - i * 25, 76 - i * 25, 127 - i * 25)
             lower.color2 = (102 - i * 25, 51 - i * 25, 76 - i * 25)
+            lower.ground_contact = False
+            self.legs.append(lower)
+        self._create_joints()
+
+        self.drawlist = self.legs + [self.hull]
+
+        class LidarCallback(Box2D.b2.rayCastCallback):
+            def ReportFixture(self, fixture, point, normal, fraction):
+                if (fixture.filterData.categoryBits & 1) == 0:
+                    return -1
+                self.p2 = point
+                self.fraction = fraction
+                return fraction
+
+        self.lidar = [LidarCallback() for _ in range(LIDAR_RAYS)]
+
+    def _create_joints(self):
+        """Create the hip and knee joints of both legs."""
+        self.joints = []
+        for i, (leg, lower) in zip([-1, +1], [self.legs[:2], self.legs[2:]]):
+            rjd = revoluteJointDef(
+                bodyA=self.hull,
+                bodyB=leg,
+                localAnchorA=(0, LEG_DOWN),
+                localAnchorB=(0, LEG_H / 2),
+                enableMotor=True,
+                enableLimit=True,
+                maxMotorTorque=MOTORS_TORQUE,
+                motorSpeed=i,
+                lowerAngle=-0.8,
+                upperAngle=1.1,
+            )
+            self.joints.append(self.world.CreateJoint(rjd))
+
             rjd = revoluteJointDef(
                 bodyA=leg,
                 bodyB=lower,
@@ -197,21 +236,31 @@ class BipedalWalker(Agent):
                 lowerAngle=-1.6,
                 upperAngle=-0.1,
             )
-            lower.ground_contact = False
-            self.legs.append(lower)
             self.joints.append(self.world.CreateJoint(rjd))
 
-        self.drawlist = self.legs + [self.hull]
-
-        class LidarCallback(Box2D.b2.rayCastCallback):
-            def ReportFixture(self, fixture, point, normal, fraction):
-                if (fixture.filterData.categoryBits & 1) == 0:
-                    return -1
-                self.p2 = point
-                self.fraction = fraction
-                return fraction
+    def _reset_in_place(self):
+        """Reset the existing bodies to the state `_reset` creates them in.
 
-        self.lidar = [LidarCallback() for _ in range(10)]
+        Deactivating the bodies drops their contacts, and the joints are
+        created again so that no accumulated impulses are carried over.
+        """
+        init_x = self.init_x
+        init_y = self.init_y
+        poses = [((init_x, init_y), 0.0)]
+        for i in [-1, +1]:
+            poses.append(((init_x, init_y - LEG_H / 2 - LEG_DOWN), i * 0.05))
+            poses.append(((init_x, init_y - LEG_H * 3 / 2 - LEG_DOWN), i * 0.05))
+        for body, pose in zip([self.hull] + self.legs, poses):
+            _reset_body(body, *pose)
+        self.legs[1].ground_contact = False
+        self.legs[3].ground_contact = False
+
+        for joint in self.joints:
+            self.world.DestroyJoint(joint)
+        self._create_joints()
+        self.hull.ApplyForceToCenter(
+            (self.np_random.uniform(-INITIAL_RANDOM, INITIAL_RANDOM), 0), True
+        )
 
     def apply_action(self, action):
         self.joints[0].motorSpeed = float(SPEED_HIP * np.sign(action[0]))
@@ -231,20 +280,36 @@ class BipedalWalker(Agent):
             MOTORS_TORQUE * np.clip(np.abs(action[3]), 0, 1)
         )
 
-    def get_observation(self):
+    def cast_lidar(self):
+        """Cast the lidar rays from the hull, the hit fractions are left in `self.lidar`."""
         pos = self.hull.position
-        vel = self.hull.linearVelocity
+        for lidar, (dx, dy) in zip(self.lidar, LIDAR_OFFSETS):
+            lidar.fraction = 1.0
+            lidar.p1 = pos
+            lidar.p2 = (pos[0] + dx, pos[1] + dy)
+            self.world.RayCast(lidar, lidar.p1, lidar.p2)
 
-        for i in range(10):
-            self.lidar[i].fraction = 1.0
-            self.lidar[i].p1 = pos
-            self.lidar[i].p2 = (
-                pos[0] + math.sin(1.5 * i / 10.0) * LIDAR_RANGE,
-                pos[1] - math.cos(1.5 * i / 10.0) * LIDAR_RANGE,
-            )
-            self.world.RayCast(self.lidar[i], self.lidar[i].p1, self.lidar[i].p2)
+    def get_observation(self):
+        self.cast_lidar()
+        state = self._body_state() + [l_dis.fraction for l_dis in self.lidar]
+        assert len(state) == 24
 
-        state = [
+        return state
+
+    def write_observation(self, out, cast_lidar=True):
+        """Write the 24 features of `get_observation` into the first entries of `out`.
+
+        With cast_lidar=False, the readings of the previous lidar scan are used.
+        """
+        if cast_lidar:
+            self.cast_lidar()
+        out[:14] = self._body_state()
+        out[14:24] = [l_dis.fraction for l_dis in self.lidar]
+
+    def _body_state(self):
+        """Hull and joint features of the observation."""
+        vel = self.hull.linearVelocity
+        return [
             # Normal angles up to 0.5 here, but sure more is possible.
             self.hull.angle,
             2.0 * self.hull.angularVelocity / FPS,
@@ -264,11 +329,6 @@ class BipedalWalker(Agent):
             1.0 if self.legs[3].ground_contact else 0.0,
         ]
 
-        state += [l_dis.fraction for l_dis in self.lidar]
-        assert len(state) == 24
-
-        return state
-
     @property
     def observation_space(self):
         # 24 original obs (joints, etc), 2 displacement obs for each neighboring walker, 3 for package
@@ -304,6 +364,11 @@ class MultiWalkerEnv:
         remove_on_fall=True,
         terrain_length=TERRAIN_LENGTH,
         max_cycles=500,
+        fast_reset=False,
+        terrain_bank_size=16,
+        terrain_seed=0,
+        frame_skip=1,
+        lidar_interval=1,
         render_mode=None,
     ):
         """Initializes the `MultiWalkerEnv` class.
@@ -318,7 +383,15 @@ class MultiWalkerEnv:
         terminate_on_fall: toggles whether agent is done if it falls down
         terrain_length: length of terrain in number of steps
         max_cycles: after max_cycles steps all agents will return done
+        fast_reset: whether resets keep the Box2D world and bodies and only move them back to their initial state
+        terrain_bank_size: number of terrains generated once that fast resets draw from, 0 generates a new terrain at every reset
+        terrain_seed: seed of the terrain bank
+        frame_skip: number of physics steps each action is repeated for, rewards are summed over them until an agent is done and observations are only assembled for the last one
+        lidar_interval: number of observations between two lidar scans, the readings of the last scan are held in between
         """
+        assert terrain_bank_size >= 0, "terrain_bank_size must be non-negative"
+        assert frame_skip >= 1, "frame_skip must be at least 1"
+        assert lidar_interval >= 1, "lidar_interval must be at least 1"
         self.n_walkers = n_walkers
         self.position_noise = position_noise
         self.angle_noise = angle_noise
@@ -329,6 +402,12 @@ class MultiWalkerEnv:
         self.local_ratio = 1 - shared_reward
         self.remove_on_fall = remove_on_fall
         self.terrain_length = terrain_length
+        self.fast_reset = fast_reset
+        self.terrain_bank_size = terrain_bank_size
+        self.terrain_seed = terrain_seed
+        self.frame_skip = frame_skip
+        self.lidar_interval = lidar_interval
+        self.observation_count = 0
         self.seed_val = None
         self._seed()
         self.setup()
@@ -336,6 +415,8 @@ class MultiWalkerEnv:
         self.last_rewards = [0 for _ in range(self.n_walkers)]
         self.last_dones = [False for _ in range(self.n_walkers)]
         self.last_obs = [None for _ in range(self.n_walkers)]
+        # Filled in place by observe_list
+        self.obs_buffer = np.zeros((self.n_walkers, 31), dtype=np.float32)
         self.max_cycles = max_cycles
         self.render_mode = render_mode
         self.frames = 0
@@ -348,6 +429,7 @@ class MultiWalkerEnv:
 
         self.world = Box2D.b2World()
         self.terrain = None
+        self.terrain_bank = None
 
         init_x = TERRAIN_STEP * TERRAIN_STARTPAD / 2
         init_y = TERRAIN_HEIGHT + 2 * LEG_H
@@ -405,28 +487,56 @@ class MultiWalkerEnv:
             self.screen = None
 
     def reset(self):
-        self.setup()
-        self.world.contactListener_bug_workaround = ContactDetector(self)
-        self.world.contactListener = self.world.contactListener_bug_workaround
+        reuse = self.fast_reset and self.terrain is not None
+        if reuse:
+            # setup() gives new walkers generators seeded with the same seed
+            for walker in self.walkers:
+                walker._seed(self.seed_val)
+            # Forces applied since the last step are not cleared yet
+            self.world.ClearForces()
+        else:
+            self.setup()
+            self.world.contactListener_bug_workaround = ContactDetector(self)
+            self.world.contactListener = self.world.contactListener_bug_workaround
         self.game_over = False
         self.fallen_walkers = np.zeros(self.n_walkers, dtype=bool)
         self.prev_shaping = np.zeros(self.n_walkers)
         self.prev_package_shaping = 0.0
         self.scroll = 0.0
         self.lidar_render = 0
-
-        self._generate_package()
-        self._generate_terrain(self.hardcore)
-        self._generate_clouds()
+        self.observation_count = 0
+
+        if reuse:
+            _reset_body(self.package, self.package_position(), 0.0)
+        else:
+            self._generate_package()
+        if self.fast_reset and self.terrain_bank_size:
+            self._swap_terrain()
+        else:
+            if reuse:
+                for t in self.terrain:
+                    self.world.DestroyBody(t)
+            self._generate_terrain(self.hardcore)
+            self._generate_clouds()
 
         self.drawlist = copy.copy(self.terrain)
 
         self.drawlist += [self.package]
 
+        # Walkers are only moved back if none was removed, since the solver
+        # order follows the order the bodies were created in
+        reuse_walkers = reuse and all(walker.hull for walker in self.walkers)
         for walker in self.walkers:
-            walker._reset()
+            if reuse_walkers:
+                walker._reset_in_place()
+            else:
+                walker._reset()
             self.drawlist += walker.legs
             self.drawlist += [walker.hull]
+        if reuse:
+            # Bodies created in a new world find their contacts before the
+            # first step, moved and activated bodies only after it
+            self.world.contactManager.FindNewContacts()
         r, d, o = self.scroll_subroutine()
         self.last_rewards = [0 for _ in range(self.n_walkers)]
         self.last_dones = [False for _ in range(self.n_walkers)]
@@ -435,44 +545,42 @@ class MultiWalkerEnv:
 
         return self.observe(0)
 
-    def scroll_subroutine(self):
-        xpos = np.zeros(self.n_walkers)
-        obs = []
-        done = False
-        rewards = np.zeros(self.n_walkers)
-
-        for i in range(self.n_walkers):
-            if self.walkers[i].hull is None:
-                obs.append(np.zeros_like(self.observation_space[i].low))
-                continue
-            pos = self.walkers[i].hull.position
-            x, y = pos.x, pos.y
-            xpos[i] = x
-
-            walker_obs = self.walkers[i].get_observation()
-            neighbor_obs = []
-            for j in [i - 1, i + 1]:
-                # if no neighbor (for edge walkers)
-                if j < 0 or j == self.n_walkers or self.walkers[j].hull is None:
-                    neighbor_obs.append(0.0)
-                    neighbor_obs.append(0.0)
-                else:
-                    xm = (self.walkers[j].hull.position.x - x) / self.package_length
-                    ym = (self.walkers[j].hull.position.y - y) / self.package_length
-                    neighbor_obs.append(self.np_random.normal(xm, self.position_noise))
-                    neighbor_obs.append(self.np_random.normal(ym, self.position_noise))
-            xd = (self.package.position.x - x) / self.package_length
-            yd = (self.package.position.y - y) / self.package_length
-            neighbor_obs.append(self.np_random.normal(xd, self.position_noise))
-            neighbor_obs.append(self.np_random.normal(yd, self.position_noise))
-            neighbor_obs.append(
-                self.np_random.normal(self.package.angle, self.angle_noise)
-            )
-            obs.append(np.array(walker_obs + neighbor_obs))
+    def hull_states(self):
+        """Whether each walker still has a hull, and the positions and angles of the hulls (zero for fallen walkers)."""
+        alive = np.array([walker.hull is not None for walker in self.walkers])
+        positions = np.zeros((self.n_walkers, 2))
+        angles = np.zeros(self.n_walkers)
+        for i, walker in enumerate(self.walkers):
+            if alive[i]:
+                positions[i] = walker.hull.position.x, walker.hull.position.y
+                angles[i] = walker.hull.angle
+        return alive, positions, angles
+
+    def scroll_subroutine(self, observe=True):
+        """Compute the rewards, dones and observations of the current frame.
+
+        With observe=False, the observations are only assembled if the
+        episode ends on this frame, and None is returned otherwise.
+        """
+        alive, positions, angles = self.hull_states()
+        failed = (
+            (self.terminate_on_fall and np.sum(self.fallen_walkers) > 0)
+            or self.game_over
+            or self.package.position.x < 0
+        )
+        finished = (
+            self.package.position.x
+            > (self.terrain_length - TERRAIN_GRASS) * TERRAIN_STEP
+        )
+        if observe or failed or finished or self.fallen_walkers.all():
+            obs = self.observe_list(alive, positions)
+        else:
+            obs = None
 
-            shaping = -5.0 * abs(walker_obs[0])
-            rewards[i] = shaping - self.prev_shaping[i]
-            self.prev_shaping[i] = shaping
+        shaping = -5.0 * np.abs(angles)
+        rewards = np.where(alive, shaping - self.prev_shaping, 0.0)
+        self.prev_shaping[alive] = shaping[alive]
+        xpos = positions[:, 0]
 
         package_shaping = self.forward_reward * 130 * self.package.position.x / SCALE
         rewards += package_shaping - self.prev_package_shaping
@@ -493,29 +601,81 @@ class MultiWalkerEnv:
                 if not self.terminate_on_fall:
                     rewards[i] += self.terminate_reward
                 done[i] = True
-        if (
-            (self.terminate_on_fall and np.sum(self.fallen_walkers) > 0)
-            or self.game_over
-            or self.package.position.x < 0
-        ):
+        if failed:
             rewards += self.terminate_reward
             done = [True] * self.n_walkers
-        elif (
-            self.package.position.x
-            > (self.terrain_length - TERRAIN_GRASS) * TERRAIN_STEP
-        ):
+        elif finished:
             done = [True] * self.n_walkers
 
         return rewards, done, obs
 
+    def observe_list(self, alive=None, positions=None):
+        """Compute the observations of all walkers at once.
+
+        The observations are written in place into `obs_buffer`, a
+        `(n_walkers, 31)` float32 array allocated once, which is returned and
+        overwritten by the next call. `observe` hands out copies of its rows,
+        so they stay unchanged. The noise of the
+        neighbor and package features of all walkers is drawn with a single
+        call, in the same order as drawing it feature by feature.
+
+        alive, positions: the first two outputs of `hull_states`, which is
+        called when they are not given
+        """
+        if alive is None or positions is None:
+            alive, positions, _ = self.hull_states()
+
+        obs = self.obs_buffer
+        obs.fill(0.0)
+        cast_lidar = self.observation_count % self.lidar_interval == 0
+        self.observation_count += 1
+        for walker, walker_alive, walker_obs in zip(self.walkers, alive, obs):
+            if walker_alive:
+                walker.write_observation(walker_obs, cast_lidar)
+
+        # Relative positions of the left neighbor, the right neighbor and
+        # the package, then the package angle. Features of missing neighbors
+        # and of fallen walkers are zero and do not draw noise.
+        features = np.zeros((self.n_walkers, 7))
+        noisy = np.zeros((self.n_walkers, 7), dtype=bool)
+        neighbors = alive[:-1] & alive[1:]
+        features[1:, 0:2] = (positions[:-1] - positions[1:]) / self.package_length
+        noisy[1:, 0:2] = neighbors[:, None]
+        features[:-1, 2:4] = (positions[1:] - positions[:-1]) / self.package_length
+        noisy[:-1, 2:4] = neighbors[:, None]
+        package_position = np.array([self.package.position.x, self.package.position.y])
+        features[:, 4:6] = (package_position - positions) / self.package_length
+        features[:, 6] = self.package.angle
+        noisy[:, 4:] = alive[:, None]
+
+        scale = np.array([self.position_noise] * 6 + [self.angle_noise])
+        noise = np.zeros((self.n_walkers, 7))
+        noise[noisy] = self.np_random.standard_normal(np.count_nonzero(noisy))
+        obs[:, 24:] = np.where(noisy, features + scale * noise, 0.0)
+
+        return obs
+
     def step(self, action, agent_id, is_last):
         # action is array of size 4
         action = action.reshape(4)
         assert self.walkers[agent_id].hull is not None, agent_id
         self.walkers[agent_id].apply_action(action)
         if is_last:
-            self.world.Step(1.0 / FPS, 6 * 30, 2 * 30)
-            rewards, done, mod_obs = self.scroll_subroutine()
+            rewards = np.zeros(self.n_walkers)
+            done = [False] * self.n_walkers
+            for frame in range(self.frame_skip):
+                self.world.Step(1.0 / FPS, 6 * 30, 2 * 30)
+                # Only the observations of the last frame are read
+                frame_rewards, frame_done, mod_obs = self.scroll_subroutine(
+                    observe=frame == self.frame_skip - 1
+                )
+                # Walkers done in an earlier frame get no more rewards, as
+                # they would not without frame skipping, so that a fall is
+                # only penalized once
+                rewards += np.where(done, 0.0, frame_rewards)
+                done = [d or frame_d for d, frame_d in zip(done, frame_done)]
+                if all(frame_done):
+                    break
             self.last_obs = mod_obs
             global_reward = rewards.mean()
             local_reward = rewards * self.local_ratio
@@ -541,17 +701,15 @@ class MultiWalkerEnv:
         return dict(zip(list(range(self.n_walkers)), self.last_dones))
 
     def get_last_obs(self):
-        return dict(
-            zip(
-                list(range(self.n_walkers)),
-                [walker.get_observation() for walker in self.walkers],
-            )
-        )
+        # The readings of the last lidar scan are used, so that querying the
+        # state does not change the readings held for the observations
+        walker_obs = np.zeros((self.n_walkers, 24))
+        for walker, out in zip(self.walkers, walker_obs):
+            walker.write_observation(out, cast_lidar=False)
+        return dict(zip(list(range(self.n_walkers)), walker_obs))
 
     def observe(self, agent):
-        o = self.last_obs[agent]
-        o = np.array(o, dtype=np.float32)
-        return o
+        return self.last_obs[agent].copy()
 
     def state(self):
         all_walker_obs = self.get_last_obs()
@@ -717,11 +875,13 @@ class MultiWalkerEnv:
                 np.array(pygame.surfarray.pixels3d(self.screen)), axes=(1, 0, 2)
             )
 
+    def package_position(self):
+        """Initial position of the package, centered above the walkers."""
+        return np.mean(self.start_x), TERRAIN_HEIGHT + 3 * LEG_H
+
     def _generate_package(self):
-        init_x = np.mean(self.start_x)
-        init_y = TERRAIN_HEIGHT + 3 * LEG_H
         self.package = self.world.CreateDynamicBody(
-            position=(init_x, init_y),
+            position=self.package_position(),
             fixtures=fixtureDef(
                 shape=polygonShape(
                     vertices=[
@@ -739,7 +899,46 @@ class MultiWalkerEnv:
         self.package.color1 = (127, 102, 229)
         self.package.color2 = (76, 76, 127)
 
-    def _generate_terrain(self, hardcore):
+    def _swap_terrain(self):
+        """Activate a terrain drawn from the terrain bank, which is generated by the first reset."""
+        if self.terrain_bank is None:
+            self.terrain_bank = self._generate_terrain_bank()
+        else:
+            for t in self.terrain:
+                t.active = False
+        (
+            self.terrain,
+            self.terrain_x,
+            self.terrain_y,
+            self.terrain_poly,
+            self.cloud_poly,
+        ) = self.terrain_bank[self.np_random.integers(self.terrain_bank_size)]
+        for t in self.terrain:
+            t.active = True
+
+    def _generate_terrain_bank(self):
+        """Generate `terrain_bank_size` inactive terrains and their clouds from `terrain_seed`."""
+        np_random, _ = seeding.np_random(self.terrain_seed)
+        bank = []
+        for _ in range(self.terrain_bank_size):
+            self._generate_terrain(self.hardcore, np_random)
+            self._generate_clouds(np_random)
+            for t in self.terrain:
+                t.active = False
+            bank.append(
+                (
+                    self.terrain,
+                    self.terrain_x,
+                    self.terrain_y,
+                    self.terrain_poly,
+                    self.cloud_poly,
+                )
+            )
+        return bank
+
+    def _generate_terrain(self, hardcore, np_random=None):
+        if np_random is None:
+            np_random = self.np_random
         GRASS, STUMP, STAIRS, PIT, _STATES_ = range(5)
         state = GRASS
         velocity = 0.0
@@ -756,11 +955,11 @@ class MultiWalkerEnv:
             if state == GRASS and not oneshot:
                 velocity = 0.8 * velocity + 0.01 * np.sign(TERRAIN_HEIGHT - y)
                 if i > TERRAIN_STARTPAD:
-                    velocity += self.np_random.uniform(-1, 1) / SCALE
+                    velocity += np_random.uniform(-1, 1) / SCALE
                 y += velocity
 
             elif state == PIT and oneshot:
-                counter = self.np_random.integers(3, 5)
+                counter = np_random.integers(3, 5)
                 poly = [
                     (x, y),
                     (x + TERRAIN_STEP, y),
@@ -795,7 +994,7 @@ class MultiWalkerEnv:
                     y -= 4 * TERRAIN_STEP
 
             elif state == STUMP and oneshot:
-                counter = self.np_random.integers(1, 3)
+                counter = np_random.integers(1, 3)
                 poly = [
                     (x, y),
                     (x + counter * TERRAIN_STEP, y),
@@ -811,9 +1010,9 @@ class MultiWalkerEnv:
                 self.terrain.append(t)
 
             elif state == STAIRS and oneshot:
-                stair_height = +1 if self.np_random.random() > 0.5 else -1
-                stair_width = self.np_random.integers(4, 5)
-                stair_steps = self.np_random.integers(3, 5)
+                stair_height = +1 if np_random.random() > 0.5 else -1
+                stair_width = np_random.integers(4, 5)
+                stair_steps = np_random.integers(3, 5)
                 original_y = y
                 for s in range(stair_steps):
                     poly = [
@@ -852,9 +1051,9 @@ class MultiWalkerEnv:
             self.terrain_y.append(y)
             counter -= 1
             if counter == 0:
-                counter = self.np_random.integers(TERRAIN_GRASS / 2, TERRAIN_GRASS)
+                counter = np_random.integers(TERRAIN_GRASS / 2, TERRAIN_GRASS)
                 if state == GRASS and hardcore:
-                    state = self.np_random.integers(1, _STATES_)
+                    state = np_random.integers(1, _STATES_)
                     oneshot = True
                 else:
                     state = GRASS
@@ -878,20 +1077,22 @@ class MultiWalkerEnv:
             self.terrain_poly.append((poly, color))
         self.terrain.reverse()
 
-    def _generate_clouds(self):
+    def _generate_clouds(self, np_random=None):
         # Sorry for the clouds, couldn't resist
+        if np_random is None:
+            np_random = self.np_random
         self.cloud_poly = []
         for i in range(self.terrain_length // 20):
-            x = self.np_random.uniform(0, self.terrain_length) * TERRAIN_STEP
+            x = np_random.uniform(0, self.terrain_length) * TERRAIN_STEP
             y = VIEWPORT_H / SCALE * 3 / 4
             poly = [
                 (
                     x
                     + 15 * TERRAIN_STEP * math.sin(3.14 * 2 * a / 5)
-                    + self.np_random.uniform(0, 5 * TERRAIN_STEP),
+                    + np_random.uniform(0, 5 * TERRAIN_STEP),
                     y
                     + 5 * TERRAIN_STEP * math.cos(3.14 * 2 * a / 5)
-                    + self.np_random.uniform(0, 5 * TERRAIN_STEP),
+                    + np_random.uniform(0, 5 * TERRAIN_STEP),
                 )
                 for a in range(5)
             ]
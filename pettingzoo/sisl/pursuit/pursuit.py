@@ -38,7 +38,8 @@ Select different pursuers with 'J' and 'K'. The selected pursuer can be moved wi
 ``` python
 pursuit_v4.env(max_cycles=500, x_size=16, y_size=16, shared_reward=True, n_evaders=30,
 n_pursuers=8,obs_range=7, n_catch=2, freeze_evaders=False, tag_reward=0.01,
-catch_reward=5.0, urgency_reward=-0.1, surround=True, constraint_window=1.0)
+catch_reward=5.0, urgency_reward=-0.1, surround=True, constraint_window=1.0,
+map_type="rectangle", map_seed=0, sparse_layers=False)
 ```
 
 `x_size, y_size`: Size of environment world space
@@ -67,6 +68,13 @@ catch_reward=5.0, urgency_reward=-0.1, surround=True, constraint_window=1.0)
 
 `max_cycles`:  After max_cycles steps all agents will return done
 
+`map_type`:  Layout of the buildings, either `"rectangle"` (one building in the center), `"complex"` (five fixed buildings) or `"multi_scale"` (procedurally generated buildings of several sizes). Maps are built once per configuration and shared by all environments using it
+
+`map_seed`:  Seed of the procedurally generated `"multi_scale"` map
+
+`sparse_layers`:  Whether agents are only stored as coordinates, without dense layers of the whole map that are updated every step.
+Observations and rewards are unchanged, which makes it the better choice for very large maps such as 2048 x 2048. The dense `model_state` is then not available to the pursuer and evader controllers
+
 
 ### Version History
 
@@ -78,7 +86,6 @@ catch_reward=5.0, urgency_reward=-0.1, surround=True, constraint_window=1.0)
 
 """
 
-import numpy as np
 import pygame
 from gymnasium.utils import EzPickle
 
@@ -160,11 +167,13 @@ class raw_env(AECEnv, EzPickle):
         self.env.step(
             action, self.agent_name_mapping[agent], self._agent_selector.is_last()
         )
+        truncation = self.env.frames >= self.env.max_cycles
+        termination = self.env.is_terminal
         for k in self.terminations:
-            if self.env.frames >= self.env.max_cycles:
+            if truncation:
                 self.truncations[k] = True
             else:
-                self.terminations[k] = self.env.is_terminal
+                self.terminations[k] = termination
         for k in self.agents:
             self.rewards[k] = self.env.latest_reward_state[self.agent_name_mapping[k]]
         self.steps += 1
@@ -177,8 +186,7 @@ class raw_env(AECEnv, EzPickle):
             self.render()
 
     def observe(self, agent):
-        o = self.env.safely_observe(self.agent_name_mapping[agent])
-        return np.swapaxes(o, 2, 0)
+        return self.env.observe(self.agent_name_mapping[agent])
 
     def observation_space(self, agent: str):
         return self.observation_spaces[agent]
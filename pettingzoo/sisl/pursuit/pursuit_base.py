@@ -1,4 +1,4 @@
-from collections import defaultdict
+from functools import lru_cache
 from typing import Optional
 
 import gymnasium
@@ -6,9 +6,10 @@ import numpy as np
 import pygame
 from gymnasium import spaces
 from gymnasium.utils import seeding
+from scipy.ndimage import convolve, correlate
 
 from pettingzoo.sisl.pursuit.utils import agent_utils, two_d_maps
-from pettingzoo.sisl.pursuit.utils.agent_layer import AgentLayer
+from pettingzoo.sisl.pursuit.utils.agent_layer import ArrayAgentLayer
 from pettingzoo.sisl.pursuit.utils.controllers import (
     PursuitPolicy,
     RandomPolicy,
@@ -16,6 +17,21 @@ from pettingzoo.sisl.pursuit.utils.controllers import (
 )
 
 
+@lru_cache(maxsize=8)
+def _cached_map(map_type, x_size, y_size, map_seed):
+    """Builds a map once per configuration, shared read only by all envs using it."""
+    if map_type == "rectangle":
+        map_matrix = two_d_maps.rectangle_map(x_size, y_size)
+    elif map_type == "complex":
+        map_matrix = two_d_maps.complex_map(x_size, y_size)
+    else:
+        map_matrix = two_d_maps.multi_scale_map(
+            x_size, y_size, np.random.default_rng(map_seed)
+        )
+    map_matrix.setflags(write=False)
+    return map_matrix
+
+
 class Pursuit:
     def __init__(
         self,
@@ -36,6 +52,9 @@ class Pursuit:
         surround: bool = True,
         render_mode=None,
         constraint_window: float = 1.0,
+        map_type: str = "rectangle",
+        map_seed: int = 0,
+        sparse_layers: bool = False,
     ):
         """In evade pursuit a set of pursuers must 'tag' a set of evaders.
 
@@ -58,10 +77,21 @@ class Pursuit:
         urgency_reward: reward added in each step
         surround: toggles surround condition for evader removal
         constraint_window: window in which agents can randomly spawn
+        map_type: "rectangle", "complex" or procedurally generated "multi_scale" buildings
+        map_seed: seed of the procedurally generated map
+        sparse_layers: keep agents only as coordinates, without dense layers of the map
         """
+        assert map_type in (
+            "rectangle",
+            "complex",
+            "multi_scale",
+        ), "map_type must be 'rectangle', 'complex' or 'multi_scale'"
         self.x_size = x_size
         self.y_size = y_size
-        self.map_matrix = two_d_maps.rectangle_map(self.x_size, self.y_size)
+        self.map_type = map_type
+        self.map_seed = map_seed
+        self.map_matrix = _cached_map(map_type, x_size, y_size, map_seed)
+        self.sparse_layers = sparse_layers
         self.max_cycles = max_cycles
         self._seed()
 
@@ -80,16 +110,23 @@ class Pursuit:
         self.obs_range = obs_range
         # assert self.obs_range % 2 != 0, "obs_range should be odd"
         self.obs_offset = int((self.obs_range - 1) / 2)
-        self.pursuers = agent_utils.create_agents(
-            self.n_pursuers, self.map_matrix, self.obs_range, self.np_random
+        self.pursuer_layer = ArrayAgentLayer(
+            x_size,
+            y_size,
+            self.map_matrix,
+            agent_utils.create_positions(
+                self.n_pursuers, self.map_matrix, self.np_random
+            ),
         )
-        self.evaders = agent_utils.create_agents(
-            self.n_evaders, self.map_matrix, self.obs_range, self.np_random
+        self.evader_layer = ArrayAgentLayer(
+            x_size,
+            y_size,
+            self.map_matrix,
+            agent_utils.create_positions(
+                self.n_evaders, self.map_matrix, self.np_random
+            ),
         )
 
-        self.pursuer_layer = AgentLayer(x_size, y_size, self.pursuers)
-        self.evader_layer = AgentLayer(x_size, y_size, self.evaders)
-
         self.n_catch = n_catch
 
         n_act_purs = self.pursuer_layer.get_nactions(0)
@@ -120,8 +157,6 @@ class Pursuit:
                 else pursuer_controller
             )
 
-        self.current_agent_layer = np.zeros((x_size, y_size), dtype=np.int32)
-
         self.tag_reward = tag_reward
 
         self.catch_reward = catch_reward
@@ -150,11 +185,72 @@ class Pursuit:
 
         self.render_mode = render_mode
         self.screen = None
+        self._clear_render_cache()
         self.constraint_window = constraint_window
 
         self.surround_mask = np.array([[-1, 0], [1, 0], [0, 1], [0, -1]])
+        # the surround mask as a 3x3 kernel centered on the evader cell
+        self._surround_kernel = np.zeros((3, 3), dtype=np.int32)
+        self._surround_kernel[
+            1 + self.surround_mask[:, 0], 1 + self.surround_mask[:, 1]
+        ] = 1
+        if self.sparse_layers:
+            # agents are only stored as coordinates, and walls are observed from
+            # the map padded by obs_offset on every side
+            self._surround_need = None
+            self._padded_state = None
+            self.model_state = None
+            self._padded_map = np.ones(
+                (self.x_size + 2 * self.obs_offset, self.y_size + 2 * self.obs_offset),
+                dtype=np.uint8,
+            )
+            self._padded_map[
+                self.obs_offset : self.obs_offset + self.x_size,
+                self.obs_offset : self.obs_offset + self.y_size,
+            ] = (
+                self.map_matrix == -1
+            )
+        else:
+            # the map is static, so the number of cells to surround is computed once
+            self._surround_need = self.need_to_surround_map()
 
-        self.model_state = np.zeros((4,) + self.map_matrix.shape, dtype=np.float32)
+            # the model state is the interior of a state padded by obs_offset on
+            # every side, where the padding is wall (-1) in the map channel, so
+            # observation windows never need to be clipped at the map borders
+            self._padded_state = np.zeros(
+                (
+                    4,
+                    self.x_size + 2 * self.obs_offset,
+                    self.y_size + 2 * self.obs_offset,
+                ),
+                dtype=np.float32,
+            )
+            self._padded_state[0] = -1
+            self.model_state = self._padded_state[
+                :,
+                self.obs_offset : self.obs_offset + self.x_size,
+                self.obs_offset : self.obs_offset + self.y_size,
+            ]
+            self.model_state[0] = self.map_matrix
+            # channel last view of the padded state, to gather the windows of all
+            # pursuers in one indexing operation
+            self._padded_state_channels_last = np.moveaxis(
+                self._padded_state[0:3], 0, -1
+            )
+        # offsets of the cells of an observation window
+        self._obs_window = 2 * self.obs_offset + 1
+        self._obs_grid = np.arange(self._obs_window)
+        # preallocated observations of all pursuers, laid out as (y, x, channel) like
+        # the observations of the AEC env. With an even obs_range, the last row and
+        # column are outside of the window and always observed as walls
+        self._obs_batch = np.zeros(
+            (self.n_pursuers, self.obs_range, self.obs_range, 3), dtype=np.float32
+        )
+        self._obs_batch[..., 0] = 1.0
+        # the state changes on every step, observations are batched per state version
+        self._state_version = 0
+        self._observed_version = -1
+        self._batch_version = -1
         self.pixel_scale = 30
 
         self.frames = 0
@@ -170,6 +266,7 @@ class Pursuit:
         if self.screen is not None:
             pygame.quit()
             self.screen = None
+            self._clear_render_cache()
 
     #################################################################
     # The functions below are the interface with MultiAgentSiulator #
@@ -177,7 +274,7 @@ class Pursuit:
 
     @property
     def agents(self):
-        return self.pursuers
+        return self.pursuer_layer
 
     def _seed(self, seed=None):
         self.np_random, seed_ = seeding.np_random(seed)
@@ -198,6 +295,7 @@ class Pursuit:
 
     def reset(self):
         self.evaders_gone.fill(False)
+        self._map_surface = None
 
         x_window_start = self.np_random.uniform(0.0, 1.0 - self.constraint_window)
         y_window_start = self.np_random.uniform(0.0, 1.0 - self.constraint_window)
@@ -209,67 +307,86 @@ class Pursuit:
         )
         constraints = [[xlb, xub], [ylb, yub]]
 
-        self.pursuers = agent_utils.create_agents(
+        pursuer_positions = agent_utils.create_positions(
             self.n_pursuers,
             self.map_matrix,
-            self.obs_range,
             self.np_random,
             randinit=True,
             constraints=constraints,
         )
-        self.pursuer_layer = AgentLayer(self.x_size, self.y_size, self.pursuers)
+        self.pursuer_layer = ArrayAgentLayer(
+            self.x_size, self.y_size, self.map_matrix, pursuer_positions
+        )
 
-        self.evaders = agent_utils.create_agents(
+        evader_positions = agent_utils.create_positions(
             self.n_evaders,
             self.map_matrix,
-            self.obs_range,
             self.np_random,
             randinit=True,
             constraints=constraints,
         )
-        self.evader_layer = AgentLayer(self.x_size, self.y_size, self.evaders)
+        self.evader_layer = ArrayAgentLayer(
+            self.x_size, self.y_size, self.map_matrix, evader_positions
+        )
 
         self.latest_reward_state = [0 for _ in range(self.num_agents)]
         self.latest_done_state = [False for _ in range(self.num_agents)]
         self.latest_obs = [None for _ in range(self.num_agents)]
 
-        self.model_state[0] = self.map_matrix
-        self.model_state[1] = self.pursuer_layer.get_state_matrix()
-        self.model_state[2] = self.evader_layer.get_state_matrix()
+        if not self.sparse_layers:
+            self.model_state[1] = self.pursuer_layer.get_state_matrix()
+            self.model_state[2] = self.evader_layer.get_state_matrix()
+        self._tag_rewards = self.reward()
 
         self.frames = 0
+        self._state_version += 1
 
         return self.safely_observe(0)
 
     def step(self, action, agent_id, is_last):
+        self._state_version += 1
         agent_layer = self.pursuer_layer
         opponent_layer = self.evader_layer
         opponent_controller = self.evader_controller
 
         # actual action application, change the pursuer layer
+        x, y = agent_layer.get_position(agent_id).tolist()
         agent_layer.move_agent(agent_id, action)
 
-        # Update only the pursuer layer
-        self.model_state[1] = self.pursuer_layer.get_state_matrix()
+        # Update only the cells of the pursuer layer that the pursuer left and entered
+        if not self.sparse_layers:
+            self.model_state[1, x, y] -= 1
+            x, y = agent_layer.get_position(agent_id).tolist()
+            self.model_state[1, x, y] += 1
 
-        self.latest_reward_state = self.reward() / self.num_agents
+        # evaders only move at the end of a cycle, so only the reward of the
+        # moving pursuer changes until then
+        self._tag_rewards[agent_id] = (
+            self.tag_reward
+            * self.count_tags(agent_layer.get_position(agent_id)[None])[0]
+        )
+        self.latest_reward_state = self._tag_rewards / self.num_agents
 
         if is_last:
             # Possibly change the evader layer
             ev_remove, pr_remove, pursuers_who_remove = self.remove_agents()
 
-            for i in range(opponent_layer.n_agents()):
-                # controller input should be an observation, but doesn't matter right now
-                a = opponent_controller.act(self.model_state)
-                opponent_layer.move_agent(i, a)
+            # controller input should be an observation, but doesn't matter right now
+            actions = opponent_controller.act_all(
+                self.model_state, opponent_layer.n_agents()
+            )
+            opponent_layer.move_all(actions)
 
             self.latest_reward_state += self.catch_reward * pursuers_who_remove
             self.latest_reward_state += self.urgency_reward
             self.frames = self.frames + 1
 
-        # Update the remaining layers
-        self.model_state[0] = self.map_matrix
-        self.model_state[2] = self.evader_layer.get_state_matrix()
+        if is_last:
+            # Update the evader layer, the map layer is static
+            if not self.sparse_layers:
+                self.model_state[2] = self.evader_layer.get_state_matrix()
+            # the evaders moved, recompute the rewards of all pursuers once per cycle
+            self._tag_rewards = self.reward()
 
         global_val = self.latest_reward_state.mean()
         local_val = self.latest_reward_state
@@ -280,42 +397,50 @@ class Pursuit:
         if self.render_mode == "human":
             self.render()
 
+    def _clear_render_cache(self):
+        # static surfaces reused across frames, built on first use
+        self._map_surface = None
+        self._obs_patch = None
+        self._count_font = None
+        self._count_texts = {}
+
     def draw_model_state(self):
-        # -1 is building pixel flag
-        x_len, y_len = self.model_state[0].shape
-        for x in range(x_len):
-            for y in range(y_len):
-                pos = pygame.Rect(
-                    self.pixel_scale * x,
-                    self.pixel_scale * y,
-                    self.pixel_scale,
-                    self.pixel_scale,
-                )
-                col = (0, 0, 0)
-                if self.model_state[0][x][y] == -1:
-                    col = (255, 255, 255)
-                pygame.draw.rect(self.screen, col, pos)
+        # the map is static, so it is drawn once per reset and blitted every frame
+        if self._map_surface is None:
+            # -1 is building pixel flag
+            buildings = np.where(self.map_matrix == -1, 255, 0).astype(np.uint8)
+            pixels = np.kron(
+                buildings, np.ones((self.pixel_scale, self.pixel_scale), np.uint8)
+            )
+            self._map_surface = pygame.surfarray.make_surface(
+                np.repeat(pixels[:, :, None], 3, axis=2)
+            )
+        self.screen.blit(self._map_surface, (0, 0))
 
     def draw_pursuers_observations(self):
-        for i in range(self.pursuer_layer.n_agents()):
-            x, y = self.pursuer_layer.get_position(i)
-            patch = pygame.Surface(
+        if self._obs_patch is None:
+            self._obs_patch = pygame.Surface(
                 (self.pixel_scale * self.obs_range, self.pixel_scale * self.obs_range)
             )
-            patch.set_alpha(128)
-            patch.fill((255, 152, 72))
-            ofst = self.obs_range / 2.0
-            self.screen.blit(
-                patch,
+            self._obs_patch.set_alpha(128)
+            self._obs_patch.fill((255, 152, 72))
+        ofst = self.obs_range / 2.0
+        self.screen.blits(
+            [
                 (
-                    self.pixel_scale * (x - ofst + 1 / 2),
-                    self.pixel_scale * (y - ofst + 1 / 2),
-                ),
-            )
+                    self._obs_patch,
+                    (
+                        self.pixel_scale * (x - ofst + 1 / 2),
+                        self.pixel_scale * (y - ofst + 1 / 2),
+                    ),
+                )
+                for x, y in self.pursuer_layer.get_positions().tolist()
+            ],
+            doreturn=False,
+        )
 
     def draw_pursuers(self):
-        for i in range(self.pursuer_layer.n_agents()):
-            x, y = self.pursuer_layer.get_position(i)
+        for x, y in self.pursuer_layer.get_positions().tolist():
             center = (
                 int(self.pixel_scale * x + self.pixel_scale / 2),
                 int(self.pixel_scale * y + self.pixel_scale / 2),
@@ -324,8 +449,7 @@ class Pursuit:
             pygame.draw.circle(self.screen, col, center, int(self.pixel_scale / 3))
 
     def draw_evaders(self):
-        for i in range(self.evader_layer.n_agents()):
-            x, y = self.evader_layer.get_position(i)
+        for x, y in self.evader_layer.get_positions().tolist():
             center = (
                 int(self.pixel_scale * x + self.pixel_scale / 2),
                 int(self.pixel_scale * y + self.pixel_scale / 2),
@@ -334,56 +458,36 @@ class Pursuit:
 
             pygame.draw.circle(self.screen, col, center, int(self.pixel_scale / 3))
 
-    def draw_agent_counts(self):
-        font = pygame.font.SysFont("Comic Sans MS", self.pixel_scale * 2 // 3)
-
-        agent_positions = defaultdict(int)
-        evader_positions = defaultdict(int)
-
-        for i in range(self.evader_layer.n_agents()):
-            x, y = self.evader_layer.get_position(i)
-            evader_positions[(x, y)] += 1
-
-        for i in range(self.pursuer_layer.n_agents()):
-            x, y = self.pursuer_layer.get_position(i)
-            agent_positions[(x, y)] += 1
+    def _count_text(self, agent_count, color):
+        # the few possible count texts are rendered once and reused
+        key = (min(agent_count, 10), color)
+        if key not in self._count_texts:
+            if self._count_font is None:
+                self._count_font = pygame.font.SysFont(
+                    "Comic Sans MS", self.pixel_scale * 2 // 3
+                )
+            count_text = str(agent_count) if agent_count < 10 else "+"
+            self._count_texts[key] = self._count_font.render(count_text, False, color)
+        return self._count_texts[key]
 
-        for x, y in evader_positions:
+    def draw_agent_counts(self):
+        # every occupied cell is labelled once with the number of agents on it
+        evader_counts = self.evader_layer.get_state_matrix()
+        for x, y in np.argwhere(evader_counts).tolist():
             (pos_x, pos_y) = (
                 self.pixel_scale * x + self.pixel_scale // 2,
                 self.pixel_scale * y + self.pixel_scale // 2,
             )
-
-            agent_count = evader_positions[(x, y)]
-            count_text: str
-            if agent_count < 1:
-                count_text = ""
-            elif agent_count < 10:
-                count_text = str(agent_count)
-            else:
-                count_text = "+"
-
-            text = font.render(count_text, False, (0, 255, 255))
-
+            text = self._count_text(int(evader_counts[x, y]), (0, 255, 255))
             self.screen.blit(text, (pos_x, pos_y))
 
-        for x, y in agent_positions:
+        agent_counts = self.pursuer_layer.get_state_matrix()
+        for x, y in np.argwhere(agent_counts).tolist():
             (pos_x, pos_y) = (
                 self.pixel_scale * x + self.pixel_scale // 2,
                 self.pixel_scale * y + self.pixel_scale // 2,
             )
-
-            agent_count = agent_positions[(x, y)]
-            count_text: str
-            if agent_count < 1:
-                count_text = ""
-            elif agent_count < 10:
-                count_text = str(agent_count)
-            else:
-                count_text = "+"
-
-            text = font.render(count_text, False, (255, 255, 0))
-
+            text = self._count_text(int(agent_counts[x, y]), (255, 255, 0))
             self.screen.blit(text, (pos_x, pos_y - self.pixel_scale // 2))
 
     def render(self):
@@ -438,28 +542,23 @@ class Pursuit:
         pygame.image.save(subcapture, file_name)
 
     def reward(self):
-        es = self.evader_layer.get_state_matrix()  # evader positions
-        rewards = [
-            self.tag_reward
-            * np.sum(
-                es[
-                    np.clip(
-                        self.pursuer_layer.get_position(i)[0]
-                        + self.surround_mask[:, 0],
-                        0,
-                        self.x_size - 1,
-                    ),
-                    np.clip(
-                        self.pursuer_layer.get_position(i)[1]
-                        + self.surround_mask[:, 1],
-                        0,
-                        self.y_size - 1,
-                    ),
-                ]
-            )
-            for i in range(self.n_pursuers)
-        ]
-        return np.array(rewards)
+        return self.tag_reward * self.count_tags(self.pursuer_layer.get_positions())
+
+    def count_tags(self, positions):
+        """Counts the evaders around each of the given (n, 2) positions.
+
+        Neighbors outside of the map are clipped to the map border.
+        """
+        xs = np.clip(
+            positions[:, 0, None] + self.surround_mask[:, 0], 0, self.x_size - 1
+        )
+        ys = np.clip(
+            positions[:, 1, None] + self.surround_mask[:, 1], 0, self.y_size - 1
+        )
+        if self.sparse_layers:
+            return self.evader_layer.count_at(xs, ys).sum(axis=1, dtype=np.float64)
+        es = self.model_state[2]  # evader positions
+        return es[xs, ys].sum(axis=1, dtype=np.float64)
 
     @property
     def is_terminal(self):
@@ -484,10 +583,8 @@ class Pursuit:
         return obs
 
     def collect_obs(self, agent_layer, i):
-        for j in range(self.n_agents()):
-            if i == j:
-                return self.collect_obs_by_idx(agent_layer, i)
-        assert False, "bad index"
+        assert 0 <= i < self.n_agents(), "bad index"
+        return self.collect_obs_by_idx(agent_layer, i)
 
     def collect_obs_by_idx(self, agent_layer, agent_idx):
         # returns a flattened array of all the observations
@@ -495,11 +592,60 @@ class Pursuit:
         obs[0].fill(1.0)  # border walls set to -0.1?
         xp, yp = agent_layer.get_position(agent_idx)
 
-        xlo, xhi, ylo, yhi, xolo, xohi, yolo, yohi = self.obs_clip(xp, yp)
-
-        obs[0:3, xolo:xohi, yolo:yohi] = np.abs(self.model_state[0:3, xlo:xhi, ylo:yhi])
+        w = self._obs_window
+        if self.sparse_layers:
+            window = np.moveaxis(obs, 0, -1).swapaxes(0, 1)[None]
+            self._fill_sparse_windows(window, np.array([[xp, yp]]))
+            return obs
+        # the window centered on (xp, yp) starts at (xp, yp) in the padded state
+        np.abs(self._padded_state[0:3, xp : xp + w, yp : yp + w], out=obs[:, :w, :w])
         return obs
 
+    def collect_all_obs(self):
+        """Returns the observations of all pursuers as an (n_pursuers, obs_range, obs_range, 3) array.
+
+        The windows of every pursuer are gathered from the padded model state in a
+        single indexing operation, into a preallocated buffer that is overwritten
+        on the next call.
+        """
+        positions = self.pursuer_layer.get_positions()
+        if self.sparse_layers:
+            self._fill_sparse_windows(self._obs_batch, positions)
+            return self._obs_batch
+        w = self._obs_window
+        xs = positions[:, 0, None, None] + self._obs_grid[None, None, :]
+        ys = positions[:, 1, None, None] + self._obs_grid[None, :, None]
+        np.abs(self._padded_state_channels_last[xs, ys], out=self._obs_batch[:, :w, :w])
+        return self._obs_batch
+
+    def _fill_sparse_windows(self, out, positions):
+        # out is laid out as (n, y, x, channel), walls come from the padded map and
+        # agent counts from the agents found in each window
+        w = self._obs_window
+        xs = positions[:, 0, None, None] + self._obs_grid[None, None, :]
+        ys = positions[:, 1, None, None] + self._obs_grid[None, :, None]
+        out[:, :w, :w, 0] = self._padded_map[xs, ys]
+        out[:, :w, :w, 1:] = 0
+        for channel, layer in ((1, self.pursuer_layer), (2, self.evader_layer)):
+            window, dx, dy = layer.window_members(positions, self.obs_offset)
+            np.add.at(out, (window, dy, dx, channel), 1)
+
+    def observe(self, i):
+        """Returns the observation of pursuer i, laid out as (obs_range, obs_range, 3).
+
+        AEC loops observe a single pursuer between two steps, so the first
+        observation of a state is extracted on its own. Once a second pursuer
+        observes the same state, as in parallel loops, the windows of all
+        pursuers are gathered at once and served from the batch.
+        """
+        if self._batch_version != self._state_version:
+            if self._observed_version != self._state_version:
+                self._observed_version = self._state_version
+                return np.swapaxes(self.safely_observe(i), 2, 0)
+            self.collect_all_obs()
+            self._batch_version = self._state_version
+        return self._obs_batch[i].copy()
+
     def obs_clip(self, x, y):
         xld = x - self.obs_offset
         xhd = x + self.obs_offset
@@ -523,81 +669,90 @@ class Pursuit:
         Return tuple (n_evader_removed, n_pursuer_removed, purs_sur)
         purs_sur: bool array, which pursuers surrounded an evader
         """
-        n_pursuer_removed = 0
-        n_evader_removed = 0
-        removed_evade = []
-        removed_pursuit = []
-
-        ai = 0
-        rems = 0
-        xpur, ypur = np.nonzero(self.model_state[1])
-        purs_sur = np.zeros(self.n_pursuers, dtype=bool)
-        for i in range(self.n_evaders):
-            if self.evaders_gone[i]:
-                continue
-            x, y = self.evader_layer.get_position(ai)
-            if self.surround:
-                pos_that_catch = self.surround_mask + self.evader_layer.get_position(ai)
-                truths = np.array(
-                    [
-                        np.equal([xi, yi], pos_that_catch).all(axis=1)
-                        for xi, yi in zip(xpur, ypur)
-                    ]
-                )
-                if np.sum(truths.any(axis=0)) == self.need_to_surround(x, y):
-                    removed_evade.append(ai - rems)
-                    self.evaders_gone[i] = True
-                    rems += 1
-                    tt = truths.any(axis=1)
-                    for j in range(self.n_pursuers):
-                        xpp, ypp = self.pursuer_layer.get_position(j)
-                        tes = np.concatenate((xpur[tt], ypur[tt])).reshape(
-                            2, len(xpur[tt])
-                        )
-                        tem = tes.T == np.array([xpp, ypp])
-                        if np.any(np.all(tem, axis=1)):
-                            purs_sur[j] = True
-                ai += 1
-            else:
-                if self.model_state[1, x, y] >= self.n_catch:
-                    # add prob remove?
-                    removed_evade.append(ai - rems)
-                    self.evaders_gone[i] = True
-                    rems += 1
-                    for j in range(self.n_pursuers):
-                        xpp, ypp = self.pursuer_layer.get_position(j)
-                        if xpp == x and ypp == y:
-                            purs_sur[j] = True
-                ai += 1
-
-        ai = 0
-        for i in range(self.pursuer_layer.n_agents()):
-            x, y = self.pursuer_layer.get_position(i)
-            # can remove pursuers probabilitcally here?
-        for ridx in removed_evade:
+        xe, ye = self.evader_layer.get_positions().T
+        xp, yp = self.pursuer_layer.get_positions().T
+        if self.sparse_layers:
+            purs_sur, caught = self._sparse_captures(xe, ye, xp, yp)
+        elif self.surround:
+            # number of neighbors of every cell occupied by at least one pursuer
+            occupied = (self.model_state[1] > 0).astype(np.int32)
+            n_surrounding = correlate(occupied, self._surround_kernel, mode="constant")
+            caught = n_surrounding[xe, ye] == self._surround_need[xe, ye]
+            # pursuers on a neighbor cell of any caught evader are credited
+            caught_cells = np.zeros(self.map_matrix.shape, dtype=np.int32)
+            caught_cells[xe[caught], ye[caught]] = 1
+            crediting_cells = convolve(
+                caught_cells, self._surround_kernel, mode="constant"
+            )
+        else:
+            caught = self.model_state[1, xe, ye] >= self.n_catch
+            # pursuers on the cell of any caught evader are credited
+            crediting_cells = np.zeros(self.map_matrix.shape, dtype=np.int32)
+            crediting_cells[xe[caught], ye[caught]] = 1
+        if not self.sparse_layers:
+            purs_sur = crediting_cells[xp, yp] > 0
+
+        removed_evade = np.flatnonzero(caught)
+        self.evaders_gone[np.flatnonzero(~self.evaders_gone)[removed_evade]] = True
+        # remove from the back so that the remaining indices stay valid
+        for ridx in removed_evade[::-1]:
             self.evader_layer.remove_agent(ridx)
-            n_evader_removed += 1
-        for ridx in removed_pursuit:
-            self.pursuer_layer.remove_agent(ridx)
-            n_pursuer_removed += 1
-        return n_evader_removed, n_pursuer_removed, purs_sur
+        return len(removed_evade), 0, purs_sur
+
+    def _sparse_captures(self, xe, ye, xp, yp):
+        # same rules as remove_agents, looking up pursuers by their coordinates
+        if self.surround:
+            xn = xe[:, None] + self.surround_mask[:, 0]
+            yn = ye[:, None] + self.surround_mask[:, 1]
+            inside = (0 <= xn) & (xn < self.x_size) & (0 <= yn) & (yn < self.y_size)
+            occupied = inside & (
+                self.pursuer_layer.count_at(
+                    np.clip(xn, 0, self.x_size - 1), np.clip(yn, 0, self.y_size - 1)
+                )
+                > 0
+            )
+            caught = occupied.sum(axis=1) == self.need_to_surround(xe, ye)
+            # pursuers on a neighbor cell of any caught evader are credited
+            crediting = inside[caught]
+            crediting_cells = (
+                xn[caught][crediting] * self.y_size + yn[caught][crediting]
+            )
+        else:
+            caught = self.pursuer_layer.count_at(xe, ye) >= self.n_catch
+            # pursuers on the cell of any caught evader are credited
+            crediting_cells = xe[caught] * self.y_size + ye[caught]
+        return np.isin(xp * self.y_size + yp, crediting_cells), caught
 
     def need_to_surround(self, x, y):
         """Compute the number of surrounding grid cells.
 
         Compute the number of surrounding grid cells in x,y position that are open
-        (no wall or obstacle)
+        (no wall or obstacle). x and y can also be arrays of positions. Only
+        neighbors away from the first row and column of the map are checked for
+        buildings.
         """
-        tosur = 4
-        if x == 0 or x == (self.x_size - 1):
-            tosur -= 1
-        if y == 0 or y == (self.y_size - 1):
-            tosur -= 1
-        neighbors = self.surround_mask + np.array([x, y])
-        for n in neighbors:
-            xn, yn = n
-            if not 0 < xn < self.x_size or not 0 < yn < self.y_size:
-                continue
-            if self.model_state[0][xn, yn] == -1:
-                tosur -= 1
+        tosur = (
+            4
+            - ((x == 0) | (x == self.x_size - 1))
+            - ((y == 0) | (y == self.y_size - 1))
+        )
+        for dx, dy in self.surround_mask:
+            xn, yn = x + dx, y + dy
+            inside = (0 < xn) & (xn < self.x_size) & (0 < yn) & (yn < self.y_size)
+            building = (
+                self.map_matrix[
+                    np.clip(xn, 0, self.x_size - 1), np.clip(yn, 0, self.y_size - 1)
+                ]
+                == -1
+            )
+            tosur = tosur - (inside & building)
         return tosur
+
+    def need_to_surround_map(self):
+        """Compute the number of surrounding grid cells of every position of the map.
+
+        Returns an (x_size, y_size) array of need_to_surround for every position.
+        """
+        return self.need_to_surround(
+            np.arange(self.x_size)[:, None], np.arange(self.y_size)[None, :]
+        )
@@ -1,6 +1,7 @@
-from pettingzoo.sisl.pursuit.utils.agent_layer import AgentLayer
+from pettingzoo.sisl.pursuit.utils.agent_layer import AgentLayer, ArrayAgentLayer
 from pettingzoo.sisl.pursuit.utils.agent_utils import (
     create_agents,
+    create_positions,
     feasible_position_exp,
     set_agents,
 )
@@ -37,6 +37,12 @@ class AgentLayer:
         """Returns the position of the given agent."""
         return self.allies[agent_idx].current_position()
 
+    def get_positions(self):
+        """Returns the positions of all allies as an (n_agents, 2) array."""
+        return np.array(
+            [ally.current_position() for ally in self.allies], dtype=np.int64
+        ).reshape(-1, 2)
+
     def get_nactions(self, agent_idx):
         return self.allies[agent_idx].nactions()
 
@@ -68,3 +74,150 @@ class AgentLayer:
             pos[idx : (idx + 2)] = ally.get_state()
             idx += 2
         return pos
+
+
+#################################################################
+# Implements the same layer with all agents stored in arrays
+#################################################################
+
+
+class ArrayAgentLayer:
+    # moves of the discrete actions: left, right, up, down and stay
+    motion_range = np.array([[-1, 0], [1, 0], [0, 1], [0, -1], [0, 0]])
+
+    def __init__(self, xs, ys, map_matrix, positions):
+        """Initializes the ArrayAgentLayer class.
+
+        xs: x size of map
+        ys: y size of map
+        map_matrix: map of the environment (-1 are buildings)
+        positions: (n_agents, 2) array of initial positions
+
+        Follows the dynamics of DiscreteAgent, with the positions of all agents in
+        one array. Agents are addressed by their index among the agents that have
+        not been removed, like in AgentLayer.
+        """
+        self.xs = xs
+        self.ys = ys
+        self.map_matrix = map_matrix
+        self.positions = np.array(positions, dtype=np.int32).reshape(-1, 2)
+        self.last_positions = self.positions.copy()
+        self.alive = np.ones(len(self.positions), dtype=bool)
+        self.terminal = np.zeros(len(self.positions), dtype=bool)
+        self.nagents = len(self.positions)
+        # dense count matrix, only allocated once asked for
+        self.global_state = None
+        self._alive_idx = np.arange(self.nagents)
+        # sorted cell ids (x * ys + y) of the agents, rebuilt after agents change
+        self._cells = None
+
+    def n_agents(self):
+        return self.nagents
+
+    def move_agent(self, agent_idx, action):
+        idx = self._alive_idx[agent_idx]
+        self._move(np.array([idx]), np.array([action]))
+        return self.positions[idx]
+
+    def move_all(self, actions):
+        """Moves all agents at once, actions holds one action per agent."""
+        self._move(self._alive_idx, np.asarray(actions))
+        return self.get_positions()
+
+    def _move(self, idx, actions):
+        pos = self.positions[idx]
+        # if in building, dead, and stay there
+        self.terminal[idx] |= self.map_matrix[pos[:, 0], pos[:, 1]] == -1
+        # transition is deterministic
+        new_pos = pos + self.motion_range[actions]
+        x, y = new_pos[:, 0], new_pos[:, 1]
+        inbounds = (0 <= x) & (x < self.xs) & (0 <= y) & (y < self.ys)
+        # if out of bounds or bumped into building, then stay
+        inbuilding = (
+            self.map_matrix[np.clip(x, 0, self.xs - 1), np.clip(y, 0, self.ys - 1)]
+            == -1
+        )
+        moved = inbounds & ~inbuilding & ~self.terminal[idx]
+        self.last_positions[idx[moved]] = pos[moved]
+        self.positions[idx[moved]] = new_pos[moved]
+        self._cells = None
+
+    def set_position(self, agent_idx, x, y):
+        self.positions[self._alive_idx[agent_idx]] = (x, y)
+        self._cells = None
+
+    def get_position(self, agent_idx):
+        """Returns the position of the given agent."""
+        return self.positions[self._alive_idx[agent_idx]]
+
+    def get_positions(self):
+        """Returns the positions of all agents as an (n_agents, 2) array."""
+        return self.positions[self._alive_idx]
+
+    def get_nactions(self, agent_idx):
+        return len(self.motion_range)
+
+    def remove_agent(self, agent_idx):
+        # idx is between zero and nagents
+        self.alive[self._alive_idx[agent_idx]] = False
+        self._alive_idx = np.flatnonzero(self.alive)
+        self.nagents -= 1
+        self._cells = None
+
+    def sorted_cells(self):
+        """Returns the sorted cell ids (x * ys + y) of all agents."""
+        if self._cells is None:
+            pos = self.get_positions()
+            self._cells = np.sort(pos[:, 0].astype(np.int64) * self.ys + pos[:, 1])
+        return self._cells
+
+    def count_at(self, x, y):
+        """Returns the number of agents at the given positions, which must be on the map."""
+        cells = self.sorted_cells()
+        ids = np.asarray(x, dtype=np.int64) * self.ys + y
+        return np.searchsorted(cells, ids, side="right") - np.searchsorted(
+            cells, ids, side="left"
+        )
+
+    def window_members(self, centers, offset):
+        """Finds the agents in the square windows reaching offset cells around the given (n, 2) centers.
+
+        Returns arrays (window, dx, dy) with one entry per agent in a window: the
+        index of the window, and the position of the agent relative to the lower
+        corner of the window. Every row of a window is one contiguous range of the
+        sorted cell ids, so no dense matrix is needed.
+        """
+        cells = self.sorted_cells()
+        w = 2 * offset + 1
+        centers = np.asarray(centers, dtype=np.int64)
+        rows = centers[:, 0, None] - offset + np.arange(w)
+        ylo = np.clip(centers[:, 1, None] - offset, 0, self.ys - 1)
+        yhi = np.clip(centers[:, 1, None] + offset, 0, self.ys - 1)
+        lo = np.searchsorted(cells, rows * self.ys + ylo, side="left")
+        hi = np.searchsorted(cells, rows * self.ys + yhi, side="right")
+        counts = np.where((0 <= rows) & (rows < self.xs), hi - lo, 0).ravel()
+        # expand every row range into the indices of the agents in it
+        ends = np.cumsum(counts)
+        found = cells[
+            np.repeat(lo.ravel() - ends + counts, counts) + np.arange(counts.sum())
+        ]
+        window = np.repeat(np.arange(counts.size) // w, counts)
+        x, y = np.divmod(found, self.ys)
+        return (
+            window,
+            x - centers[window, 0] + offset,
+            y - centers[window, 1] + offset,
+        )
+
+    def get_state_matrix(self):
+        """Returns a matrix with the number of agents at every (x, y) position."""
+        if self.global_state is None:
+            self.global_state = np.zeros((self.xs, self.ys), dtype=np.int32)
+        gs = self.global_state
+        gs.fill(0)
+        pos = self.get_positions()
+        np.add.at(gs, (pos[:, 0], pos[:, 1]), 1)
+        return gs
+
+    def get_state(self):
+        return self.get_positions().ravel().astype(np.float64)
@@ -25,9 +25,29 @@ def create_agents(
     """
     xs, ys = map_matrix.shape
     agents = []
-    expanded_mat = np.zeros((xs + 2, ys + 2))
+    positions = create_positions(
+        nagents, map_matrix, randomizer, randinit=randinit, constraints=constraints
+    )
+    for xinit, yinit in positions:
+        agent = DiscreteAgent(
+            xs, ys, map_matrix, randomizer, obs_range=obs_range, flatten=flatten
+        )
+        agent.set_position(xinit, yinit)
+        agents.append(agent)
+    return agents
+
+
+def create_positions(nagents, map_matrix, randomizer, randinit=False, constraints=None):
+    """Returns the initial positions of agents on a map (map_matrix) as an (nagents, 2) array.
+
+    -randinit: if True will place agents in random, feasible locations
+               if False will place all agents at 0
+    expanded_mat: This matrix is used to spawn non-adjacent agents
+    """
+    xs, ys = map_matrix.shape
+    positions = np.zeros((nagents, 2), dtype=np.int32)
+    expanded_mat = np.zeros((xs + 2, ys + 2), dtype=np.int8)
     for i in range(nagents):
-        xinit, yinit = (0, 0)
         if randinit:
             xinit, yinit = feasible_position_exp(
                 randomizer, map_matrix, expanded_mat, constraints=constraints
@@ -38,12 +58,8 @@ def create_agents(
             expanded_mat[xinit, yinit + 1] = -1
             expanded_mat[xinit + 1, yinit + 2] = -1
             expanded_mat[xinit + 1, yinit] = -1
-        agent = DiscreteAgent(
-            xs, ys, map_matrix, randomizer, obs_range=obs_range, flatten=flatten
-        )
-        agent.set_position(xinit, yinit)
-        agents.append(agent)
-    return agents
+            positions[i] = xinit, yinit
+    return positions
 
 
 def feasible_position_exp(randomizer, map_matrix, expanded_mat, constraints=None):
@@ -12,6 +12,9 @@ class PursuitPolicy(abc.ABC):
     def act(self, state: np.ndarray) -> int:
         raise NotImplementedError
 
+    def act_all(self, state: np.ndarray, n_agents: int) -> np.ndarray:
+        return np.array([self.act(state) for _ in range(n_agents)], dtype=np.int64)
+
 
 class RandomPolicy(PursuitPolicy):
     # constructor
@@ -25,6 +28,10 @@ class RandomPolicy(PursuitPolicy):
     def act(self, state):
         return self.rng.integers(self.n_actions)
 
+    def act_all(self, state, n_agents):
+        # draws the same actions as n_agents calls to act
+        return self.rng.integers(self.n_actions, size=n_agents)
+
 
 class SingleActionPolicy(PursuitPolicy):
     def __init__(self, a):
@@ -32,3 +39,6 @@ class SingleActionPolicy(PursuitPolicy):
 
     def act(self, state):
         return self.action
+
+    def act_all(self, state, n_agents):
+        return np.full(n_agents, self.action)
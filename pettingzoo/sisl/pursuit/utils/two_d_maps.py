@@ -9,13 +9,12 @@ def rectangle_map(xs, ys, xb=0.3, yb=0.2):
     xb and yb are buffers for each dim representing the raio of the map to leave open on each side
     """
     rmap = np.zeros((xs, ys), dtype=np.int32)
-    for i in range(xs):
-        for j in range(ys):
-            # are we in the rectnagle in x dim?
-            if (float(i) / xs) > xb and (float(i) / xs) < (1.0 - xb):
-                # are we in the rectangle in y dim?
-                if (float(j) / ys) > yb and (float(j) / ys) < (1.0 - yb):
-                    rmap[i, j] = -1  # -1 is building pixel flag
+    x = np.arange(xs) / xs
+    y = np.arange(ys) / ys
+    # are we in the rectangle in x dim and in y dim?
+    in_x = (x > xb) & (x < (1.0 - xb))
+    in_y = (y > yb) & (y < (1.0 - yb))
+    rmap[np.ix_(in_x, in_y)] = -1  # -1 is building pixel flag
     return rmap
 
 
@@ -46,11 +45,9 @@ def gen_map(
     ll, lu = length_bounds
     if gmap is None:
         gmap = np.zeros((xs, ys), dtype=np.int32)
-    for _ in range(n_obs):
-        xc = randomizer.uniform(cl, cu)
-        yc = randomizer.uniform(cl, cu)
-        xl = randomizer.uniform(ll, lu)
-        yl = randomizer.uniform(ll, lu)
+    # centers and lengths of all obstacles, drawn in the same order as one at a time
+    rects = randomizer.uniform([cl, cl, ll, ll], [cu, cu, lu, lu], size=(n_obs, 4))
+    for xc, yc, xl, yl in rects:
         gmap = add_rectangle(gmap, xc=xc, yc=yc, xl=xl, yl=yl)
     return gmap
 
@@ -91,12 +88,10 @@ def add_rectangle(input_map, xc, yc, xl, yl):
     # assert x_lbound >= 0 and x_upbound < xs, "Invalid rectangel config, x out of bounds"
     # assert y_lbound >= 0 and y_upbound < ys, "Invalid rectangel config, y out of bounds"
 
-    x_lbound, x_upbound = np.clip([x_lbound, x_upbound], 0, xs)
-    y_lbound, y_upbound = np.clip([y_lbound, y_upbound], 0, ys)
+    x_lbound, x_upbound = np.clip([int(x_lbound), int(x_upbound)], 0, xs)
+    y_lbound, y_upbound = np.clip([int(y_lbound), int(y_upbound)], 0, ys)
 
-    for i in range(x_lbound, x_upbound):
-        for j in range(y_lbound, y_upbound):
-            input_map[j, i] = -1
+    input_map[y_lbound:y_upbound, x_lbound:x_upbound] = -1
     return input_map
 
 
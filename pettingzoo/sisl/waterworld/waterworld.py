@@ -85,7 +85,8 @@ waterworld_v4.env(n_pursuers=5, n_evaders=5, n_poisons=10, n_coop=2, n_sensors=2
 sensor_range=0.2,radius=0.015, obstacle_radius=0.2, n_obstacles=1,
 obstacle_coord=[(0.5, 0.5)], pursuer_max_accel=0.01, evader_speed=0.01,
 poison_speed=0.01, poison_reward=-1.0, food_reward=10.0, encounter_reward=0.01,
-thrust_penalty=-0.5, local_ratio=1.0, speed_features=True, max_cycles=500)
+thrust_penalty=-0.5, local_ratio=1.0, speed_features=True, max_cycles=500,
+batch_collisions=False, physics_substeps=1, fast_reset=False)
 ```
 
 `n_pursuers`: number of pursuing archea (agents)
@@ -128,6 +129,14 @@ thrust_penalty=-0.5, local_ratio=1.0, speed_features=True, max_cycles=500)
 
 `max_cycles`: After max_cycles steps all agents will return done
 
+`batch_collisions`: whether collisions with food and poison are only recorded during the physics step and resolved together after it.
+Rewards and indicators are counted the same way, but respawned objects are placed in bulk and do not receive the contact impulses of the step they are consumed in, so trajectories differ from the default
+
+`physics_substeps`: number of physics steps each cycle is split into, trading throughput for a more accurate simulation
+
+`fast_reset`: whether resets keep the PyMunk space and its objects and only re-randomize them instead of rebuilding everything.
+The first episode is unchanged, but later episodes may resolve simultaneous collisions in a different order than a freshly built environment
+
 * v4: Major refactor (1.22.0)
 * v3: Refactor and major bug fixes (1.5.0)
 * v2: Misc bug fixes (1.4.0)
@@ -9,6 +9,9 @@ from gymnasium.utils import seeding
 from scipy.spatial import distance as ssd
 
 from pettingzoo.sisl.waterworld.waterworld_models import (
+    EVADER_TYPE,
+    POISON_TYPE,
+    PURSUER_TYPE,
     Evaders,
     Obstacle,
     Poisons,
@@ -17,6 +20,10 @@ from pettingzoo.sisl.waterworld.waterworld_models import (
 
 FPS = 15
 
+# Number of objects of one type above which the sensors only consider the
+# objects within their reach, see WaterworldBase._nearby_objects
+BROADPHASE_MIN_OBJECTS = 64
+
 
 class WaterworldBase:
     def __init__(
@@ -42,6 +49,9 @@ class WaterworldBase:
         local_ratio=1.0,
         speed_features=True,
         max_cycles=500,
+        batch_collisions=False,
+        physics_substeps=1,
+        fast_reset=False,
         render_mode=None,
         FPS=FPS,
     ):
@@ -67,12 +77,16 @@ class WaterworldBase:
         thrust_penalty: scaling factor for the negative reard used to penalize large actions
         local_ratio: proportion of reward allocated locally vs distributed globally among all agents
         speed_features: whether to include entity speed in the state space
+        batch_collisions: whether collision callbacks only record the contacts, which are resolved together after each physics step
+        physics_substeps: number of physics steps per cycle, more steps are more accurate but slower
+        fast_reset: whether resets keep the PyMunk space and objects and only re-randomize them
         """
         self.pixel_scale = 30 * 25
         self.clock = pygame.time.Clock()
         self.FPS = FPS  # Frames Per Second
 
         self.handlers = []
+        self.space = None
 
         self.n_coop = n_coop
         self.n_evaders = n_evaders
@@ -100,6 +114,11 @@ class WaterworldBase:
 
         self.max_cycles = max_cycles
 
+        assert physics_substeps >= 1, "physics_substeps must be at least 1"
+        self.batch_collisions = batch_collisions
+        self.physics_substeps = physics_substeps
+        self.fast_reset = fast_reset
+
         self.control_rewards = [0 for _ in range(self.n_pursuers)]
         self.behavior_rewards = [0 for _ in range(self.n_pursuers)]
 
@@ -140,6 +159,7 @@ class WaterworldBase:
             dtype=np.float32,
         )
 
+        self._obs_buffer = np.zeros((self.n_pursuers, obs_dim), dtype=np.float32)
         self.observation_space = [obs_space for i in range(self.n_pursuers)]
         self.action_space = [act_space for i in range(self.n_pursuers)]
 
@@ -163,12 +183,12 @@ class WaterworldBase:
                     self.pursuer_max_accel,
                     self.pursuer_speed,
                     radius=self.base_radius,
-                    collision_type=i + 1,
                     n_sensors=self.n_sensors,
                     sensor_range=self.sensor_range,
                     speed_features=self.speed_features,
                 )
             )
+            self.pursuers[-1].shape.index = i
 
         for i in range(self.n_evaders):
             x, y = self._generate_coord(2 * self.base_radius)
@@ -183,10 +203,10 @@ class WaterworldBase:
                     vx[0],
                     vy[0],
                     radius=2 * self.base_radius,
-                    collision_type=i + 1000,
                     max_speed=self.evader_speed,
                 )
             )
+            self.evaders[-1].shape.index = i
 
         for i in range(self.n_poisons):
             x, y = self._generate_coord(0.75 * self.base_radius)
@@ -201,10 +221,10 @@ class WaterworldBase:
                     vx[0],
                     vy[0],
                     radius=0.75 * self.base_radius,
-                    collision_type=i + 2000,
                     max_speed=self.poison_speed,
                 )
             )
+            self.poisons[-1].shape.index = i
 
         for _ in range(self.n_obstacles):
             self.obstacles.append(
@@ -215,6 +235,60 @@ class WaterworldBase:
                 )
             )
 
+    def reset_obj(self):
+        """Re-randomize all moving object instances in place.
+
+        This draws the same random numbers as `add_obj`, in bulk, and resets
+        the velocities, indicators and counters of the existing objects.
+        """
+        # Integrating over no time clears the bias velocities left on the
+        # bodies by the contact solver
+        for obj in self.pursuers + self.evaders + self.poisons:
+            pymunk.Body.update_position(obj.body, 0.0)
+
+        coords = self.np_random.random((self.n_pursuers, 2)) * self.pixel_scale
+        for pursuer, (x, y) in zip(self.pursuers, coords):
+            pursuer.reset_position(x, y)
+            pursuer.reset_velocity(0.0, 0.0)
+            pursuer.shape.food_indicator = 0
+            pursuer.shape.food_touched_indicator = 0
+            pursuer.shape.poison_indicator = 0
+
+        for objects, speed in [
+            (self.evaders, self.evader_speed),
+            (self.poisons, self.poison_speed),
+        ]:
+            # Position (x, y) and velocity (vx, vy) of each object
+            values = self.np_random.random((len(objects), 4))
+            coords = values[:, :2] * self.pixel_scale
+            velocities = (2 * values[:, 2:] - 1) * speed
+            for obj, (x, y), (vx, vy) in zip(objects, coords, velocities):
+                obj.reset_position(x, y)
+                obj.reset_velocity(vx, vy)
+
+        for evader in self.evaders:
+            evader.shape.counter = 0
+
+    def remove(self):
+        """Remove all objects from the PyMunk space.
+
+        Their cached contacts are discarded without calling the separate
+        callbacks, which are set again by `add_handlers`.
+        """
+        for handler in self.handlers:
+            handler.separate = self.return_none_callback
+
+        self.space.remove(*self.space_objects())
+
+    def space_objects(self):
+        """Bodies and shapes of all objects and the bounding box, in the order they are added to the space."""
+        return [
+            part
+            for obj_list in [self.pursuers, self.evaders, self.poisons, self.obstacles]
+            for obj in obj_list
+            for part in (obj.body, obj.shape)
+        ] + self.barriers
+
     def close(self):
         if self.screen is not None:
             pygame.quit()
@@ -312,75 +386,33 @@ class WaterworldBase:
                 obj.draw(self.screen, self.convert_coordinates)
 
     def add_handlers(self):
-        # Collision handlers for pursuers v.s. evaders & poisons
-        self.handlers = []
-
-        for pursuer in self.pursuers:
-            for obj in self.evaders:
-                self.handlers.append(
-                    self.space.add_collision_handler(
-                        pursuer.shape.collision_type, obj.shape.collision_type
-                    )
-                )
-                self.handlers[-1].begin = self.pursuer_evader_begin_callback
-                self.handlers[-1].separate = self.pursuer_evader_separate_callback
-
-            for obj in self.poisons:
-                self.handlers.append(
-                    self.space.add_collision_handler(
-                        pursuer.shape.collision_type, obj.shape.collision_type
-                    )
-                )
-                self.handlers[-1].begin = self.pursuer_poison_begin_callback
-
-        # Collision handlers for poisons v.s. evaders
-        for poison in self.poisons:
-            for evader in self.evaders:
-                self.handlers.append(
-                    self.space.add_collision_handler(
-                        poison.shape.collision_type, evader.shape.collision_type
-                    )
-                )
-                self.handlers[-1].begin = self.return_false_begin_callback
-
-        # Collision handlers for evaders v.s. evaders
-        for i in range(self.n_evaders):
-            for j in range(i, self.n_evaders):
-                if not i == j:
-                    self.handlers.append(
-                        self.space.add_collision_handler(
-                            self.evaders[i].shape.collision_type,
-                            self.evaders[j].shape.collision_type,
-                        )
-                    )
-                    self.handlers[-1].begin = self.return_false_begin_callback
-
-        # Collision handlers for poisons v.s. poisons
-        for i in range(self.n_poisons):
-            for j in range(i, self.n_poisons):
-                if not i == j:
-                    self.handlers.append(
-                        self.space.add_collision_handler(
-                            self.poisons[i].shape.collision_type,
-                            self.poisons[j].shape.collision_type,
-                        )
-                    )
-                    self.handlers[-1].begin = self.return_false_begin_callback
-
-        # Collision handlers for pursuers v.s. pursuers
-        for i in range(self.n_pursuers):
-            for j in range(i, self.n_pursuers):
-                if not i == j:
-                    self.handlers.append(
-                        self.space.add_collision_handler(
-                            self.pursuers[i].shape.collision_type,
-                            self.pursuers[j].shape.collision_type,
-                        )
-                    )
-                    self.handlers[-1].begin = self.return_false_begin_callback
+        # Collision handlers for pursuers v.s. evaders & poisons. Pursuers,
+        # evaders and poisons do not collide among each other, which is
+        # handled by the shape filters of the objects
+        self.handlers = [
+            self.space.add_collision_handler(PURSUER_TYPE, EVADER_TYPE),
+            self.space.add_collision_handler(PURSUER_TYPE, POISON_TYPE),
+        ]
+        evader_handler, poison_handler = self.handlers
+
+        if self.batch_collisions:
+            for handler in self.handlers:
+                handler.data["begin"] = []
+                handler.data["separate"] = []
+                handler.begin = self.record_begin_callback
+            evader_handler.separate = self.record_separate_callback
+        else:
+            evader_handler.begin = self.pursuer_evader_begin_callback
+            evader_handler.separate = self.pursuer_evader_separate_callback
+            poison_handler.begin = self.pursuer_poison_begin_callback
 
     def reset(self):
-        self.add_obj()
+        reuse = self.fast_reset and self.space is not None
+        if reuse:
+            self.remove()
+            self.reset_obj()
+        else:
+            self.add_obj()
         self.frames = 0
 
         # Initialize obstacles positions
@@ -401,9 +433,13 @@ class WaterworldBase:
                 )
 
         # Add objects to space
-        self.add()
+        if reuse:
+            self.space.add(*self.space_objects())
+        else:
+            self.add()
         self.add_handlers()
-        self.add_bounding_box()
+        if not reuse:
+            self.add_bounding_box()
 
         # Get observation
         obs_list = self.observe_list()
@@ -450,7 +486,10 @@ class WaterworldBase:
         self.control_rewards[agent_id] += accel_penalty * self.local_ratio
 
         if is_last:
-            self.space.step(1 / self.FPS)
+            for _ in range(self.physics_substeps):
+                self.space.step(1 / (self.FPS * self.physics_substeps))
+                if self.batch_collisions:
+                    self.resolve_contacts()
 
             obs_list = self.observe_list()
             self.last_obs = obs_list
@@ -486,141 +525,213 @@ class WaterworldBase:
         return np.array(self.last_obs[agent_id], dtype=np.float32)
 
     def observe_list(self):
-        observe_list = []
-
-        for i, pursuer in enumerate(self.pursuers):
-            obstacle_distances = []
+        """Compute the observations of all pursuers at once.
 
-            evader_distances = []
-            evader_velocities = []
+        The sensor readings of every pursuer, sensor and object are computed
+        as a single array operation per object type, and written into a
+        preallocated observation buffer whose rows are returned.
+        """
+        obs = self._obs_buffer
+        n_blocks = obs.shape[1] // self.n_sensors
+        sensor_blocks = obs[:, : n_blocks * self.n_sensors].reshape(
+            self.n_pursuers, n_blocks, self.n_sensors
+        )
 
-            poison_distances = []
-            poison_velocities = []
+        sensors = self.pursuers[0].sensors
+        sensor_range = self.pursuers[0].sensor_range
+        centers = np.array([p.body.position for p in self.pursuers])
+        velocities = np.array([p.body.velocity for p in self.pursuers])
+
+        sensor_blocks[:, 0] = self._sensor_readings(
+            centers, velocities, sensors, sensor_range, self.obstacles, 0.0
+        )[0]
+        sensor_blocks[:, 1] = self._barrier_readings(centers, sensors, sensor_range)
+
+        # Without speed features the velocity blocks are left out
+        step = 2 if self.speed_features else 1
+        for block, objects, max_speed in (
+            (2, self.evaders, self.evader_speed),
+            (2 + step, self.poisons, self.poison_speed),
+            (2 + 2 * step, self.pursuers, self.pursuer_speed),
+        ):
+            distances, speeds = self._sensor_readings(
+                centers,
+                velocities,
+                sensors,
+                sensor_range,
+                objects,
+                max_speed,
+                # pursuers do not sense themselves
+                exclude_self=objects is self.pursuers,
+            )
+            sensor_blocks[:, block] = distances
+            if self.speed_features:
+                sensor_blocks[:, block + 1] = speeds
 
-            _pursuer_distances = []
-            _pursuer_velocities = []
+        obs[:, -2] = [p.shape.food_touched_indicator >= 1 for p in self.pursuers]
+        obs[:, -1] = [p.shape.poison_indicator >= 1 for p in self.pursuers]
 
-            for obstacle in self.obstacles:
-                obstacle_distance, _ = pursuer.get_sensor_reading(
-                    obstacle.body.position, obstacle.radius, obstacle.body.velocity, 0.0
-                )
-                obstacle_distances.append(obstacle_distance)
+        return list(obs)
 
-            obstacle_sensor_vals = self.get_sensor_readings(
-                obstacle_distances, pursuer.sensor_range
+    def _sensor_readings(
+        self,
+        centers,
+        velocities,
+        sensors,
+        sensor_range,
+        objects,
+        max_speed,
+        exclude_self=False,
+    ):
+        """Get the readings of every pursuer sensor for the closest object of a list.
+
+        This is a batched version of `Pursuers.get_sensor_reading` followed by
+        `get_sensor_readings`: the projections of all pursuer to object
+        distances on all sensors form a (n_pursuers, n_sensors, n_candidates)
+        array, and each sensor reads the object with the smallest distance.
+        With many objects, the candidates of each pursuer are limited by
+        `_nearby_objects` to the objects its sensors can reach.
+
+        centers: (n_pursuers, 2) positions of the pursuers
+        velocities: (n_pursuers, 2) velocities of the pursuers
+        sensors: (n_sensors, 2) unit vectors of the sensors
+        objects: objects to sense, with a `radius` and a pymunk `body`
+        max_speed: maximum speed of the objects, used to normalize velocities
+        exclude_self: whether objects[i] is pursuer i and must not be sensed by it
+        """
+        n_pursuers, n_sensors = len(centers), len(sensors)
+        distances = np.ones((n_pursuers, n_sensors))
+        speeds = np.zeros((n_pursuers, n_sensors))
+        if exclude_self and len(objects) == 1:
+            # When there is only one pursuer the sensors will not sense
+            # another pursuer
+            return np.zeros_like(distances), speeds
+        if not objects:
+            return distances, speeds
+
+        positions = np.array([obj.body.position for obj in objects])
+        # All objects of a type share the same radius
+        radius = objects[0].radius
+        rows = np.arange(n_pursuers)[:, None]
+
+        if len(objects) > BROADPHASE_MIN_OBJECTS:
+            candidates, valid = self._nearby_objects(
+                centers, positions, sensor_range, radius
             )
+        else:
+            candidates = np.broadcast_to(
+                np.arange(len(objects)), (n_pursuers, len(objects))
+            )
+            valid = None
 
-            barrier_distances = pursuer.get_sensor_barrier_readings()
+        # Distances in the local frame of every pursuer, (n_pursuers, n_candidates)
+        dx = positions[candidates, 0] - centers[:, 0, None]
+        dy = positions[candidates, 1] - centers[:, 1, None]
+        distance_squared = dx**2 + dy**2
 
-            for evader in self.evaders:
-                evader_distance, evader_velocity = pursuer.get_sensor_reading(
-                    evader.body.position,
-                    evader.radius,
-                    evader.body.velocity,
-                    self.evader_speed,
-                )
-                evader_distances.append(evader_distance)
-                evader_velocities.append(evader_velocity)
-
-            (
-                evader_sensor_distance_vals,
-                evader_sensor_velocity_vals,
-            ) = self.get_sensor_readings(
-                evader_distances,
-                pursuer.sensor_range,
-                velocites=evader_velocities,
-            )
+        # Project distances to sensor vectors, (n_pursuers, n_sensors, n_candidates)
+        sensor_distances = (
+            sensors[:, 0, None] * dx[:, None, :] + sensors[:, 1, None] * dy[:, None, :]
+        )
 
-            for poison in self.poisons:
-                poison_distance, poison_velocity = pursuer.get_sensor_reading(
-                    poison.body.position,
-                    poison.radius,
-                    poison.body.velocity,
-                    self.poison_speed,
-                )
-                poison_distances.append(poison_distance)
-                poison_velocities.append(poison_velocity)
-
-            (
-                poison_sensor_distance_vals,
-                poison_sensor_velocity_vals,
-            ) = self.get_sensor_readings(
-                poison_distances,
-                pursuer.sensor_range,
-                velocites=poison_velocities,
-            )
+        # Check for valid detection criterions
+        not_sensed = (
+            (sensor_distances < 0)
+            | (sensor_distances - radius > sensor_range)
+            | (distance_squared[:, None, :] - sensor_distances**2 > radius**2)
+        )
 
-            # When there is only one pursuer the sensors will not sense
-            # another pursuer
-            if self.n_pursuers > 1:
-                for j, _pursuer in enumerate(self.pursuers):
-                    # Get sensor readings only for other pursuers
-                    if i == j:
-                        continue
-
-                    _pursuer_distance, _pursuer_velocity = pursuer.get_sensor_reading(
-                        _pursuer.body.position,
-                        _pursuer.radius,
-                        _pursuer.body.velocity,
-                        self.pursuer_speed,
-                    )
-                    _pursuer_distances.append(_pursuer_distance)
-                    _pursuer_velocities.append(_pursuer_velocity)
-
-                (
-                    _pursuer_sensor_distance_vals,
-                    _pursuer_sensor_velocity_vals,
-                ) = self.get_sensor_readings(
-                    _pursuer_distances,
-                    pursuer.sensor_range,
-                    velocites=_pursuer_velocities,
-                )
-            else:
-                _pursuer_sensor_distance_vals = np.zeros(self.n_sensors)
-                _pursuer_sensor_velocity_vals = np.zeros(self.n_sensors)
+        # Set not sensed sensor readings of position to sensor range
+        readings = np.clip(sensor_distances / sensor_range, 0, 1)
+        readings[not_sensed] = 1.0
+        hidden = np.zeros(candidates.shape, dtype=bool) if valid is None else ~valid
+        if exclude_self:
+            hidden |= candidates == rows
+        readings[np.broadcast_to(hidden[:, None, :], readings.shape)] = np.inf
 
-            if pursuer.shape.food_touched_indicator >= 1:
-                food_obs = 1
-            else:
-                food_obs = 0
+        # Sensor only reads the closest object
+        closest_candidate = np.argmin(readings, axis=-1)
+        sensor_idx = np.arange(n_sensors)
+        distances[:] = readings[rows, sensor_idx, closest_candidate]
+        closest = candidates[rows, closest_candidate]
+
+        # Project the relative velocity of the closest object to sensor vectors
+        # Only the velocities of the objects read by some sensor are needed
+        sensed, sensed_idx = np.unique(closest, return_inverse=True)
+        object_velocities = np.array([objects[i].body.velocity for i in sensed])
+        relative_vx = object_velocities[sensed_idx, 0] - velocities[:, 0, None]
+        relative_vy = object_velocities[sensed_idx, 1] - velocities[:, 1, None]
+        speeds[:] = (sensors[:, 0] * relative_vx + sensors[:, 1] * relative_vy) / (
+            max_speed + self.pursuer_speed
+        )
 
-            if pursuer.shape.poison_indicator >= 1:
-                poison_obs = 1
-            else:
-                poison_obs = 0
+        # Set not sensed sensor readings of velocity to zero
+        not_sensed = not_sensed[rows, sensor_idx, closest_candidate]
+        if valid is not None:
+            # Culled objects are never sensed and read 1.0, so a sensor that
+            # reads 1.0 would have read the first culled object if it comes
+            # before the closest candidate. Candidates are sorted, so the
+            # indices before the first culled object match their position.
+            first_culled = np.sum(
+                valid & (candidates == np.arange(candidates.shape[1])), axis=1
+            )
+            not_sensed |= np.isinf(distances)
+            not_sensed |= (distances == 1.0) & (closest > first_culled[:, None])
+            distances[np.isinf(distances)] = 1.0
+        speeds[not_sensed] = 0.0
+
+        return distances, speeds
+
+    def _nearby_objects(self, centers, positions, sensor_range, radius):
+        """Find the objects that the sensors of each pursuer can reach.
+
+        An object of radius r is only sensed when its projection on a sensor is
+        at most sensor_range + r and its distance to the sensor line at most r,
+        so it lies within sqrt((sensor_range + r)**2 + r**2) of the pursuer.
+        This broadphase only compares the pursuer to object distances, once per
+        computation of the observations, so that the sensor projections are
+        only computed for the objects in reach.
+
+        Returns a (n_pursuers, n_candidates) array with the sorted indices of
+        the objects near each pursuer, padded with 0, and the mask of its valid
+        entries.
+        """
+        reach = np.hypot(sensor_range + radius, radius) * (1 + 1e-6)
+        offsets = positions[None, :, :] - centers[:, None, :]
+        near = np.sum(offsets**2, axis=-1) <= reach**2
+        counts = near.sum(axis=1)
+        valid = np.arange(max(counts.max(), 1)) < counts[:, None]
+        candidates = np.zeros(valid.shape, dtype=np.intp)
+        candidates[valid] = np.nonzero(near)[1]
+        return candidates, valid
+
+    def _barrier_readings(self, centers, sensors, sensor_range):
+        """Batched version of `Pursuers.get_sensor_barrier_readings` for all pursuers."""
+        # Get the endpoint position of each sensor
+        sensor_vectors = sensors * sensor_range
+        sensor_endpoints = centers[:, None, :] + sensor_vectors
+
+        # Clip sensor lines on the environment's barriers
+        clipped_vectors = (
+            np.clip(sensor_endpoints, 0.0, self.pixel_scale) - centers[:, None, :]
+        )
 
-            # concatenate all observations
-            if self.speed_features:
-                pursuer_observation = np.concatenate(
-                    [
-                        obstacle_sensor_vals,
-                        barrier_distances,
-                        evader_sensor_distance_vals,
-                        evader_sensor_velocity_vals,
-                        poison_sensor_distance_vals,
-                        poison_sensor_velocity_vals,
-                        _pursuer_sensor_distance_vals,
-                        _pursuer_sensor_velocity_vals,
-                        np.array([food_obs]),
-                        np.array([poison_obs]),
-                    ]
-                )
-            else:
-                pursuer_observation = np.concatenate(
-                    [
-                        obstacle_sensor_vals,
-                        barrier_distances,
-                        evader_sensor_distance_vals,
-                        poison_sensor_distance_vals,
-                        _pursuer_sensor_distance_vals,
-                        np.array([food_obs]),
-                        np.array([poison_obs]),
-                    ]
-                )
+        # Find the minimum ratio (x or y) of clipped endpoints to original endpoints
+        ratios = np.divide(
+            clipped_vectors,
+            sensor_vectors,
+            out=np.ones_like(clipped_vectors),
+            where=np.abs(sensor_vectors) > 1e-8,
+        )
+        sensor_values = np.amin(ratios, axis=-1)
+
+        # Set values beyond sensor range to 1.0
+        sensor_values[sensor_values >= 1.0 - 1e-4] = 1.0
 
-            observe_list.append(pursuer_observation)
+        # Convert -0 to 0
+        sensor_values[sensor_values == -0] = 0
 
-        return observe_list
+        return sensor_values
 
     def get_sensor_readings(self, positions, sensor_range, velocites=None):
         """Get readings from sensors.
@@ -713,10 +824,133 @@ class WaterworldBase:
 
         pursuer_shape.food_touched_indicator -= 1
 
-    def return_false_begin_callback(self, arbiter, space, data):
-        """Callback function that simply returns False."""
+    def record_begin_callback(self, arbiter, space, data):
+        """Called when a pursuer starts touching an evader or a poison with batch_collisions.
+
+        Only the indices of the pursuer and of the object are recorded, the
+        contacts are resolved by `resolve_contacts` after the physics step.
+        """
+        pursuer_shape, obj_shape = arbiter.shapes
+        data["begin"].append((pursuer_shape.index, obj_shape.index))
+
         return False
 
+    def record_separate_callback(self, arbiter, space, data):
+        """Called when a pursuer stops touching an evader with batch_collisions."""
+        pursuer_shape, evader_shape = arbiter.shapes
+        data["separate"].append((pursuer_shape.index, evader_shape.index))
+
+    def resolve_contacts(self):
+        """Apply the contacts recorded during the last physics step at once.
+
+        The indicators and evader counters are updated as by the immediate
+        callbacks: physics steps run all begin callbacks before the separate
+        callbacks, and the contacts of each type are counted in the order in
+        which they were recorded. Eaten poisons and caught evaders are then
+        respawned together, with positions and velocities drawn in bulk, so
+        the random draws differ from the immediate callbacks.
+        """
+        evader_data, poison_data = (handler.data for handler in self.handlers)
+        respawned = []
+
+        if poison_data["begin"]:
+            pursuer_idx, poison_idx = np.array(poison_data["begin"]).T
+            poison_data["begin"].clear()
+            self._add_to_pursuers("poison_indicator", pursuer_idx)
+            respawned.extend(self.poisons[i].shape for i in np.unique(poison_idx))
+
+        if evader_data["begin"]:
+            pursuer_idx, evader_idx = np.array(evader_data["begin"]).T
+            evader_data["begin"].clear()
+            self._add_to_pursuers("food_touched_indicator", pursuer_idx)
+
+            # Number of pursuers touching each evader at each contact
+            evaders, inverse, counts = np.unique(
+                evader_idx, return_inverse=True, return_counts=True
+            )
+            order = np.argsort(inverse, kind="stable")
+            rank = np.empty_like(order)
+            rank[order] = np.arange(len(order)) - np.repeat(
+                np.cumsum(counts) - counts, counts
+            )
+            shapes = [self.evaders[i].shape for i in evaders]
+            counters = np.array([shape.counter for shape in shapes])
+            touching = counters[inverse] + rank + 1
+
+            for i in pursuer_idx[touching >= self.n_coop]:
+                # For giving reward to pursuer
+                self.pursuers[i].shape.food_indicator = 1
+            for shape, counter in zip(shapes, counters + counts):
+                shape.counter = counter
+
+        if evader_data["separate"]:
+            pursuer_idx, evader_idx = np.array(evader_data["separate"]).T
+            evader_data["separate"].clear()
+            self._add_to_pursuers("food_touched_indicator", pursuer_idx, -1)
+
+            evaders, first, counts = np.unique(
+                evader_idx, return_index=True, return_counts=True
+            )
+            shapes = [self.evaders[i].shape for i in evaders]
+            counters = np.array([shape.counter for shape in shapes])
+            caught = counters >= self.n_coop
+
+            # The first released pursuer catches the evader, and the others
+            # are released after its counter is reset
+            for i in pursuer_idx[first[caught]]:
+                self.pursuers[i].shape.food_indicator = 1
+            for shape, counter in zip(
+                shapes, np.where(caught, 1 - counts, counters - counts)
+            ):
+                shape.counter = counter
+            respawned.extend(shape for shape, c in zip(shapes, caught) if c)
+
+        if respawned:
+            self._respawn(respawned)
+
+    def _add_to_pursuers(self, indicator, pursuer_idx, sign=1):
+        """Add the number of contacts of each pursuer to one of its indicators."""
+        counts = np.bincount(pursuer_idx, minlength=self.n_pursuers)
+        for i in np.flatnonzero(counts):
+            shape = self.pursuers[i].shape
+            setattr(shape, indicator, getattr(shape, indicator) + sign * counts[i])
+
+    def _respawn(self, shapes):
+        """Reset the positions and velocities of evaders and poisons at once.
+
+        The positions are sampled like in `_generate_coord`, and resampled
+        together until none of them collides with an obstacle.
+        """
+        radii = np.array([shape.radius for shape in shapes])
+        max_speeds = np.array([shape.max_speed for shape in shapes])
+
+        coords = self.np_random.random((len(shapes), 2)) * self.pixel_scale
+        if self.obstacles:
+            obstacle_coords = np.array([o.body.position for o in self.obstacles])
+            obstacle_radii = np.array([o.radius for o in self.obstacles])
+            while True:
+                too_close = np.any(
+                    ssd.cdist(coords, obstacle_coords)
+                    <= radii[:, None] * 2 + obstacle_radii,
+                    axis=1,
+                )
+                if not too_close.any():
+                    break
+                coords[too_close] = (
+                    self.np_random.random((too_close.sum(), 2)) * self.pixel_scale
+                )
+
+        speeds = (
+            (self.np_random.random((len(shapes), 2)) - 0.5) * 2 * max_speeds[:, None]
+        )
+
+        for shape, (x, y), (vx, vy) in zip(shapes, coords, speeds):
+            shape.reset_position(x, y)
+            shape.reset_velocity(vx, vy)
+
+    def return_none_callback(self, arbiter, space, data):
+        """Callback function that does nothing."""
+
     def render(self):
         if self.render_mode is None:
             gymnasium.logger.warn(
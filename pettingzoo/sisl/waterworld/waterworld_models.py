@@ -3,6 +3,12 @@ import pygame
 import pymunk
 from gymnasium import spaces
 
+# Collision types of the moving objects, and their categories for shape filters.
+# Pursuers do not collide with each other, and food and poisons do not collide
+# with each other nor with themselves.
+PURSUER_TYPE, EVADER_TYPE, POISON_TYPE = 1, 2, 3
+PURSUER_CATEGORY, EVADER_CATEGORY, POISON_CATEGORY = 0b001, 0b010, 0b100
+
 
 class Obstacle:
     def __init__(self, x, y, pixel_scale=750, radius=0.1):
@@ -59,13 +65,19 @@ class MovingObject:
 
 
 class Evaders(MovingObject):
-    def __init__(self, x, y, vx, vy, radius=0.03, collision_type=2, max_speed=100):
+    def __init__(
+        self, x, y, vx, vy, radius=0.03, collision_type=EVADER_TYPE, max_speed=100
+    ):
         super().__init__(x, y, radius=radius)
 
         self.body.velocity = vx, vy
 
         self.color = (145, 250, 116)
         self.shape.collision_type = collision_type
+        self.shape.filter = pymunk.ShapeFilter(
+            categories=EVADER_CATEGORY,
+            mask=pymunk.ShapeFilter.ALL_MASKS() ^ (EVADER_CATEGORY | POISON_CATEGORY),
+        )
         self.shape.counter = 0
         self.shape.max_speed = max_speed
         self.shape.density = 0.01
@@ -73,7 +85,14 @@ class Evaders(MovingObject):
 
 class Poisons(MovingObject):
     def __init__(
-        self, x, y, vx, vy, radius=0.015 * 3 / 4, collision_type=3, max_speed=100
+        self,
+        x,
+        y,
+        vx,
+        vy,
+        radius=0.015 * 3 / 4,
+        collision_type=POISON_TYPE,
+        max_speed=100,
     ):
         super().__init__(x, y, radius=radius)
 
@@ -81,6 +100,10 @@ class Poisons(MovingObject):
 
         self.color = (238, 116, 106)
         self.shape.collision_type = collision_type
+        self.shape.filter = pymunk.ShapeFilter(
+            categories=POISON_CATEGORY,
+            mask=pymunk.ShapeFilter.ALL_MASKS() ^ (EVADER_CATEGORY | POISON_CATEGORY),
+        )
         self.shape.max_speed = max_speed
 
 
@@ -94,13 +117,17 @@ class Pursuers(MovingObject):
         radius=0.015,
         n_sensors=30,
         sensor_range=0.2,
-        collision_type=1,
+        collision_type=PURSUER_TYPE,
         speed_features=True,
     ):
         super().__init__(x, y, radius=radius)
 
         self.color = (101, 104, 249)
         self.shape.collision_type = collision_type
+        self.shape.filter = pymunk.ShapeFilter(
+            categories=PURSUER_CATEGORY,
+            mask=pymunk.ShapeFilter.ALL_MASKS() ^ PURSUER_CATEGORY,
+        )
         self.sensor_color = (0, 0, 0)
         self.n_sensors = n_sensors
         self.sensor_range = sensor_range * self.pixel_scale
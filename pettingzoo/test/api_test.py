@@ -115,6 +115,7 @@ env_pos_inf_obs = [
     "simple_tag_v3",
     "simple_world_comm_v3",
     "multiwalker_v9",
+    "pistonball_v6",
     "simple_crypto_v3",
     "simple_push_v3",
     "simple_speaker_listener_v4",
@@ -127,6 +128,7 @@ env_neg_inf_obs = [
     "simple_tag_v3",
     "simple_world_comm_v3",
     "multiwalker_v9",
+    "pistonball_v6",
     "simple_crypto_v3",
     "simple_push_v3",
     "simple_speaker_listener_v4",
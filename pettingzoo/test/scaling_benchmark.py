@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import json
+import time
+
+import numpy as np
+
+from pettingzoo.mpe import (
+    simple_adversary_v3,
+    simple_crypto_v3,
+    simple_push_v3,
+    simple_reference_v3,
+    simple_speaker_listener_v4,
+    simple_spread_v3,
+    simple_tag_v3,
+    simple_v3,
+    simple_world_comm_v3,
+)
+from pettingzoo.sisl import waterworld_v4
+
+# Maps each MPE scenario to a function turning a scale factor ``n`` into
+# constructor kwargs. Scenarios whose entity counts are fixed map to None and
+# are only measured once at their defaults.
+MPE_SCALING = {
+    "simple_adversary_v3": (simple_adversary_v3, lambda n: dict(N=n)),
+    "simple_crypto_v3": (simple_crypto_v3, None),
+    "simple_push_v3": (simple_push_v3, None),
+    "simple_reference_v3": (simple_reference_v3, None),
+    "simple_speaker_listener_v4": (simple_speaker_listener_v4, None),
+    "simple_spread_v3": (simple_spread_v3, lambda n: dict(N=n)),
+    "simple_tag_v3": (
+        simple_tag_v3,
+        lambda n: dict(
+            num_good=max(1, n // 4),
+            num_adversaries=n - max(1, n // 4),
+            num_obstacles=max(1, n // 2),
+        ),
+    ),
+    "simple_v3": (simple_v3, None),
+    "simple_world_comm_v3": (
+        simple_world_comm_v3,
+        lambda n: dict(
+            num_good=max(1, n // 3),
+            num_adversaries=n - max(1, n // 3),
+            num_obstacles=max(1, n // 4),
+            num_food=max(1, n // 2),
+            num_forests=max(1, n // 4),
+        ),
+    ),
+}
+
+
+def _time_mpe_env(env, num_cycles, seed):
+    """Time the step, observe and reward phases of one MPE env, in seconds per cycle."""
+    env.reset(seed=seed)
+    for agent in env.agents:
+        env.action_space(agent).seed(seed)
+    # one untimed cycle so that first-call overheads do not skew small sizes
+    env.current_actions = [
+        env.action_space(agent).sample() for agent in env.possible_agents
+    ]
+    env._execute_world_step()
+
+    step_time = observe_time = reward_time = 0.0
+    for _ in range(num_cycles):
+        env.current_actions = [
+            env.action_space(agent).sample() for agent in env.possible_agents
+        ]
+
+        start = time.perf_counter()
+        env._set_actions()
+        env.world.step()
+        step_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        env._update_rewards()
+        reward_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        for agent in env.possible_agents:
+            env.observe(agent)
+        observe_time += time.perf_counter() - start
+
+    return (
+        step_time / num_cycles,
+        observe_time / num_cycles,
+        reward_time / num_cycles,
+    )
+
+
+def _log_log_slopes(sizes, times):
+    """Local complexity exponents between consecutive points: ~1 is linear, ~2 is quadratic."""
+    return [
+        float(np.log(times[i + 1] / times[i]) / np.log(sizes[i + 1] / sizes[i]))
+        for i in range(len(sizes) - 1)
+    ]
+
+
+def mpe_scaling_benchmark(
+    sizes=(4, 8, 16, 32, 64), num_cycles=25, scenarios=None, seed=42
+):
+    """Sweep agent and landmark counts of every MPE scenario.
+
+    For each scenario and scale factor, the world is built through the scenario
+    constructor, and the average time per cycle of the world step (action
+    decoding and physics), of observing every agent and of computing every
+    agent's reward is measured separately. The complexity exponents are the
+    log-log slopes between consecutive entity counts.
+
+    Returns a JSON serializable dictionary keyed by scenario name.
+    """
+    results = {}
+    for name, (env_module, scale) in MPE_SCALING.items():
+        if scenarios is not None and name not in scenarios:
+            continue
+
+        points = []
+        for n in sizes if scale is not None else (None,):
+            kwargs = {} if n is None else scale(n)
+            env = env_module.raw_env(max_cycles=num_cycles, **kwargs)
+            step_time, observe_time, reward_time = _time_mpe_env(env, num_cycles, seed)
+            points.append(
+                {
+                    "kwargs": kwargs,
+                    "num_agents": len(env.world.agents),
+                    "num_landmarks": len(env.world.landmarks),
+                    "step": step_time,
+                    "observe": observe_time,
+                    "reward": reward_time,
+                }
+            )
+            env.close()
+
+        entities = [p["num_agents"] + p["num_landmarks"] for p in points]
+        results[name] = {
+            "points": points,
+            "exponents": {
+                phase: _log_log_slopes(entities, [p[phase] for p in points])
+                for phase in ("step", "observe", "reward")
+            },
+        }
+    return results
+
+
+def _time_waterworld_env(env, num_cycles, seed):
+    """Time the physics step and the observations of one waterworld env, in seconds per cycle."""
+    env.reset(seed=seed)
+    for agent in env.agents:
+        env.action_space(agent).seed(seed)
+    base = env.env
+
+    physics_time = observe_time = 0.0
+    for _ in range(num_cycles):
+        for agent in env.possible_agents:
+            base.step(
+                env.action_space(agent).sample(),
+                env.agent_name_mapping[agent],
+                is_last=False,
+            )
+
+        start = time.perf_counter()
+        base.space.step(1 / base.FPS)
+        physics_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        base.observe_list()
+        observe_time += time.perf_counter() - start
+
+    return physics_time / num_cycles, observe_time / num_cycles
+
+
+def waterworld_scaling_benchmark(
+    sizes=(25, 50, 100, 200), n_pursuers=5, num_cycles=25, seed=42
+):
+    """Sweep the number of food and poison objects of waterworld.
+
+    For each size ``n``, the environment is built with ``n`` evaders (food)
+    and ``2 * n`` poisons, and the average time per cycle of the physics step
+    and of observing every pursuer is measured separately. The complexity
+    exponents are the log-log slopes between consecutive object counts.
+
+    Returns a JSON serializable dictionary.
+    """
+    points = []
+    for n in sizes:
+        kwargs = dict(n_pursuers=n_pursuers, n_evaders=n, n_poisons=2 * n)
+        env = waterworld_v4.raw_env(max_cycles=num_cycles, **kwargs)
+        physics_time, observe_time = _time_waterworld_env(env, num_cycles, seed)
+        points.append(
+            {
+                "kwargs": kwargs,
+                "num_objects": 3 * n,
+                "physics": physics_time,
+                "observe": observe_time,
+            }
+        )
+        env.close()
+
+    objects = [p["num_objects"] for p in points]
+    return {
+        "points": points,
+        "exponents": {
+            phase: _log_log_slopes(objects, [p[phase] for p in points])
+            for phase in ("physics", "observe")
+        },
+    }
+
+
+if __name__ == "__main__":
+    print(
+        json.dumps(
+            {
+                "mpe": mpe_scaling_benchmark(),
+                "waterworld": waterworld_scaling_benchmark(),
+            },
+            indent=2,
+        )
+    )
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import numpy as np
 import pytest
 
 from pettingzoo.atari import (
@@ -196,6 +197,11 @@ parameterized_envs = [
         knights_archers_zombies_v10,
         dict(vector_state=False, pad_observation=False, max_cycles=50),
     ],
+    [
+        "butterfly/knights_archers_zombies_v10",
+        knights_archers_zombies_v10,
+        dict(vector_state=False, obs_scale=4, max_cycles=50),
+    ],
     [
         "butterfly/knights_archers_zombies_v10",
         knights_archers_zombies_v10,
@@ -214,6 +220,14 @@ parameterized_envs = [
         pistonball_v6,
         dict(random_drop=False, random_rotate=False, max_cycles=50),
     ],
+    ["butterfly/pistonball_v6", pistonball_v6, dict(obs_type="vector", max_cycles=50)],
+    ["butterfly/pistonball_v6", pistonball_v6, dict(obs_scale=4, max_cycles=50)],
+    [
+        "butterfly/pistonball_v6",
+        pistonball_v6,
+        dict(physics_steps_per_cycle=2, max_cycles=50),
+    ],
+    ["butterfly/pistonball_v6", pistonball_v6, dict(fast_reset=True, max_cycles=50)],
     ["classic/go_v5", go_v5, dict(board_size=13, komi=2.5)],
     ["classic/go_v5", go_v5, dict(board_size=9, komi=0.0)],
     ["classic/hanabi_v5", hanabi_v5, dict()],
@@ -327,8 +341,39 @@ parameterized_envs = [
         simple_spread_v3,
         dict(N=5, continuous_actions=True, max_cycles=50),
     ],
+    ["mpe/simple_spread_v3", simple_spread_v3, dict(dtype=np.float32, max_cycles=50)],
+    [
+        "mpe/simple_tag_v3",
+        simple_tag_v3,
+        dict(continuous_actions=True, dtype=np.float32, max_cycles=50),
+    ],
+    [
+        "mpe/simple_world_comm_v3",
+        simple_world_comm_v3,
+        dict(dtype=np.float32, max_cycles=50),
+    ],
+    [
+        "mpe/simple_reference_v3",
+        simple_reference_v3,
+        dict(render_backend="numpy", render_resolution=256, max_cycles=50),
+    ],
+    [
+        "mpe/simple_crypto_v3",
+        simple_crypto_v3,
+        dict(render_backend="numpy", render_text=False, max_cycles=50),
+    ],
     ["sisl/multiwalker_v9", multiwalker_v9, dict(n_walkers=10, max_cycles=50)],
     ["sisl/multiwalker_v9", multiwalker_v9, dict(shared_reward=False, max_cycles=50)],
+    [
+        "sisl/multiwalker_v9",
+        multiwalker_v9,
+        dict(fast_reset=True, terrain_bank_size=4, max_cycles=50),
+    ],
+    [
+        "sisl/multiwalker_v9",
+        multiwalker_v9,
+        dict(frame_skip=4, lidar_interval=2, terminate_on_fall=False, max_cycles=50),
+    ],
     [
         "sisl/multiwalker_v9",
         multiwalker_v9,
@@ -346,6 +391,18 @@ parameterized_envs = [
     ["sisl/pursuit_v4", pursuit_v4, dict(obs_range=15, max_cycles=50)],
     ["sisl/pursuit_v4", pursuit_v4, dict(n_catch=3, max_cycles=50)],
     ["sisl/pursuit_v4", pursuit_v4, dict(freeze_evaders=True, max_cycles=50)],
+    ["sisl/pursuit_v4", pursuit_v4, dict(map_type="complex", max_cycles=50)],
+    [
+        "sisl/pursuit_v4",
+        pursuit_v4,
+        dict(
+            x_size=48,
+            y_size=40,
+            map_type="multi_scale",
+            sparse_layers=True,
+            max_cycles=50,
+        ),
+    ],
     [
         "sisl/waterworld_v4",
         waterworld_v4,
@@ -356,6 +413,12 @@ parameterized_envs = [
     ["sisl/waterworld_v4", waterworld_v4, dict(n_sensors=4, max_cycles=50)],
     ["sisl/waterworld_v4", waterworld_v4, dict(local_ratio=0.5, max_cycles=50)],
     ["sisl/waterworld_v4", waterworld_v4, dict(speed_features=False, max_cycles=50)],
+    [
+        "sisl/waterworld_v4",
+        waterworld_v4,
+        dict(batch_collisions=True, physics_substeps=2, max_cycles=50),
+    ],
+    ["sisl/waterworld_v4", waterworld_v4, dict(fast_reset=True, max_cycles=50)],
 ]
 
 
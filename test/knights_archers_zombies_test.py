@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import numpy as np
+import pygame
+import pytest
+
+from pettingzoo.butterfly import knights_archers_zombies_v10
+from pettingzoo.butterfly.knights_archers_zombies.knights_archers_zombies import (
+    raw_env,
+)
+from pettingzoo.butterfly.knights_archers_zombies.src.collisions import (
+    first_hits,
+    rect_array,
+    sprite_hits,
+)
+
+
+def _reference_vector_state(base):
+    """Entity matrix assembled entity by entity."""
+    rows = []
+
+    def add(entity, type_index):
+        typemask = np.zeros(base.typemask_width if base.use_typemasks else 0)
+        if base.use_typemasks:
+            typemask[type_index] = 1.0
+        rows.append(np.concatenate([typemask, entity.vector_state]))
+
+    def pad(count):
+        rows.extend(np.zeros(base.vector_width) for _ in range(count))
+
+    for agent_name in base.possible_agents:
+        agent = base.agent_list[base.agent_name_mapping[agent_name]]
+        if agent_name in base.dead_agents:
+            pad(1)
+        else:
+            add(agent, 1 if agent.is_archer else 2)
+    knights = [agent for agent in base.agent_list if agent.is_knight]
+    archers = [agent for agent in base.agent_list if agent.is_archer]
+    for sword in [sword for knight in knights for sword in knight.weapons]:
+        add(sword, 4)
+    pad(base.num_knights - base.num_active_swords)
+    for arrow in [arrow for archer in archers for arrow in archer.weapons]:
+        add(arrow, 3)
+    pad(base.max_arrows - base.num_active_arrows)
+    for zombie in base.zombie_list:
+        add(zombie, 0)
+    pad(base.max_zombies - len(base.zombie_list))
+    return np.stack(rows)
+
+
+def _reference_observation(base, agent_name):
+    """Vector observation of one agent, relative to the reference entity matrix."""
+    agent = base.agent_list[base.agent_name_mapping[agent_name]]
+    vector_state = _reference_vector_state(base)
+    ids, pos, ang = vector_state[:, :-4], vector_state[:, -4:-2], vector_state[:, -2:]
+    is_dead = np.sum(np.abs(vector_state[:, -4:]), axis=1) == 0.0
+    rel_pos = pos - agent.vector_state[:2]
+    norm_pos = np.linalg.norm(rel_pos, axis=1, keepdims=True) / np.sqrt(2)
+    state = np.concatenate([ids, norm_pos, rel_pos, ang], axis=-1)
+    state[is_dead] = 0.0
+
+    typemask = np.zeros(base.typemask_width + 1 if base.use_typemasks else 1)
+    if base.use_typemasks:
+        typemask[-2] = 1.0
+    own = np.concatenate([typemask, agent.vector_state])
+    return np.concatenate([own[None], state])
+
+
+@pytest.mark.parametrize("use_typemasks", [True, False])
+def test_cached_vector_state_matches_reference(use_typemasks):
+    env = knights_archers_zombies_v10.env(
+        use_typemasks=use_typemasks, spawn_rate=1, max_zombies=20
+    )
+    env.reset(seed=42)
+    base = env.unwrapped
+    for agent in env.agents:
+        env.action_space(agent).seed(42)
+
+    previous = None
+    died = False
+    for agent in env.agent_iter():
+        observation, _, termination, truncation, _ = env.last()
+        np.testing.assert_array_equal(observation, _reference_observation(base, agent))
+        np.testing.assert_array_equal(env.state(), _reference_vector_state(base))
+
+        # observations handed out earlier are not overwritten
+        if previous is not None:
+            np.testing.assert_array_equal(*previous)
+        previous = observation, observation.copy()
+
+        action = None if termination or truncation else env.action_space(agent).sample()
+        env.step(action)
+        died |= bool(base.dead_agents)
+    assert died
+
+
+@pytest.mark.parametrize("max_sprites", [8, 60])
+def test_sprite_hits_match_spritecollide(max_sprites):
+    rng = np.random.default_rng(42)
+
+    def sprites(n):
+        sprites = []
+        for x, y, w, h in rng.integers(0, 4 * max_sprites, size=(n, 4)):
+            sprite = pygame.sprite.Sprite()
+            # some rects only share an edge, or have zero width or height
+            sprite.rect = pygame.Rect(x, y, w % 12, h % 12)
+            sprites.append(sprite)
+        return sprites
+
+    for _ in range(50):
+        hitters = sprites(rng.integers(0, max_sprites))
+        targets = sprites(rng.integers(0, max_sprites))
+        group = pygame.sprite.Group(targets)
+        expected = [
+            (hitter, target)
+            for hitter in hitters
+            for target in pygame.sprite.spritecollide(hitter, group, True)
+        ]
+        assert sprite_hits(hitters, targets) == expected
+
+        hits = first_hits(rect_array(hitters), rect_array(targets))
+        assert [(hitters[h], targets[t]) for h, t in zip(*hits)] == expected
+
+
+class _SpritecollideEnv(raw_env):
+    """Resolves collisions with the sprite by sprite loops of pygame."""
+
+    def zombit_hit_knight(self):
+        for zombie in self.zombie_list:
+            for knight in pygame.sprite.spritecollide(zombie, self.knight_list, True):
+                knight.alive = False
+                knight.weapons.empty()
+                if knight.agent_name not in self.kill_list:
+                    self.kill_list.append(knight.agent_name)
+
+    def zombie_hit_archer(self):
+        for zombie in self.zombie_list:
+            for archer in pygame.sprite.spritecollide(zombie, self.archer_list, True):
+                archer.alive = False
+                if archer.agent_name not in self.kill_list:
+                    self.kill_list.append(archer.agent_name)
+
+    def sword_hit(self):
+        for knight in self.knight_list:
+            for sword in knight.weapons:
+                for _ in pygame.sprite.spritecollide(sword, self.zombie_list, True):
+                    sword.knight.score += 1
+
+    def arrow_hit(self):
+        for agent in self.agent_list:
+            if agent.is_archer:
+                for arrow in list(agent.weapons):
+                    for _ in pygame.sprite.spritecollide(arrow, self.zombie_list, True):
+                        agent.weapons.remove(arrow)
+                        arrow.archer.score += 1
+
+
+def test_collisions_match_spritecollide():
+    kwargs = dict(
+        num_archers=4,
+        num_knights=4,
+        spawn_rate=1,
+        max_zombies=40,
+        max_arrows=40,
+        max_cycles=300,
+    )
+    env = raw_env(**kwargs)
+    reference = _SpritecollideEnv(**kwargs)
+    env.reset(seed=42)
+    reference.reset(seed=42)
+    rng = np.random.default_rng(42)
+
+    kills = 0
+    for agent in env.agent_iter():
+        observation, reward, termination, truncation, _ = env.last()
+        assert agent == reference.agent_selection
+        expected = reference.last()
+        np.testing.assert_array_equal(observation, expected[0])
+        assert (reward, termination, truncation) == expected[1:4]
+        kills += reward
+
+        # fire often, so that many weapons are in flight
+        action = None if termination or truncation else rng.choice([0, 1, 2, 4, 4])
+        env.step(action)
+        reference.step(action)
+    assert kills > 0 and env.dead_agents == reference.dead_agents
+
+
+def _reference_pixel_observation(base, agent_name):
+    """Image observation of one agent, cropped out of the pixels of the screen."""
+    agent = base.agent_list[base.agent_name_mapping[agent_name]]
+    cropped = np.zeros((512, 512, 3), dtype=np.uint8)
+    if agent.alive:
+        screen = pygame.surfarray.pixels3d(base.screen)
+        min_x, min_y = agent.rect.x - 256, agent.rect.y - 256
+        low_x, low_y = max(min_x, 0), max(min_y, 0)
+        high_x = min(min_x + 512, screen.shape[0])
+        high_y = min(min_y + 512, screen.shape[1])
+        cropped[
+            low_x - min_x : high_x - min_x, low_y - min_y : high_y - min_y
+        ] = screen[low_x:high_x, low_y:high_y]
+    return np.swapaxes(cropped, 1, 0)
+
+
+@pytest.mark.parametrize("obs_scale", [1, 6])
+def test_pixel_observations_match_reference(obs_scale):
+    env = knights_archers_zombies_v10.env(
+        vector_state=False,
+        obs_scale=obs_scale,
+        spawn_rate=1,
+        max_zombies=20,
+        max_cycles=120,
+    )
+    env.reset(seed=42)
+    base = env.unwrapped
+    for agent in env.agents:
+        env.action_space(agent).seed(42)
+    size = len(range(0, 512, obs_scale))
+    assert env.observation_space(env.agents[0]).shape == (size, size, 3)
+
+    previous = None
+    died = False
+    for step, agent in enumerate(env.agent_iter()):
+        observation, _, termination, truncation, _ = env.last()
+        expected = _reference_pixel_observation(base, agent)
+        np.testing.assert_array_equal(observation, expected[::obs_scale, ::obs_scale])
+        if step % 25 == 0:
+            np.testing.assert_array_equal(
+                env.state(),
+                np.fliplr(np.rot90(pygame.surfarray.pixels3d(base.screen), k=3)),
+            )
+
+        # observations handed out earlier are not overwritten
+        if previous is not None:
+            np.testing.assert_array_equal(*previous)
+        previous = observation, observation.copy()
+
+        action = None if termination or truncation else env.action_space(agent).sample()
+        env.step(action)
+        died |= bool(base.dead_agents)
+    assert died
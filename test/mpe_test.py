@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from pettingzoo.mpe import (
+    simple_crypto_v3,
+    simple_reference_v3,
+    simple_speaker_listener_v4,
+    simple_spread_v3,
+    simple_tag_v3,
+    simple_world_comm_v3,
+)
+from pettingzoo.mpe._mpe_utils.simple_env import render_batch
+
+
+@pytest.mark.parametrize(
+    "env_module", [simple_spread_v3, simple_tag_v3, simple_world_comm_v3]
+)
+@pytest.mark.parametrize("continuous_actions", [False, True])
+def test_float32_world_matches_float64(env_module, continuous_actions):
+    env64 = env_module.parallel_env(continuous_actions=continuous_actions)
+    env32 = env_module.parallel_env(
+        continuous_actions=continuous_actions, dtype=np.float32
+    )
+    obs64, _ = env64.reset(seed=42)
+    obs32, _ = env32.reset(seed=42)
+    for agent in env64.agents:
+        env64.action_space(agent).seed(42)
+        env32.action_space(agent).seed(42)
+
+    while env64.agents:
+        for agent in env64.agents:
+            assert obs32[agent].dtype == np.float32
+            np.testing.assert_allclose(obs32[agent], obs64[agent], rtol=0, atol=1e-4)
+        actions64 = {
+            agent: env64.action_space(agent).sample() for agent in env64.agents
+        }
+        actions32 = {
+            agent: env32.action_space(agent).sample() for agent in env32.agents
+        }
+        obs64, rew64, _, _, _ = env64.step(actions64)
+        obs32, rew32, _, _, _ = env32.step(actions32)
+        for agent in rew64:
+            assert rew32[agent] == pytest.approx(rew64[agent], abs=1e-4)
+
+    unwrapped = env32.unwrapped
+    assert all(
+        entity.state.p_pos.dtype == np.float32 for entity in unwrapped.world.entities
+    )
+    assert unwrapped.state().dtype == np.float32
+
+
+@pytest.mark.parametrize(
+    "env_module", [simple_spread_v3, simple_tag_v3, simple_world_comm_v3]
+)
+def test_numpy_render_backend_matches_pygame(env_module):
+    env_pygame = env_module.env(render_mode="rgb_array")
+    env_numpy = env_module.env(render_mode="rgb_array", render_backend="numpy")
+    env_pygame.reset(seed=42)
+    env_numpy.reset(seed=42)
+    for agent in env_pygame.agent_iter(2 * env_pygame.num_agents):
+        action = env_pygame.action_space(agent).sample()
+        env_pygame.step(action)
+        env_numpy.step(action)
+
+    frame_pygame = env_pygame.render()
+    frame_numpy = env_numpy.render()
+    assert frame_numpy.shape == frame_pygame.shape == (700, 700, 3)
+    assert frame_numpy.dtype == np.uint8
+    # only anti-aliasing differences along circle borders and glyph edges
+    assert np.mean(np.any(frame_numpy != frame_pygame, axis=-1)) < 0.01
+
+
+def test_render_batch():
+    envs = [
+        simple_spread_v3.env(render_backend="numpy", render_resolution=96)
+        for _ in range(3)
+    ]
+    for seed, env in enumerate(envs):
+        env.reset(seed=seed)
+
+    out = np.empty((3, 96, 96, 3), dtype=np.uint8)
+    frames = render_batch(envs, out)
+    assert frames is out
+    for env, frame in zip(envs, frames):
+        env.unwrapped.render_mode = "rgb_array"
+        np.testing.assert_array_equal(env.unwrapped.render(), frame)
+
+
+@pytest.mark.parametrize(
+    "env_module",
+    [simple_crypto_v3, simple_reference_v3, simple_speaker_listener_v4],
+)
+@pytest.mark.parametrize("continuous_actions", [False, True])
+def test_packed_communication(env_module, continuous_actions):
+    env = env_module.parallel_env(continuous_actions=continuous_actions)
+    env.reset(seed=42)
+    world = env.unwrapped.world
+    for agent in env.agents:
+        env.action_space(agent).seed(42)
+
+    for _ in range(3):
+        env.step({agent: env.action_space(agent).sample() for agent in env.agents})
+        for i, agent in enumerate(world.agents):
+            # every agent's communication state is a row of the packed array
+            assert np.shares_memory(agent.state.c, world.comm)
+            np.testing.assert_array_equal(agent.state.c, world.comm[i])
+            if agent.silent:
+                assert not agent.state.c.any()
+            else:
+                np.testing.assert_array_equal(agent.state.c, agent.action.c)
+
+
+def test_packed_communication_noise_matches_per_agent():
+    env = simple_reference_v3.parallel_env(continuous_actions=True)
+    env.reset(seed=42)
+    world = env.unwrapped.world
+    # only the second agent is noisy
+    world.agents[1].c_noise = 0.5
+    world.pack_communication()
+    for agent in world.agents:
+        agent.action.c = np.random.default_rng(42).random(world.dim_c)
+    world.comm_actions = np.array([agent.action.c for agent in world.agents])
+
+    np.random.seed(42)
+    for agent in world.agents:
+        world.update_agent_state(agent)
+    expected = world.comm.copy()
+
+    np.random.seed(42)
+    world.update_communication()
+    np.testing.assert_array_equal(world.comm, expected)
+    assert world.comm[1].tolist() != world.agents[1].action.c.tolist()
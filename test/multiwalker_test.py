@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import copy
+
+import numpy as np
+import pytest
+
+from pettingzoo.sisl import multiwalker_v9
+
+
+def _reference_observations(base, rng):
+    """Observations assembled walker by walker, drawing the noise of each feature from rng."""
+    observations = []
+    for i, walker in enumerate(base.walkers):
+        if walker.hull is None:
+            observations.append(np.zeros(31, dtype=np.float32))
+            continue
+        x, y = walker.hull.position
+        features = []
+        for j in [i - 1, i + 1]:
+            if 0 <= j < base.n_walkers and base.walkers[j].hull is not None:
+                neighbor = base.walkers[j].hull.position
+                features.append(
+                    rng.normal(
+                        (neighbor.x - x) / base.package_length, base.position_noise
+                    )
+                )
+                features.append(
+                    rng.normal(
+                        (neighbor.y - y) / base.package_length, base.position_noise
+                    )
+                )
+            else:
+                features += [0.0, 0.0]
+        package = base.package
+        features.append(
+            rng.normal(
+                (package.position.x - x) / base.package_length, base.position_noise
+            )
+        )
+        features.append(
+            rng.normal(
+                (package.position.y - y) / base.package_length, base.position_noise
+            )
+        )
+        features.append(rng.normal(package.angle, base.angle_noise))
+        observations.append(
+            np.array(walker.get_observation() + features, dtype=np.float32)
+        )
+    return observations
+
+
+def test_batched_observations_match_reference():
+    env = multiwalker_v9.parallel_env(
+        n_walkers=4, terminate_on_fall=False, position_noise=0.1, angle_noise=0.2
+    )
+    env.reset(seed=0)
+    base = env.unwrapped.env
+    for agent in env.agents:
+        env.action_space(agent).seed(0)
+
+    previous = None
+    fallen = False
+    while env.agents:
+        actions = {agent: env.action_space(agent).sample() for agent in env.agents}
+        obs, _, _, _, _ = env.step(actions)
+        fallen |= any(walker.hull is None for walker in base.walkers)
+
+        rng = copy.deepcopy(base.np_random)
+        reference = _reference_observations(base, rng)
+        batch = base.observe_list()
+        assert batch.shape == (4, 31) and batch.dtype == np.float32
+        for row, expected in zip(batch, reference):
+            np.testing.assert_array_equal(row, expected)
+        assert base.np_random.bit_generator.state == rng.bit_generator.state
+
+        # observations handed out earlier are not overwritten
+        if previous is not None:
+            saved, copies = previous
+            for agent in saved:
+                np.testing.assert_array_equal(saved[agent], copies[agent])
+        previous = obs, {agent: o.copy() for agent, o in obs.items()}
+
+        # nor does editing an observation change the batch
+        if base.walkers[0].hull is not None:
+            observation = base.observe(0)
+            observation += 1.0
+            assert not np.array_equal(observation, base.observe(0))
+    assert fallen
+
+
+def _run_episode(env):
+    for agent in env.agents:
+        env.action_space(agent).seed(0)
+    while env.agents:
+        env.step({agent: env.action_space(agent).sample() for agent in env.agents})
+
+
+def test_fast_reset_matches_fresh_env():
+    fast_env = multiwalker_v9.parallel_env(fast_reset=True, terrain_bank_size=0)
+    fast_env.reset(seed=0)
+    world = fast_env.unwrapped.env.world
+    _run_episode(fast_env)
+
+    fresh_env = multiwalker_v9.parallel_env()
+    fast_obs, _ = fast_env.reset(seed=42)
+    fresh_obs, _ = fresh_env.reset(seed=42)
+    assert fast_env.unwrapped.env.world is world
+    for agent in fresh_env.agents:
+        np.testing.assert_array_equal(fast_obs[agent], fresh_obs[agent])
+
+    # Leftover velocities, forces or joint impulses would show after a step
+    actions = {agent: np.full(4, 0.5, dtype=np.float32) for agent in fresh_env.agents}
+    fast_obs, fast_rewards, _, _, _ = fast_env.step(actions)
+    fresh_obs, fresh_rewards, _, _, _ = fresh_env.step(actions)
+    assert fast_rewards == fresh_rewards
+    for agent in fresh_env.agents:
+        np.testing.assert_array_equal(fast_obs[agent], fresh_obs[agent])
+
+
+def test_terrain_bank():
+    env = multiwalker_v9.parallel_env(fast_reset=True, terrain_bank_size=4)
+    other = multiwalker_v9.parallel_env(fast_reset=True, terrain_bank_size=4)
+    env.reset(seed=0)
+    other.reset(seed=1)
+    base = env.unwrapped.env
+    n_bodies = len(base.world.bodies)
+    for entry, other_entry in zip(base.terrain_bank, other.unwrapped.env.terrain_bank):
+        assert entry[2] == other_entry[2]
+
+    for _ in range(5):
+        _run_episode(env)
+        env.reset()
+        assert len(base.world.bodies) == n_bodies
+        for terrain, *_ in base.terrain_bank:
+            assert all(t.active == (terrain is base.terrain) for t in terrain)
+        np.testing.assert_allclose(
+            [walker.hull.position.x for walker in base.walkers],
+            [walker.init_x for walker in base.walkers],
+            rtol=1e-6,
+        )
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        dict(),
+        # rewards are local only, so that the fall penalty of a walker does
+        # not spread to the others
+        dict(terminate_on_fall=False, shared_reward=False),
+    ],
+)
+def test_frame_skip_repeats_actions(kwargs):
+    skip_env = multiwalker_v9.parallel_env(frame_skip=3, **kwargs)
+    env = multiwalker_v9.parallel_env(**kwargs)
+    skip_env.reset(seed=0)
+    env.reset(seed=0)
+    for agent in env.agents:
+        env.action_space(agent).seed(0)
+
+    fell = False
+    while skip_env.agents:
+        actions = {agent: env.action_space(agent).sample() for agent in env.agents}
+        skip_obs, skip_rewards, skip_terms, _, _ = skip_env.step(actions)
+        rewards = dict.fromkeys(skip_rewards, 0.0)
+        terms = {}
+        for _ in range(3):
+            obs, step_rewards, step_terms, _, _ = env.step(
+                {agent: actions[agent] for agent in env.agents}
+            )
+            for agent in step_rewards:
+                rewards[agent] += step_rewards[agent]
+            terms.update(step_terms)
+            if not env.agents:
+                break
+        assert skip_terms == terms
+        # a walker that falls is penalized once, not on every skipped step
+        assert skip_rewards == pytest.approx(rewards)
+        fell |= any(terms.values()) and bool(env.agents)
+        # the noisy neighbor and package features draw different noise
+        for agent in obs:
+            np.testing.assert_array_equal(skip_obs[agent][:24], obs[agent][:24])
+    assert not env.agents
+    assert fell == (not kwargs.get("terminate_on_fall", True))
+
+
+def test_lidar_interval_holds_readings():
+    held_env = multiwalker_v9.parallel_env(lidar_interval=3)
+    env = multiwalker_v9.parallel_env()
+    held_obs, _ = held_env.reset(seed=0)
+    obs, _ = env.reset(seed=0)
+    for agent in env.agents:
+        env.action_space(agent).seed(0)
+
+    step = 0
+    while env.agents:
+        if step % 3 == 0:
+            scans = {agent: obs[agent][14:24] for agent in obs}
+        for agent in obs:
+            np.testing.assert_array_equal(held_obs[agent][14:24], scans[agent])
+            np.testing.assert_array_equal(held_obs[agent][:14], obs[agent][:14])
+            np.testing.assert_array_equal(held_obs[agent][24:], obs[agent][24:])
+        actions = {agent: env.action_space(agent).sample() for agent in env.agents}
+        held_obs, _, _, _, _ = held_env.step(actions)
+        obs, _, _, _, _ = env.step(actions)
+        step += 1
+
+
+def test_state_keeps_held_lidar_readings():
+    state_env = multiwalker_v9.parallel_env(lidar_interval=4)
+    env = multiwalker_v9.parallel_env(lidar_interval=4)
+    state_env.reset(seed=0)
+    env.reset(seed=0)
+    for agent in env.agents:
+        env.action_space(agent).seed(0)
+
+    while env.agents:
+        state_env.state()
+        actions = {agent: env.action_space(agent).sample() for agent in env.agents}
+        state_obs, _, _, _, _ = state_env.step(actions)
+        obs, _, _, _, _ = env.step(actions)
+        for agent in obs:
+            np.testing.assert_array_equal(state_obs[agent], obs[agent])
+        # the state holds the lidar readings of the observations
+        if len(obs) == state_env.num_agents:
+            state = state_env.state().reshape(-1)[:-3].reshape(len(obs), 24)
+            for agent_state, agent in zip(state, obs):
+                np.testing.assert_array_equal(agent_state[14:], obs[agent][14:24])
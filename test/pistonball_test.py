@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import numpy as np
+import pygame
+import pymunk
+import pytest
+
+from pettingzoo.butterfly import pistonball_v6
+from pettingzoo.butterfly.pistonball.pistonball import ParallelPistonballEnv
+from pettingzoo.test import api_test, parallel_api_test
+from pettingzoo.utils.conversions import aec_to_parallel_wrapper
+
+
+def _reference_observation(base, i):
+    """Crop of the screen around piston i, as observe computed it one piston at a time."""
+    x_low = base.wall_width + base.piston_width * (i - 1)
+    x_high = base.wall_width + base.piston_width * (i + 2)
+    y_low = base.wall_width
+    y_high = base.screen_height - base.wall_width - base.piston_body_height
+    screen = pygame.surfarray.pixels3d(base.screen)
+    cropped = np.array(screen[x_low:x_high, y_low:y_high, :])
+    return np.fliplr(np.rot90(cropped, k=3))
+
+
+@pytest.mark.parametrize("obs_scale", [1, 3])
+def test_batched_observations_match_reference(obs_scale):
+    env = pistonball_v6.parallel_env(
+        n_pistons=6, max_cycles=10, obs_scale=obs_scale, render_mode="rgb_array"
+    )
+    observations, _ = env.reset(seed=42)
+    base = env.unwrapped
+    for agent in env.agents:
+        env.action_space(agent).seed(42)
+
+    while env.agents:
+        for i, agent in enumerate(base.possible_agents):
+            assert env.observation_space(agent).contains(observations[agent])
+            np.testing.assert_array_equal(
+                observations[agent],
+                _reference_observation(base, i)[::obs_scale, ::obs_scale],
+            )
+        previous = {agent: obs.copy() for agent, obs in observations.items()}
+        previous_observations = observations
+        actions = {agent: env.action_space(agent).sample() for agent in env.agents}
+        observations, _, _, _, _ = env.step(actions)
+        for agent in previous:
+            np.testing.assert_array_equal(previous_observations[agent], previous[agent])
+    np.testing.assert_array_equal(env.state(), env.render())
+
+
+def test_vector_observations_follow_pixel_physics():
+    pixel_env = pistonball_v6.parallel_env(n_pistons=8, max_cycles=40)
+    vector_env = pistonball_v6.parallel_env(
+        n_pistons=8, max_cycles=40, obs_type="vector"
+    )
+    pixel_env.reset(seed=42)
+    observations, _ = vector_env.reset(seed=42)
+    base = vector_env.unwrapped
+    heights = [base.piston_level(i) for i in range(base.n_pistons)]
+    for agent in pixel_env.agents:
+        pixel_env.action_space(agent).seed(42)
+
+    while pixel_env.agents:
+        for agent, observation in observations.items():
+            assert vector_env.observation_space(agent).contains(observation)
+        actions = {
+            agent: pixel_env.action_space(agent).sample() for agent in pixel_env.agents
+        }
+        _, pixel_rewards, _, _, _ = pixel_env.step(actions)
+        observations, vector_rewards, _, _, _ = vector_env.step(actions)
+        assert vector_rewards == pixel_rewards
+
+        previous_heights = heights
+        heights = [base.piston_level(i) for i in range(base.n_pistons)]
+        assert all(0 <= height <= 1 for height in heights)
+        for i, agent in enumerate(base.possible_agents):
+            np.testing.assert_allclose(
+                observations[agent][:4],
+                [
+                    heights[i],
+                    (heights[i] - previous_heights[i]) * base.n_piston_positions,
+                    heights[i - 1] if i > 0 else -1,
+                    heights[i + 1] if i < base.n_pistons - 1 else -1,
+                ],
+                atol=1e-5,
+            )
+        np.testing.assert_array_equal(
+            base.observe_all(),
+            [base.vector_observation(i) for i in range(base.n_pistons)],
+        )
+        state = vector_env.state()
+        assert vector_env.state_space.contains(state)
+        np.testing.assert_allclose(state[: base.n_pistons], heights, rtol=1e-6)
+
+
+def test_vector_observations_do_not_read_the_screen(monkeypatch):
+    def pixels3d(surface):
+        raise AssertionError("the screen was read")
+
+    monkeypatch.setattr(pygame.surfarray, "pixels3d", pixels3d)
+    env = pistonball_v6.env(max_cycles=20, obs_type="vector")
+    env.reset(seed=42)
+    for agent in env.agent_iter():
+        _, _, termination, truncation, _ = env.last()
+        action = None if termination or truncation else env.action_space(agent).sample()
+        env.step(action)
+    env.state()
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        dict(obs_type="vector"),
+        dict(continuous=False, obs_type="vector"),
+        dict(render_mode="rgb_array", obs_scale=2),
+    ],
+)
+def test_step_cycle_matches_aec_steps(kwargs, monkeypatch):
+    kwargs = dict(n_pistons=6, max_cycles=30, physics_steps_per_cycle=3, **kwargs)
+    parallel_env = pistonball_v6.parallel_env(**kwargs)
+    assert isinstance(parallel_env, ParallelPistonballEnv)
+    aec_env = aec_to_parallel_wrapper(pistonball_v6.env(**kwargs))
+    observations, _ = parallel_env.reset(seed=42)
+    aec_observations, _ = aec_env.reset(seed=42)
+    for agent in parallel_env.agents:
+        parallel_env.action_space(agent).seed(42)
+
+    physics_steps = []
+    space_step = pymunk.Space.step
+
+    def step(space, dt):
+        physics_steps.append(dt)
+        space_step(space, dt)
+
+    monkeypatch.setattr(pymunk.Space, "step", step)
+    while parallel_env.agents:
+        for agent in aec_env.agents:
+            np.testing.assert_array_equal(observations[agent], aec_observations[agent])
+        actions = {
+            agent: parallel_env.action_space(agent).sample()
+            for agent in parallel_env.agents
+        }
+        observations, rewards, terminations, truncations, _ = parallel_env.step(actions)
+        (
+            aec_observations,
+            aec_rewards,
+            aec_terminations,
+            aec_truncations,
+            _,
+        ) = aec_env.step(actions)
+        assert rewards == aec_rewards
+        assert terminations == aec_terminations
+        assert truncations == aec_truncations
+        assert parallel_env.agents == aec_env.agents
+    assert len(physics_steps) == 2 * 3 * parallel_env.unwrapped.frames
+
+
+def test_parallel_api():
+    parallel_api_test(pistonball_v6.parallel_env(physics_steps_per_cycle=1))
+
+
+def test_vector_spaces_have_finite_bounds(recwarn):
+    env = pistonball_v6.env(n_pistons=6, obs_type="vector")
+    space = env.observation_space(env.possible_agents[0])
+    # only the ball velocities and spin are unbounded
+    assert np.isfinite(space.low[:6]).all() and np.isfinite(space.high[:6]).all()
+    state_space = env.unwrapped.state_space
+    assert np.isfinite(state_space.low[:12]).all()
+    assert np.isfinite(state_space.high[:12]).all()
+
+    api_test(env)
+    assert not [w for w in recwarn if "infinity" in str(w.message)]
+
+
+def test_fast_reset_matches_fresh_env():
+    kwargs = dict(n_pistons=8, max_cycles=40, obs_type="vector")
+    fast_env = pistonball_v6.parallel_env(fast_reset=True, **kwargs)
+    fast_env.reset(seed=1)
+    space = fast_env.unwrapped.space
+    for agent in fast_env.agents:
+        fast_env.action_space(agent).seed(1)
+    while fast_env.agents:
+        fast_env.step(
+            {agent: fast_env.action_space(agent).sample() for agent in fast_env.agents}
+        )
+
+    fresh_env = pistonball_v6.parallel_env(**kwargs)
+    fast_obs, _ = fast_env.reset(seed=42)
+    fresh_obs, _ = fresh_env.reset(seed=42)
+    assert fast_env.unwrapped.space is space
+    for agent in fresh_env.agents:
+        np.testing.assert_array_equal(fast_obs[agent], fresh_obs[agent])
+
+    # Leftover solver state on the ball would already show after the first cycle
+    actions = {
+        agent: fresh_env.action_space(agent).sample() for agent in fresh_env.agents
+    }
+    fast_obs, fast_rewards, _, _, _ = fast_env.step(actions)
+    fresh_obs, fresh_rewards, _, _, _ = fresh_env.step(actions)
+    assert fast_rewards == fresh_rewards
+    for agent in fresh_env.agents:
+        np.testing.assert_array_equal(fast_obs[agent], fresh_obs[agent])
+    np.testing.assert_array_equal(fast_env.state(), fresh_env.state())
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from pettingzoo.sisl import pursuit_v4
+from pettingzoo.sisl.pursuit.utils import (
+    AgentLayer,
+    ArrayAgentLayer,
+    create_agents,
+    rectangle_map,
+)
+
+
+@pytest.mark.parametrize("obs_range", [1, 7, 8, 15])
+def test_batched_observations_match_single(obs_range):
+    env = pursuit_v4.parallel_env(
+        x_size=10, y_size=13, n_evaders=10, n_pursuers=12, obs_range=obs_range
+    )
+    env.reset(seed=42)
+    base = env.unwrapped.env
+    for agent in env.agents:
+        env.action_space(agent).seed(42)
+
+    for _ in range(5):
+        env.step({agent: env.action_space(agent).sample() for agent in env.agents})
+        batch = base.collect_all_obs()
+        assert batch.shape == (12, obs_range, obs_range, 3)
+        for i in range(base.n_agents()):
+            single = base.collect_obs_by_idx(base.pursuer_layer, i)
+            np.testing.assert_array_equal(batch[i], np.swapaxes(single, 2, 0))
+
+
+@pytest.mark.parametrize("surround", [True, False])
+def test_capture_credits_surrounding_pursuers(surround):
+    env = pursuit_v4.parallel_env(n_evaders=2, n_pursuers=3, surround=surround)
+    env.reset(seed=42)
+    base = env.unwrapped.env
+    # evader 0 sits in a corner, evader 1 is left alone
+    base.evader_layer.set_position(0, 0, 0)
+    base.evader_layer.set_position(1, 15, 0)
+    if surround:
+        base.pursuer_layer.set_position(0, 1, 0)
+        base.pursuer_layer.set_position(1, 0, 1)
+    else:
+        base.pursuer_layer.set_position(0, 0, 0)
+        base.pursuer_layer.set_position(1, 0, 0)
+    base.pursuer_layer.set_position(2, 15, 15)
+    base.model_state[1] = base.pursuer_layer.get_state_matrix()
+
+    n_evaders_removed, n_pursuers_removed, credited = base.remove_agents()
+    assert (n_evaders_removed, n_pursuers_removed) == (1, 0)
+    np.testing.assert_array_equal(credited, [True, True, False])
+    np.testing.assert_array_equal(base.evaders_gone, [True, False])
+    np.testing.assert_array_equal(base.evader_layer.get_positions(), [[15, 0]])
+
+
+def test_array_agent_layer_matches_agent_layer():
+    rng = np.random.default_rng(42)
+    map_matrix = rectangle_map(16, 9)
+    allies = create_agents(10, map_matrix, 7, rng, randinit=True)
+    layer = AgentLayer(16, 9, allies)
+    array_layer = ArrayAgentLayer(16, 9, map_matrix, layer.get_positions())
+
+    for step in range(50):
+        actions = rng.integers(layer.get_nactions(0), size=layer.n_agents())
+        for i, action in enumerate(actions):
+            layer.move_agent(i, action)
+        array_layer.move_all(actions)
+        if step % 10 == 9:
+            layer.remove_agent(3)
+            array_layer.remove_agent(3)
+        assert array_layer.n_agents() == layer.n_agents()
+        np.testing.assert_array_equal(
+            array_layer.get_positions(), layer.get_positions()
+        )
+        np.testing.assert_array_equal(
+            array_layer.get_state_matrix(), layer.get_state_matrix()
+        )
+
+
+def test_incremental_rewards_match_full_recompute():
+    env = pursuit_v4.env(n_evaders=20, n_pursuers=10, max_cycles=30)
+    env.reset(seed=42)
+    base = env.unwrapped.env
+    for agent in env.agents:
+        env.action_space(agent).seed(42)
+
+    for agent in env.agent_iter():
+        _, _, termination, truncation, _ = env.last()
+        action = None if termination or truncation else env.action_space(agent).sample()
+        env.step(action)
+        np.testing.assert_array_equal(base._tag_rewards, base.reward())
+
+
+@pytest.mark.parametrize("surround", [True, False])
+@pytest.mark.parametrize("obs_range", [7, 8])
+def test_sparse_layers_match_dense(surround, obs_range):
+    kwargs = dict(surround=surround, obs_range=obs_range, n_catch=1, max_cycles=40)
+    dense_env = pursuit_v4.parallel_env(**kwargs)
+    sparse_env = pursuit_v4.parallel_env(sparse_layers=True, **kwargs)
+    dense_obs, _ = dense_env.reset(seed=42)
+    sparse_obs, _ = sparse_env.reset(seed=42)
+    for agent in dense_env.agents:
+        dense_env.action_space(agent).seed(42)
+
+    while dense_env.agents:
+        for agent in dense_env.agents:
+            np.testing.assert_array_equal(sparse_obs[agent], dense_obs[agent])
+        actions = {
+            agent: dense_env.action_space(agent).sample() for agent in dense_env.agents
+        }
+        dense_obs, dense_rewards, _, _, _ = dense_env.step(actions)
+        sparse_obs, sparse_rewards, _, _, _ = sparse_env.step(actions)
+        assert sparse_rewards == dense_rewards
+    assert sparse_env.unwrapped.env.model_state is None
+
+
+def test_maps_are_cached():
+    env = pursuit_v4.raw_env(x_size=64, y_size=48, map_type="multi_scale", map_seed=3)
+    other = pursuit_v4.raw_env(x_size=64, y_size=48, map_type="multi_scale", map_seed=3)
+    map_matrix = env.env.map_matrix
+    assert map_matrix is other.env.map_matrix
+    assert not map_matrix.flags.writeable
+    assert map_matrix.shape == (64, 48)
+    assert 0 < np.mean(map_matrix == -1) < 1
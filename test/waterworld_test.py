@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from pettingzoo.sisl import waterworld_v4
+from pettingzoo.sisl.waterworld import waterworld_base
+
+
+def _reference_observation(base, i):
+    """Observation of pursuer i computed object by object with the pursuer's sensor model."""
+    pursuer = base.pursuers[i]
+    readings = []
+    for objects, max_speed in (
+        (base.evaders, base.evader_speed),
+        (base.poisons, base.poison_speed),
+        ([p for j, p in enumerate(base.pursuers) if j != i], base.pursuer_speed),
+    ):
+        distances, velocities = zip(
+            *(
+                pursuer.get_sensor_reading(
+                    obj.body.position, obj.radius, obj.body.velocity, max_speed
+                )
+                for obj in objects
+            )
+        )
+        readings.append(
+            base.get_sensor_readings(
+                distances, pursuer.sensor_range, velocites=velocities
+            )
+        )
+    obstacle_distances = [
+        pursuer.get_sensor_reading(o.body.position, o.radius, o.body.velocity, 0.0)[0]
+        for o in base.obstacles
+    ]
+    return np.concatenate(
+        [
+            base.get_sensor_readings(obstacle_distances, pursuer.sensor_range),
+            pursuer.get_sensor_barrier_readings(),
+            *(r for reading in readings for r in reading),
+            [pursuer.shape.food_touched_indicator >= 1],
+            [pursuer.shape.poison_indicator >= 1],
+        ]
+    )
+
+
+@pytest.mark.parametrize("broadphase", [False, True])
+@pytest.mark.parametrize("n_sensors", [5, 30])
+def test_batched_sensors_match_reference(n_sensors, broadphase, monkeypatch):
+    if broadphase:
+        monkeypatch.setattr(waterworld_base, "BROADPHASE_MIN_OBJECTS", 0)
+    env = waterworld_v4.parallel_env(
+        n_pursuers=4,
+        n_evaders=20,
+        n_poisons=30,
+        n_obstacles=2,
+        obstacle_coord=[(0.3, 0.3), (0.7, 0.6)],
+        n_sensors=n_sensors,
+        sensor_range=0.4,
+    )
+    env.reset(seed=42)
+    base = env.unwrapped.env
+    for agent in env.agents:
+        env.action_space(agent).seed(42)
+
+    for _ in range(20):
+        env.step({agent: env.action_space(agent).sample() for agent in env.agents})
+        for i, observation in enumerate(base.observe_list()):
+            np.testing.assert_array_equal(
+                observation, _reference_observation(base, i).astype(np.float32)
+            )
+
+
+def _respawned(env, positions):
+    objects = env.evaders + env.poisons
+    return [tuple(obj.body.position) != p for obj, p in zip(objects, positions)]
+
+
+@pytest.mark.parametrize("n_coop", [1, 2, 3])
+def test_batched_contacts_match_callbacks(n_coop):
+    kwargs = dict(n_pursuers=4, n_evaders=3, n_poisons=3, n_coop=n_coop)
+    immediate = waterworld_v4.raw_env(**kwargs).env
+    batched = waterworld_v4.raw_env(batch_collisions=True, **kwargs).env
+    immediate.reset()
+    batched.reset()
+    rng = np.random.default_rng(42)
+
+    touching = set()
+    for _ in range(100):
+        # Contacts of one physics step, all begins come before the separates
+        begins = {(rng.integers(4), rng.integers(3)) for _ in range(rng.integers(3))}
+        begins -= touching
+        poisoned = [(rng.integers(4), rng.integers(3)) for _ in range(rng.integers(2))]
+        separates = [contact for contact in touching if rng.random() < 0.3]
+        touching = (touching | begins) - set(separates)
+
+        positions = [
+            [tuple(obj.body.position) for obj in env.evaders + env.poisons]
+            for env in (immediate, batched)
+        ]
+        for callback, contacts, objects in (
+            (immediate.pursuer_poison_begin_callback, poisoned, immediate.poisons),
+            (immediate.pursuer_evader_begin_callback, begins, immediate.evaders),
+            (immediate.pursuer_evader_separate_callback, separates, immediate.evaders),
+        ):
+            for i, j in contacts:
+                shapes = (immediate.pursuers[i].shape, objects[j].shape)
+                callback(SimpleNamespace(shapes=shapes), None, None)
+        evader_data, poison_data = (handler.data for handler in batched.handlers)
+        poison_data["begin"].extend(poisoned)
+        evader_data["begin"].extend(begins)
+        evader_data["separate"].extend(separates)
+        batched.resolve_contacts()
+
+        for a, b in zip(immediate.pursuers, batched.pursuers):
+            assert a.shape.food_indicator == b.shape.food_indicator
+            assert a.shape.food_touched_indicator == b.shape.food_touched_indicator
+            assert a.shape.poison_indicator == b.shape.poison_indicator
+        for a, b in zip(immediate.evaders, batched.evaders):
+            assert a.shape.counter == b.shape.counter
+        assert _respawned(immediate, positions[0]) == _respawned(batched, positions[1])
+
+
+def test_fast_reset_matches_fresh_env():
+    kwargs = dict(n_pursuers=3, n_evaders=10, n_poisons=20, max_cycles=30)
+    fast_env = waterworld_v4.parallel_env(fast_reset=True, **kwargs)
+    fast_env.reset(seed=1)
+    space = fast_env.unwrapped.env.space
+    for agent in fast_env.agents:
+        fast_env.action_space(agent).seed(1)
+    while fast_env.agents:
+        fast_env.step(
+            {agent: fast_env.action_space(agent).sample() for agent in fast_env.agents}
+        )
+
+    fresh_env = waterworld_v4.parallel_env(**kwargs)
+    fast_obs, _ = fast_env.reset(seed=42)
+    fresh_obs, _ = fresh_env.reset(seed=42)
+    assert fast_env.unwrapped.env.space is space
+    for agent in fresh_env.agents:
+        np.testing.assert_array_equal(fast_obs[agent], fresh_obs[agent])
+    for a, b in zip(fast_env.unwrapped.env.evaders, fresh_env.unwrapped.env.evaders):
+        assert a.shape.counter == b.shape.counter == 0
+
+    # Leftover solver state would already show after the first physics step
+    actions = {
+        agent: fresh_env.action_space(agent).sample() for agent in fresh_env.agents
+    }
+    fast_obs, fast_rewards, _, _, _ = fast_env.step(actions)
+    fresh_obs, fresh_rewards, _, _, _ = fresh_env.step(actions)
+    assert fast_rewards == fresh_rewards
+    for agent in fresh_env.agents:
+        np.testing.assert_array_equal(fast_obs[agent], fresh_obs[agent])